@@ -1,10 +1,16 @@
 from kerykeion.charts.kerykeion_chart_svg import KerykeionChartSVG
-from kerykeion.astrological_subject import AstrologicalSubject
+from kerykeion.subject_cache import SubjectCache
+from kerykeion.celestial_points import get_settings_active_points
+from kerykeion.settings import get_settings
+from kerykeion.ephemeris import get_ephemeris_manager
 from pathlib import Path
-from flask import Flask, request, send_file
+from dataclasses import asdict
+from flask import Flask, jsonify, request, send_file
 import matplotlib.font_manager as fm
 
 app = Flask(__name__)
+subject_cache = SubjectCache()
+
 @app.route('/createSVG', methods=['POST'])
 
 def generar_archivo():
@@ -25,14 +31,21 @@ def generar_archivo():
     bg_image = data.get('bg_image', None)
     bg_color = data.get('bg_color', None)
     name_spacing = data.get('name_spacing', True)
+    # For the birth times repeated or skipped by the daylight saving time changes
+    ambiguous = data.get('ambiguous', "raise")
+    nonexistent = data.get('nonexistent', "raise")
 
     if style.lower() == "bright":
         style_path = Path("kerykeion/charts/bright.json")
     else:
         style_path = Path("kerykeion/charts/dark.json")
 
-    # create instances
-    subject = AstrologicalSubject(name, year, month, day, hour, minute, city, nation)
+    # create instances, with only the points drawn by the chart
+    active_points = get_settings_active_points(get_settings(style_path))
+    subject = subject_cache.get_subject(
+        name, year, month, day, hour, minute, city, nation,
+        active_points=active_points, ambiguous=ambiguous, nonexistent=nonexistent,
+    )
     chart = KerykeionChartSVG(subject, "Natal", None, "output", style_path, font, font_name,  bg_color, bg_image, bg_image_wheel, name_spacing)
     chart.makeSVG()
     print(f"Fuentes del chart: {chart.font, chart.font_name}")
@@ -46,5 +59,14 @@ def generar_archivo():
                      mimetype='image/svg+xml',
                      as_attachment=True)
 
+@app.route('/stats', methods=['GET'])
+def estadisticas():
+    # Contention of the ephemeris lock and subject cache usage, to tune the number of threads
+    return jsonify({
+        "ephemeris_lock": asdict(get_ephemeris_manager().lock_stats()),
+        "subject_cache": asdict(subject_cache.stats()),
+    })
+
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=8000, debug=False)
+    # The ephemeris access is serialized by the ephemeris manager, so the requests can be served by many threads
+    app.run(host='0.0.0.0', port=8000, debug=False, threaded=True)
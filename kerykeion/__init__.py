@@ -101,8 +101,18 @@
 # Local
 from .astrological_subject import AstrologicalSubject
 from .charts.kerykeion_chart_svg import KerykeionChartSVG
+from .charts.chart_renderer import ChartRenderer
+from .charts.live_transit_chart import LiveTransitChart
+from .charts.partner_charts import PartnerCharts
 from .kr_types import *
 from .relationship_score import RelationshipScore
 from .aspects import SynastryAspects, NatalAspects
 from .report import Report
 from .settings import KerykeionSettingsModel, get_settings
+from .ephemeris import ephemeris_series
+from .subject_cache import SubjectCache, AstrologicalSubjectSnapshot
+from .multi_zodiac import MultiZodiacSubject
+from .relocation import RelocationBatch
+from .astrocartography import Astrocartography
+from .rectification import RectificationSweep
+from .celestial_points import CelestialPoint, get_settings_active_points
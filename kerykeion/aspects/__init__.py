@@ -9,3 +9,15 @@ The aspects module contains the classes and functions for calculating
 
 from .synastry_aspects import SynastryAspects
 from .natal_aspects import NatalAspects
+from .aspects_array import AspectsArray, ASPECT_DTYPE, compute_aspects_array
+from .aspect_patterns import AspectPattern, AspectGraph, find_aspect_patterns
+from .aspects_filters import (
+    filter_aspects,
+    relevant_aspects_filters,
+    active_aspects,
+    axes_orb,
+    points_whitelist,
+    max_orb,
+    major_aspects,
+    minor_aspects,
+)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+
+    Aspect patterns: figures of three or more points linked by aspects.
+    The aspects of every kind are stored as an adjacency bitset per point,
+    the bit j of adjacency[kind][i] is set when the points i and j are in that aspect,
+    so the common neighbours of two points are a single bitwise and.
+
+    * Stellium: At least four points linked together in a series of continuous conjunctions.
+    * Grand trine: Three points in trine to each other.
+    * Grand cross: Two pairs of opposing points squared to each other.
+    * T-Square: Two points in opposition squared to a third, the apex.
+    * Yod: Two points in sextile, both in quincunx to a third, the apex.
+    * Kite: A grand trine with a fourth point, the apex, opposite one of its points and sextile to the other two.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence, Union
+from kerykeion.kr_types import AspectPatternName
+
+# The aspects of the patterns, by their degrees.
+PATTERN_ASPECTS = {
+    "conjunction": 0,
+    "sextile": 60,
+    "square": 90,
+    "trine": 120,
+    "quincunx": 150,
+    "opposition": 180,
+}
+
+# The minimum number of points of a stellium.
+STELLIUM_MIN_POINTS = 4
+
+
+@dataclass(frozen=True)
+class AspectPattern:
+    """
+    A pattern found in a chart.
+
+    Args:
+    - name (AspectPatternName): The kind of pattern.
+    - points (tuple[str, ...]): The names of the points of the pattern.
+    - apex (str, optional): The focal point of a T-Square, a Yod or a Kite. Defaults to None.
+    """
+
+    name: AspectPatternName
+    points: tuple[str, ...]
+    apex: Union[str, None] = None
+
+
+def _bits(mask: int) -> Iterator[int]:
+    """
+    Yields the indexes of the bits set in a mask, from the lowest.
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class AspectGraph:
+    """
+    The aspects of a chart as adjacency bitsets, one for every kind of PATTERN_ASPECTS.
+
+    Args:
+    - points (Sequence[str]): The names of the points, the aspects of other points are ignored.
+    - aspects (Iterable[dict]): The aspects, as in NatalAspects.all_aspects.
+    """
+
+    def __init__(self, points: Sequence[str], aspects: Iterable[dict]) -> None:
+        self.points = tuple(points)
+        self.adjacency = {kind: [0] * len(self.points) for kind in PATTERN_ASPECTS}
+
+        indexes = {name: i for i, name in enumerate(self.points)}
+        kinds = {degree: kind for kind, degree in PATTERN_ASPECTS.items()}
+
+        for aspect in aspects:
+            kind = kinds.get(aspect["aspect_degrees"])
+            first, second = indexes.get(aspect["p1_name"]), indexes.get(aspect["p2_name"])
+            if kind is None or first is None or second is None or first == second:
+                continue
+
+            self.adjacency[kind][first] |= 1 << second
+            self.adjacency[kind][second] |= 1 << first
+
+    def _names(self, indexes: Iterable[int]) -> tuple[str, ...]:
+        return tuple(self.points[i] for i in sorted(indexes))
+
+    def _pairs(self, kind: str) -> Iterator[tuple[int, int]]:
+        """
+        Yields the pairs of points in an aspect, with the first index lower than the second.
+        """
+        for first, neighbours in enumerate(self.adjacency[kind]):
+            for second in _bits(neighbours >> (first + 1)):
+                yield first, first + 1 + second
+
+    def _triangles(self, kind: str) -> Iterator[tuple[int, int, int]]:
+        """
+        Yields the sorted triples of points all in an aspect with each other.
+        """
+        adjacency = self.adjacency[kind]
+        for first, second in self._pairs(kind):
+            for third in _bits(adjacency[first] & adjacency[second] & ~((1 << (second + 1)) - 1)):
+                yield first, second, third
+
+    def grand_trines(self) -> list[AspectPattern]:
+        return [AspectPattern("Grand_Trine", self._names(triangle)) for triangle in self._triangles("trine")]
+
+    def t_squares(self) -> list[AspectPattern]:
+        square = self.adjacency["square"]
+        return [
+            AspectPattern("T_Square", self._names((first, second, apex)), self.points[apex])
+            for first, second in self._pairs("opposition")
+            for apex in _bits(square[first] & square[second])
+        ]
+
+    def grand_crosses(self) -> list[AspectPattern]:
+        square, opposition = self.adjacency["square"], self.adjacency["opposition"]
+        crosses = []
+        # The first opposition has the lowest point of the cross, the other one has higher points only.
+        for first, second in self._pairs("opposition"):
+            higher = ~((1 << (first + 1)) - 1)
+            for third in _bits(square[first] & square[second] & higher):
+                for fourth in _bits(opposition[third] & square[first] & square[second] & ~((1 << (third + 1)) - 1)):
+                    crosses.append(AspectPattern("Grand_Cross", self._names((first, second, third, fourth))))
+
+        return crosses
+
+    def yods(self) -> list[AspectPattern]:
+        quincunx, sextile = self.adjacency["quincunx"], self.adjacency["sextile"]
+        yods = []
+        for apex, base in enumerate(quincunx):
+            for first in _bits(base):
+                for second in _bits(base & sextile[first] & ~((1 << (first + 1)) - 1)):
+                    yods.append(AspectPattern("Yod", self._names((first, second, apex)), self.points[apex]))
+
+        return yods
+
+    def kites(self) -> list[AspectPattern]:
+        sextile, opposition = self.adjacency["sextile"], self.adjacency["opposition"]
+        kites = []
+        for triangle in self._triangles("trine"):
+            for opposite in triangle:
+                first, second = (point for point in triangle if point != opposite)
+                for apex in _bits(opposition[opposite] & sextile[first] & sextile[second]):
+                    kites.append(AspectPattern("Kite", self._names(triangle + (apex,)), self.points[apex]))
+
+        return kites
+
+    def stelliums(self, min_points: int = STELLIUM_MIN_POINTS) -> list[AspectPattern]:
+        """
+        The groups of at least min_points points connected by conjunctions.
+        """
+        conjunction = self.adjacency["conjunction"]
+        stelliums = []
+        visited = 0
+        for start in range(len(self.points)):
+            if visited >> start & 1:
+                continue
+
+            group, frontier = 1 << start, 1 << start
+            while frontier:
+                reached = 0
+                for point in _bits(frontier):
+                    reached |= conjunction[point]
+                frontier = reached & ~group
+                group |= frontier
+
+            visited |= group
+            if bin(group).count("1") >= min_points:
+                stelliums.append(AspectPattern("Stellium", self._names(_bits(group))))
+
+        return stelliums
+
+    def patterns(self) -> list[AspectPattern]:
+        """
+        All the patterns, grouped by kind.
+        """
+        return self.grand_trines() + self.t_squares() + self.grand_crosses() + self.yods() + self.kites() + self.stelliums()
+
+
+def find_aspect_patterns(points: Sequence[str], aspects: Iterable[dict]) -> list[AspectPattern]:
+    """
+    Finds the aspect patterns between some points.
+
+    Args:
+    - points (Sequence[str]): The names of the points of the patterns.
+    - aspects (Iterable[dict]): The aspects, as in NatalAspects.all_aspects.
+
+    Example:
+        >>> aspects = NatalAspects(subject)
+        >>> find_aspect_patterns(["Sun", "Moon", "Mars"], aspects.all_aspects)
+    """
+    return AspectGraph(points, aspects).patterns()
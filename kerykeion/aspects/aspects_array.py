@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import numpy as np
+from typing import Iterator, Sequence, Union
+from kerykeion.kr_types import KerykeionException
+
+# One row per aspect: the indexes of the two points in their lists, their positions,
+# the aspect id (its index in the aspects settings), the orbit and the difference of the positions.
+ASPECT_DTYPE = np.dtype(
+    [
+        ("p1_index", np.int32),
+        ("p2_index", np.int32),
+        ("p1_abs_pos", np.float64),
+        ("p2_abs_pos", np.float64),
+        ("aid", np.int32),
+        ("orbit", np.float64),
+        ("diff", np.float64),
+    ]
+)
+
+
+class AspectsArray:
+    """
+    Aspects stored in a NumPy structured array, see ASPECT_DTYPE.
+
+    Only numbers are stored: the names and the colors of the aspects and the names
+    and the ids of the points are resolved from the settings only when they are read.
+    Iterating, or indexing with an integer, gives the same dictionaries of
+    NatalAspects.all_aspects, for the code that works with them.
+
+    Args:
+    - data (np.ndarray): The aspects, with dtype ASPECT_DTYPE.
+    - first_points (Sequence[dict]): The points of the first chart, indexed by p1_index.
+    - second_points (Sequence[dict]): The points of the second chart, indexed by p2_index.
+    - aspects_settings (list): The aspects settings, indexed by aid.
+    - celestial_points_settings (list): The celestial points settings, with the ids of the points.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        first_points: Sequence[dict],
+        second_points: Sequence[dict],
+        aspects_settings: list,
+        celestial_points_settings: list,
+    ) -> None:
+        self.data = data
+        self.first_points = first_points
+        self.second_points = second_points
+        self.aspects_settings = aspects_settings
+        self.celestial_points_settings = celestial_points_settings
+
+        self._points_ids: Union[dict[str, int], None] = None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[dict]:
+        for index in range(len(self.data)):
+            yield self._as_dict(index)
+
+    def __getitem__(self, item) -> Union[dict, "AspectsArray"]:
+        if isinstance(item, (int, np.integer)):
+            return self._as_dict(int(item))
+
+        return self.where(item)
+
+    def __repr__(self) -> str:
+        return f"AspectsArray({len(self)} aspects)"
+
+    def where(self, mask: Union[np.ndarray, slice]) -> "AspectsArray":
+        """
+        Returns the aspects selected by a boolean mask, an index array or a slice, eg. aspects.where(aspects.data["orbit"] < 2).
+        """
+        return AspectsArray(self.data[mask], self.first_points, self.second_points, self.aspects_settings, self.celestial_points_settings)
+
+    @property
+    def names(self) -> np.ndarray:
+        """
+        The names of the aspects.
+        """
+        return np.array([aspect["name"] for aspect in self.aspects_settings], dtype=object)[self.data["aid"]]
+
+    @property
+    def colors(self) -> np.ndarray:
+        """
+        The colors of the aspects.
+        """
+        return np.array([aspect["color"] for aspect in self.aspects_settings], dtype=object)[self.data["aid"]]
+
+    def _point_id(self, name: str) -> Union[int, None]:
+        """
+        The id of a point in the celestial points settings, like planet_id_decoder.
+        """
+        if self._points_ids is None:
+            self._points_ids = {}
+            for point in self.celestial_points_settings:
+                self._points_ids.setdefault(point["name"], point["id"])
+
+        return self._points_ids.get(name)
+
+    def _as_dict(self, index: int) -> dict:
+        row = self.data[index]
+        p1_name = self.first_points[row["p1_index"]]["name"]
+        p2_name = self.second_points[row["p2_index"]]["name"]
+        aspect = self.aspects_settings[row["aid"]]
+
+        return {
+            "p1_name": p1_name,
+            "p1_abs_pos": float(row["p1_abs_pos"]),
+            "p2_name": p2_name,
+            "p2_abs_pos": float(row["p2_abs_pos"]),
+            "aspect": aspect["name"],
+            "orbit": float(row["orbit"]),
+            "aspect_degrees": aspect["degree"],
+            "color": aspect["color"],
+            "aid": int(row["aid"]),
+            "diff": float(row["diff"]),
+            "p1": self._point_id(p1_name),
+            "p2": self._point_id(p2_name),
+        }
+
+    def to_list(self) -> list[dict]:
+        """
+        Returns all the aspects as dictionaries.
+        """
+        return list(self)
+
+
+def compute_aspects_array(
+    first_points: Sequence[dict],
+    second_points: Sequence[dict],
+    aspects_settings: list,
+    celestial_points_settings: list,
+    unique_pairs: bool = False,
+) -> AspectsArray:
+    """
+    Finds the aspects between two lists of points with array operations.
+
+    The aspect of a pair is the first one of the settings that matches the integer part of their distance,
+    like get_aspect_from_two_points: within the orb for the first aspect (the conjunction) and
+    between degree - orb and degree + orb for the others.
+
+    Args:
+    - first_points (Sequence[dict]): The points of the first chart, with name and abs_pos.
+    - second_points (Sequence[dict]): The points of the second chart, with name and abs_pos.
+    - aspects_settings (list): The aspects settings.
+    - celestial_points_settings (list): The celestial points settings.
+    - unique_pairs (bool, optional): Only the pairs with the first index lower than the second one,
+        for the aspects of a chart with itself. Defaults to False.
+
+    Returns:
+        AspectsArray: The aspects, in the order of the pairs.
+    """
+    if not aspects_settings:
+        raise KerykeionException("There are no aspects in the settings!")
+
+    first_positions = np.array([point["abs_pos"] for point in first_points], dtype=np.float64)
+    second_positions = np.array([point["abs_pos"] for point in second_points], dtype=np.float64)
+
+    differences = first_positions[:, np.newaxis] - second_positions[np.newaxis, :]
+    # Same as abs(swe.difdeg2n(first, second))
+    signed_distances = differences % 360.0
+    distances = np.abs(np.where(signed_distances >= 180.0, signed_distances - 360.0, signed_distances))
+    integer_distances = np.trunc(distances)
+
+    degrees = np.array([aspect["degree"] for aspect in aspects_settings], dtype=np.float64)
+    orbs = np.array([aspect["orb"] for aspect in aspects_settings], dtype=np.float64)
+    lower_bounds = degrees - orbs
+    lower_bounds[0] = -np.inf
+
+    matches = (lower_bounds[:, np.newaxis, np.newaxis] <= integer_distances) & (integer_distances <= (degrees + orbs)[:, np.newaxis, np.newaxis])
+    found = matches.any(axis=0)
+    if unique_pairs:
+        found &= np.triu(np.ones_like(found), k=1)
+
+    p1_indexes, p2_indexes = np.nonzero(found)
+    aids = np.argmax(matches[:, p1_indexes, p2_indexes], axis=0)
+
+    data = np.empty(len(p1_indexes), dtype=ASPECT_DTYPE)
+    data["p1_index"] = p1_indexes
+    data["p2_index"] = p2_indexes
+    data["p1_abs_pos"] = first_positions[p1_indexes]
+    data["p2_abs_pos"] = second_positions[p2_indexes]
+    data["aid"] = aids
+    data["orbit"] = distances[p1_indexes, p2_indexes] - degrees[aids]
+    data["diff"] = np.abs(differences[p1_indexes, p2_indexes])
+
+    return AspectsArray(data, first_points, second_points, aspects_settings, celestial_points_settings)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+
+    Composable filters of the aspects lists of NatalAspects and SynastryAspects.
+    A filter is a predicate on one aspect, filter_aspects() keeps the aspects
+    that satisfy all the predicates, in a single pass.
+"""
+
+from typing import Callable, Iterable, Union
+from kerykeion.kr_types import KerykeionSettingsModel
+
+AspectPredicate = Callable[[dict], bool]
+
+# The points on the axes of the chart: Ascendant, Medium Coeli, Descendant and Imum Coeli.
+AXES = frozenset(
+    (
+        "First_House",
+        "Tenth_House",
+        "Seventh_House",
+        "Fourth_House",
+    )
+)
+
+
+def active_aspects(aspects_settings: list) -> AspectPredicate:
+    """
+    Keeps the aspects active in the settings.
+    """
+    active_ids = frozenset(aid for aid, aspect in enumerate(aspects_settings) if aspect["is_active"])
+    return lambda aspect: aspect["aid"] in active_ids
+
+
+def axes_orb(axes_orbit: Union[int, float], axes: Iterable[str] = AXES) -> AspectPredicate:
+    """
+    Keeps the aspects of the axes only when their orb is smaller than axes_orbit.
+    The aspects between two planets are always kept.
+    """
+    axes = frozenset(axes)
+    return lambda aspect: abs(aspect["orbit"]) < axes_orbit or (aspect["p1_name"] not in axes and aspect["p2_name"] not in axes)
+
+
+def points_whitelist(points: Iterable[str]) -> AspectPredicate:
+    """
+    Keeps the aspects between two of the points.
+    """
+    points = frozenset(points)
+    return lambda aspect: aspect["p1_name"] in points and aspect["p2_name"] in points
+
+
+def max_orb(orb: Union[int, float]) -> AspectPredicate:
+    """
+    Keeps the aspects with an orb up to orb degrees.
+    """
+    return lambda aspect: abs(aspect["orbit"]) <= orb
+
+
+def major_aspects(aspects_settings: list) -> AspectPredicate:
+    """
+    Keeps the major aspects of the settings.
+    """
+    major_ids = frozenset(aid for aid, aspect in enumerate(aspects_settings) if aspect["is_major"])
+    return lambda aspect: aspect["aid"] in major_ids
+
+
+def minor_aspects(aspects_settings: list) -> AspectPredicate:
+    """
+    Keeps the minor aspects of the settings.
+    """
+    minor_ids = frozenset(aid for aid, aspect in enumerate(aspects_settings) if aspect["is_minor"])
+    return lambda aspect: aspect["aid"] in minor_ids
+
+
+def relevant_aspects_filters(settings: Union[KerykeionSettingsModel, dict]) -> list[AspectPredicate]:
+    """
+    The filters of the relevant aspects: the active aspects, with the axes inside the axes orbit.
+    """
+    return [
+        active_aspects(settings["aspects"]),
+        axes_orb(settings["general_settings"]["axes_orbit"]),
+    ]
+
+
+def filter_aspects(aspects: Iterable[dict], *predicates: AspectPredicate) -> list[dict]:
+    """
+    Returns the aspects that satisfy all the predicates, in the same order.
+
+    Example:
+        >>> settings = get_settings()
+        >>> filter_aspects(NatalAspects(subject).all_aspects, *relevant_aspects_filters(settings), max_orb(3))
+    """
+    return [aspect for aspect in aspects if all(predicate(aspect) for predicate in predicates)]
@@ -6,6 +6,7 @@
 
 from kerykeion import AstrologicalSubject
 from kerykeion.settings import KerykeionSettingsModel
+from kerykeion.kr_types import KerykeionException
 from swisseph import difdeg2n
 from typing import Union
 
@@ -181,6 +182,10 @@ def get_active_points_list(subject: AstrologicalSubject, settings: Union[Kerykei
     point_list = []
     for planet in settings["celestial_points"]:
         if planet["is_active"] == True:
-            point_list.append(subject[planet["name"].lower()])
+            point = subject[planet["name"].lower()]
+            if point is None:
+                raise KerykeionException(f"{planet['name']} is active in the settings but it is not an active point of {subject.name}!")
+
+            point_list.append(point)
 
     return point_list
@@ -10,15 +10,14 @@ from typing import Union
 from kerykeion.settings.kerykeion_settings import get_settings
 from dataclasses import dataclass
 from functools import cached_property
-from kerykeion.aspects.aspects_utils import planet_id_decoder, get_aspect_from_two_points, get_active_points_list
+from kerykeion.aspects.aspects_utils import get_active_points_list
+from kerykeion.aspects.aspects_array import AspectsArray, compute_aspects_array
+from kerykeion.aspects.aspects_filters import filter_aspects, relevant_aspects_filters
+from kerykeion.aspects.aspect_patterns import AspectPattern, find_aspect_patterns
 
 
-AXES_LIST = [
-    "First_House",
-    "Tenth_House",
-    "Seventh_House",
-    "Fourth_House",
-]
+# Points left out of the aspect patterns, the True Node is always conjunct the Mean Node.
+PATTERNS_EXCLUDED_POINTS = ["True_Node"]
 
 
 @dataclass
@@ -35,7 +34,24 @@ class NatalAspects:
 
         self.celestial_points = self.settings["celestial_points"]
         self.aspects_settings = self.settings["aspects"]
-        self.axes_orbit_settings = self.settings["general_settings"]["axes_orbit"]
+
+    @cached_property
+    def aspects_array(self) -> AspectsArray:
+        """
+        Return all the aspects of the points in the natal chart, without repetitions,
+        in an AspectsArray: the numbers in a NumPy structured array and the names
+        and the colors read from the settings only when needed.
+        """
+
+        active_points_list = get_active_points_list(self.user, self.settings)
+
+        return compute_aspects_array(
+            active_points_list,
+            active_points_list,
+            self.aspects_settings,
+            self.celestial_points,
+            unique_pairs=True,
+        )
 
     @cached_property
     def all_aspects(self):
@@ -45,77 +61,37 @@ class NatalAspects:
         without repetitions.
         """
 
-        active_points_list = get_active_points_list(self.user, self.settings)
-
-        self.all_aspects_list = []
-
-        for first in range(len(active_points_list)):
-            # Generates the aspects list without repetitions
-            for second in range(first + 1, len(active_points_list)):
-                verdict, name, orbit, aspect_degrees, color, aid, diff = get_aspect_from_two_points(
-                    self.aspects_settings, active_points_list[first]["abs_pos"], active_points_list[second]["abs_pos"]
-                )
-
-                if verdict == True:
-                    d_asp = {
-                        "p1_name": active_points_list[first]["name"],
-                        "p1_abs_pos": active_points_list[first]["abs_pos"],
-                        "p2_name": active_points_list[second]["name"],
-                        "p2_abs_pos": active_points_list[second]["abs_pos"],
-                        "aspect": name,
-                        "orbit": orbit,
-                        "aspect_degrees": aspect_degrees,
-                        "color": color,
-                        "aid": aid,
-                        "diff": diff,
-                        "p1": planet_id_decoder(self.celestial_points, active_points_list[first]["name"]),
-                        "p2": planet_id_decoder(
-                            self.celestial_points,
-                            active_points_list[second]["name"],
-                        ),
-                    }
-
-                    self.all_aspects_list.append(d_asp)
+        self.all_aspects_list = self.aspects_array.to_list()
 
         return self.all_aspects_list
 
     @cached_property
     def relevant_aspects(self):
         """
-        Filters the aspects list with the desired points, in this case
-        the most important are hardcoded.
-        Set the list with set_points and creating a list with the names
-        or the numbers of the houses.
+        Filters the aspects list, keeping the active aspects and the aspects
+        of the axes inside the axes orbit, see aspects_filters.
         """
 
         logging.debug("Relevant aspects not already calculated, calculating now...")
-        self.all_aspects
+        self.aspects = filter_aspects(self.all_aspects, *relevant_aspects_filters(self.settings))
 
-        aspects_filtered = []
-        for a in self.all_aspects_list:
-            if self.aspects_settings[a["aid"]]["is_active"] == True:
-                aspects_filtered.append(a)
-
-        axes_list = AXES_LIST
-        counter = 0
-
-        aspects_list_subtract = []
-        for a in aspects_filtered:
-            counter += 1
-            name_p1 = str(a["p1_name"])
-            name_p2 = str(a["p2_name"])
-
-            if name_p1 in axes_list:
-                if abs(a["orbit"]) >= self.axes_orbit_settings:
-                    aspects_list_subtract.append(a)
+        return self.aspects
 
-            elif name_p2 in axes_list:
-                if abs(a["orbit"]) >= self.axes_orbit_settings:
-                    aspects_list_subtract.append(a)
+    @cached_property
+    def aspect_patterns(self) -> list[AspectPattern]:
+        """
+        Finds the aspect patterns (grand trines, T-squares, grand crosses, yods, kites and stelliums)
+        between the active celestial points, see aspect_patterns.
+        Only the aspects active in the settings form patterns, like in relevant_aspects.
+        """
 
-        self.aspects = [item for item in aspects_filtered if item not in aspects_list_subtract]
+        points = [
+            point["name"]
+            for point in get_active_points_list(self.user, self.settings)
+            if point["point_type"] != "House" and point["name"] not in PATTERNS_EXCLUDED_POINTS
+        ]
 
-        return self.aspects
+        return find_aspect_patterns(points, self.relevant_aspects)
 
 
 if __name__ == "__main__":
@@ -133,3 +109,6 @@ if __name__ == "__main__":
     # Relevant aspects
     aspects = NatalAspects(johnny)
     # print(aspects.relevant_aspects)
+
+    # Aspect patterns
+    # print(aspects.aspect_patterns)
@@ -4,18 +4,21 @@
 """
 
 from kerykeion import AstrologicalSubject
+import logging
 from pathlib import Path
 from typing import Union
 from functools import cached_property
 
-from kerykeion.aspects.natal_aspects import NatalAspects
 from kerykeion.settings.kerykeion_settings import get_settings
-from kerykeion.aspects.aspects_utils import planet_id_decoder, get_aspect_from_two_points, get_active_points_list
+from kerykeion.aspects.aspects_utils import get_active_points_list
+from kerykeion.aspects.aspects_array import AspectsArray, compute_aspects_array
+from kerykeion.aspects.aspects_filters import filter_aspects, relevant_aspects_filters
 
 
-class SynastryAspects(NatalAspects):
+class SynastryAspects:
     """
     Generates an object with all the aspects between two persons.
+    The aspect patterns are found in a single chart, see NatalAspects.aspect_patterns.
     """
 
     def __init__(
@@ -34,12 +37,29 @@ class SynastryAspects(NatalAspects):
 
         self.celestial_points = self.settings["celestial_points"]
         self.aspects_settings = self.settings["aspects"]
-        self.axes_orbit_settings = self.settings["general_settings"]["axes_orbit"]
 
         # Private variables of the aspects
         self._all_aspects: Union[list, None] = None
         self._relevant_aspects: Union[list, None] = None
 
+    @cached_property
+    def aspects_array(self) -> AspectsArray:
+        """
+        Return all the aspects between the points of the two charts
+        in an AspectsArray, see NatalAspects.aspects_array.
+        """
+
+        # Celestial Points Lists
+        first_active_points_list = get_active_points_list(self.first_user, self.settings)
+        second_active_points_list = get_active_points_list(self.second_user, self.settings)
+
+        return compute_aspects_array(
+            first_active_points_list,
+            second_active_points_list,
+            self.aspects_settings,
+            self.celestial_points,
+        )
+
     @cached_property
     def all_aspects(self):
         """
@@ -51,46 +71,22 @@ class SynastryAspects(NatalAspects):
         if self._all_aspects is not None:
             return self._all_aspects
 
-        # Celestial Points Lists
-        first_active_points_list = get_active_points_list(self.first_user, self.settings)
-        second_active_points_list = get_active_points_list(self.second_user, self.settings)
-
-        self.all_aspects_list = []
-
-        for first in range(len(first_active_points_list)):
-            # Generates the aspects list whitout repetitions
-            for second in range(len(second_active_points_list)):
-                verdict, name, orbit, aspect_degrees, color, aid, diff = get_aspect_from_two_points(
-                    self.aspects_settings,
-                    first_active_points_list[first]["abs_pos"],
-                    second_active_points_list[second]["abs_pos"],
-                )
-
-                if verdict == True:
-                    d_asp = {
-                        "p1_name": first_active_points_list[first]["name"],
-                        "p1_abs_pos": first_active_points_list[first]["abs_pos"],
-                        "p2_name": second_active_points_list[second]["name"],
-                        "p2_abs_pos": second_active_points_list[second]["abs_pos"],
-                        "aspect": name,
-                        "orbit": orbit,
-                        "aspect_degrees": aspect_degrees,
-                        "color": color,
-                        "aid": aid,
-                        "diff": diff,
-                        "p1": planet_id_decoder(
-                            self.settings.celestial_points, first_active_points_list[first]["name"]
-                        ),
-                        "p2": planet_id_decoder(
-                            self.settings.celestial_points,
-                            second_active_points_list[second]["name"],
-                        ),
-                    }
-
-                    self.all_aspects_list.append(d_asp)
+        self.all_aspects_list = self.aspects_array.to_list()
 
         return self.all_aspects_list
 
+    @cached_property
+    def relevant_aspects(self):
+        """
+        Filters the aspects list, keeping the active aspects and the aspects
+        of the axes inside the axes orbit, see aspects_filters.
+        """
+
+        logging.debug("Relevant aspects not already calculated, calculating now...")
+        self.aspects = filter_aspects(self.all_aspects, *relevant_aspects_filters(self.settings))
+
+        return self.aspects
+
 
 if __name__ == "__main__":
     from kerykeion.utilities import setup_logging
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import numpy as np
+import swisseph as swe
+from dataclasses import dataclass
+from typing import Sequence, Union, get_args
+from kerykeion.astrological_subject import AstrologicalSubject
+from kerykeion.ephemeris.ephemeris_manager import get_ephemeris_manager
+from kerykeion.ephemeris.ephemeris_utils import DEFAULT_BODIES, get_body_number
+from kerykeion.kr_types import KerykeionException, AstrocartographyAngle
+
+# The lines are not computed near the poles, where the rising and setting lines are not defined.
+DEFAULT_MAX_LATITUDE = 85.0
+
+# Distance between two points of a line, in degrees of latitude.
+DEFAULT_LATITUDE_STEP = 0.5
+
+
+@dataclass
+class AstrocartographyLine:
+    """
+    Where a body is on an angle of the chart.
+
+    Args:
+    - body (str): The name of the body.
+    - angle (AstrocartographyAngle): ASC, DSC, MC or IC.
+    - segments (list[np.ndarray]): The pieces of the line, arrays of (longitude, latitude) points.
+        A line is broken where it crosses the antimeridian and where the body never rises or sets.
+    """
+
+    body: str
+    angle: AstrocartographyAngle
+    segments: list[np.ndarray]
+
+
+class Astrocartography:
+    """
+    The astrocartography lines of an instant: the places of the Earth where a body is rising (ASC),
+    setting (DSC), culminating (MC) or anticulminating (IC).
+
+    The right ascension and the declination of the bodies and the sidereal time of Greenwich
+    are computed once, then the lines are solved for all the latitudes at once:
+    a body culminates at the longitude where the local sidereal time equals its right ascension,
+    and rises and sets where its hour angle is -H0 and +H0, with cos(H0) = -tan(latitude) * tan(declination).
+    The positions are geocentric, without refraction, and the lines are "in mundo", with the
+    declination of the body and not of its ecliptic degree.
+
+    Args:
+    - subject (AstrologicalSubject): The subject with the instant of the lines.
+    - bodies (Sequence[str], optional): The bodies. Defaults to all the points of AstrologicalSubject.
+    - max_latitude (float, optional): The lines go from -max_latitude to max_latitude. Defaults to 85.
+    - latitude_step (float, optional): The distance between two points of the lines, in degrees. Defaults to 0.5.
+
+    Example:
+        >>> subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+        >>> lines = Astrocartography(subject)
+        >>> lines.get_line("Sun", "MC").segments
+        >>> lines.geojson()
+    """
+
+    subject: AstrologicalSubject
+    bodies: tuple[str, ...]
+    latitudes: np.ndarray
+    right_ascensions: np.ndarray
+    declinations: np.ndarray
+    sidereal_time: float
+    lines: list[AstrocartographyLine]
+
+    def __init__(
+        self,
+        subject: AstrologicalSubject,
+        bodies: Sequence[str] = DEFAULT_BODIES,
+        max_latitude: float = DEFAULT_MAX_LATITUDE,
+        latitude_step: float = DEFAULT_LATITUDE_STEP,
+    ) -> None:
+        if not 0 < max_latitude < 90:
+            raise KerykeionException(f"The maximum latitude must be between 0 and 90 degrees, got: {max_latitude}")
+
+        if latitude_step <= 0:
+            raise KerykeionException(f"The latitude step must be positive, got: {latitude_step}")
+
+        self.subject = subject
+        self.bodies = tuple(bodies)
+        self.latitudes = np.linspace(-max_latitude, max_latitude, int(np.ceil(2 * max_latitude / latitude_step)) + 1)
+
+        self._equatorial_positions()
+        self.lines = self._lines()
+
+    def _equatorial_positions(self) -> None:
+        """
+        Computes the right ascensions and declinations of the bodies and the sidereal time of Greenwich, in degrees.
+        """
+        ephemeris_manager = get_ephemeris_manager()
+        iflag = swe.FLG_SWIEPH | swe.FLG_EQUATORIAL
+        julian_day = self.subject.julian_day
+
+        with ephemeris_manager.configured():
+            positions = np.array([ephemeris_manager.calc(julian_day, get_body_number(body), iflag)[:2] for body in self.bodies])
+            self.sidereal_time = swe.sidtime(julian_day) * 15
+
+        self.right_ascensions = positions[:, 0]
+        self.declinations = positions[:, 1]
+
+    def _lines(self) -> list[AstrocartographyLine]:
+        """
+        Solves the four lines of every body on the latitudes grid.
+        """
+        latitudes = self.latitudes[np.newaxis, :]
+        meridians = (self.right_ascensions - self.sidereal_time)[:, np.newaxis]
+
+        with np.errstate(invalid="ignore"):
+            cos_semi_arcs = -np.tan(np.radians(latitudes)) * np.tan(np.radians(self.declinations))[:, np.newaxis]
+            # NaN where the body is circumpolar or never rises.
+            semi_arcs = np.degrees(np.arccos(np.where(np.abs(cos_semi_arcs) <= 1, cos_semi_arcs, np.nan)))
+
+        longitudes = {
+            "ASC": meridians - semi_arcs,
+            "DSC": meridians + semi_arcs,
+            "MC": np.broadcast_to(meridians, semi_arcs.shape),
+            "IC": np.broadcast_to(meridians + 180, semi_arcs.shape),
+        }
+
+        lines = []
+        for i, body in enumerate(self.bodies):
+            for angle in get_args(AstrocartographyAngle):
+                segments = _split_line((longitudes[angle][i] + 180) % 360 - 180, self.latitudes)
+                lines.append(AstrocartographyLine(body, angle, segments))
+
+        return lines
+
+    def get_line(self, body: str, angle: AstrocartographyAngle) -> AstrocartographyLine:
+        """
+        Returns the line of a body on an angle.
+        """
+        for line in self.lines:
+            if line.body == body and line.angle == angle:
+                return line
+
+        raise KerykeionException(f"No {angle} line for {body}!")
+
+    def geojson(self) -> dict:
+        """
+        Returns the lines as a GeoJSON FeatureCollection, with a MultiLineString for every line
+        and the body and the angle in its properties.
+        """
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"body": line.body, "angle": line.angle},
+                    "geometry": {
+                        "type": "MultiLineString",
+                        "coordinates": [segment.tolist() for segment in line.segments],
+                    },
+                }
+                for line in self.lines
+            ],
+        }
+
+
+def _split_line(longitudes: np.ndarray, latitudes: np.ndarray) -> list[np.ndarray]:
+    """
+    Splits a line, with longitudes in [-180, 180), where it has no points (NaN)
+    and where it crosses the antimeridian. At the crossings both pieces are
+    extended to the antimeridian, at the interpolated latitude.
+    """
+    valid = ~np.isnan(longitudes)
+    steps = np.diff(longitudes)
+    crossings = np.flatnonzero(np.abs(np.nan_to_num(steps)) > 180)
+    gaps = np.flatnonzero(valid[:-1] != valid[1:])
+    breaks = np.union1d(crossings, gaps) + 1
+
+    segments = []
+    previous_end: Union[np.ndarray, None] = None
+    for start, end in zip(np.concatenate((np.asarray([0]), breaks)), np.concatenate((breaks, np.asarray([len(longitudes)])))):
+        if not valid[start]:
+            previous_end = None
+            continue
+
+        points = np.column_stack((longitudes[start:end], latitudes[start:end]))
+
+        if previous_end is not None:
+            # The line came from the other side of the antimeridian.
+            points = np.vstack((previous_end, points))
+
+        previous_end = None
+        if end < len(longitudes) and end - 1 in crossings:
+            lng_a, lng_b = longitudes[end - 1], longitudes[end]
+            side = 180.0 if lng_a > 0 else -180.0
+            fraction = (side - lng_a) / ((lng_b + 2 * side) - lng_a)
+            latitude = latitudes[end - 1] + fraction * (latitudes[end] - latitudes[end - 1])
+
+            points = np.vstack((points, [side, latitude]))
+            previous_end = np.array([[-side, latitude]])
+
+        if len(points) > 1:
+            segments.append(points)
+
+    return segments
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+    lines = Astrocartography(subject)
+    for line in lines.lines[:8]:
+        print(line.body, line.angle, [len(segment) for segment in line.segments])
@@ -3,8 +3,6 @@
     This is part of Kerykeion (C) 2023 Giacomo Battaglia
 """
 
-import math
-import pytz
 import swisseph as swe
 import logging
 import calendar
@@ -13,16 +11,30 @@ from kerykeion.fetch_geonames import FetchGeonames
 from kerykeion.kr_types import (
     KerykeionException,
     ZodiacType,
+    SiderealMode,
+    EphemerisPrecision,
+    EphemerisBackend,
+    AmbiguousTimePolicy,
+    NonexistentTimePolicy,
     AstrologicalSubjectModel,
-    LunarPhaseModel,
     KerykeionPointModel,
+    Houses,
+    Planet,
 )
-from kerykeion.utilities import get_number_from_name, calculate_position
+from kerykeion.celestial_points import CELESTIAL_POINTS, CelestialPoint, get_active_points, get_celestial_point
+from kerykeion.utilities import calculate_position, calculate_lunar_phase, calculate_houses_indexes
+from kerykeion.timezones import local_to_utc, get_default_timezone_finder, get_timezone_from_coordinates
+from kerykeion.ephemeris.ephemeris_manager import get_ephemeris_manager
+from kerykeion.ephemeris.ephemeris_table import get_default_ephemeris_table
+from kerykeion.ephemeris.ephemeris_utils import get_ayanamsa
 from pathlib import Path
-from typing import Union, Literal
+from typing import Union, Literal, Sequence, get_args
 
 DEFAULT_GEONAMES_USERNAME = "century.boy"
 
+HOUSES_NAMES: tuple[Houses, ...] = get_args(Houses)
+
+
 
 class AstrologicalSubject:
     """
@@ -45,12 +57,26 @@ class AstrologicalSubject:
     - lng (Union[int, float], optional): _ Defaults to False.
     - lat (Union[int, float], optional): _ Defaults to False.
     - tz_str (Union[str, bool], optional): _ Defaults to False.
+        If the coordinates are set without the timezone and the timezone index is built,
+        the timezone is found offline from the coordinates (see kerykeion.timezones.timezone_finder).
     - geonames_username (str, optional): _ Defaults to 'century.boy'.
     - online (bool, optional): Sets if you want to use the online mode (using
         geonames) or not. Defaults to True.
     - utc_datetime (datetime, optional): An alternative way of constructing the object, 
         if you know the UTC datetime but do not have easy access to e.g. timezone identifier
         _ Defaults to None.
+    - sidereal_mode (SiderealMode, optional): The ayanamsa of the sidereal zodiac,
+        used only when zodiac_type is "Sidereal". Defaults to "FAGAN_BRADLEY".
+    - precision (EphemerisPrecision, optional): "full" computes the planets with the Swiss Ephemeris files,
+        "fast" interpolates them from the precomputed ephemeris table (errors below 1.5 arcseconds,
+        see kerykeion.ephemeris.ephemeris_table), "moshier" uses the analytical Moshier ephemeris. Defaults to "full".
+    - active_points (Sequence[Planet], optional): The celestial points to compute, see kerykeion.celestial_points.
+        The other points are None. Use get_settings_active_points() to compute only the points of a chart.
+        Defaults to the planets, the nodes and Chiron.
+    - ambiguous (AmbiguousTimePolicy, optional): For the local times repeated when the clocks are moved back,
+        see kerykeion.timezones.local_to_utc. Defaults to "raise".
+    - nonexistent (NonexistentTimePolicy, optional): For the local times skipped when the clocks are moved forward,
+        see kerykeion.timezones.local_to_utc. Defaults to "raise".
     """
 
     # Defined by the user
@@ -70,6 +96,11 @@ class AstrologicalSubject:
     geonames_username: str
     online: bool
     zodiac_type: ZodiacType
+    sidereal_mode: SiderealMode
+    precision: EphemerisPrecision
+    active_points: tuple[Planet, ...]
+    ambiguous: AmbiguousTimePolicy
+    nonexistent: NonexistentTimePolicy
 
     # Generated internally
     city_data: dict[str, str]
@@ -79,20 +110,25 @@ class AstrologicalSubject:
     utc: datetime
     json_dir: Path
 
-    # Planets
-    sun: KerykeionPointModel
-    moon: KerykeionPointModel
-    mercury: KerykeionPointModel
-    venus: KerykeionPointModel
-    mars: KerykeionPointModel
-    jupiter: KerykeionPointModel
-    saturn: KerykeionPointModel
-    uranus: KerykeionPointModel
-    neptune: KerykeionPointModel
-    pluto: KerykeionPointModel
-    true_node: KerykeionPointModel
-    mean_node: KerykeionPointModel
-    chiron: KerykeionPointModel
+    # Planets, None when not active
+    sun: Union[KerykeionPointModel, None]
+    moon: Union[KerykeionPointModel, None]
+    mercury: Union[KerykeionPointModel, None]
+    venus: Union[KerykeionPointModel, None]
+    mars: Union[KerykeionPointModel, None]
+    jupiter: Union[KerykeionPointModel, None]
+    saturn: Union[KerykeionPointModel, None]
+    uranus: Union[KerykeionPointModel, None]
+    neptune: Union[KerykeionPointModel, None]
+    pluto: Union[KerykeionPointModel, None]
+    true_node: Union[KerykeionPointModel, None]
+    mean_node: Union[KerykeionPointModel, None]
+    chiron: Union[KerykeionPointModel, None]
+    mean_lilith: Union[KerykeionPointModel, None]
+    ceres: Union[KerykeionPointModel, None]
+    pallas: Union[KerykeionPointModel, None]
+    juno: Union[KerykeionPointModel, None]
+    vesta: Union[KerykeionPointModel, None]
 
     # Houses
     first_house: KerykeionPointModel
@@ -108,12 +144,16 @@ class AstrologicalSubject:
     eleventh_house: KerykeionPointModel
     twelfth_house: KerykeionPointModel
 
-    # Lists
+    # Lists, the planets ones in the order of active_points
     houses_list: list[KerykeionPointModel]
     planets_list: list[KerykeionPointModel]
     planets_degrees_ut: list[float]
+    planets_speeds: list[float]
     houses_degree_ut: list[float]
 
+    # The house system, see _houses
+    houses_system: str = "P"
+
     now = datetime.now()
 
     def __init__(
@@ -133,15 +173,16 @@ class AstrologicalSubject:
         zodiac_type: ZodiacType = "Tropic",
         online: bool = True,
         utc_datetime: Union[datetime, None] = None,
+        precision: EphemerisPrecision = "full",
+        sidereal_mode: SiderealMode = "FAGAN_BRADLEY",
+        active_points: Union[Sequence[Planet], None] = None,
+        ambiguous: AmbiguousTimePolicy = "raise",
+        nonexistent: NonexistentTimePolicy = "raise",
     ) -> None:
         logging.debug("Starting Kerykeion")
 
-        # We set the swisseph path to the current directory
-        swe.set_ephe_path(
-            str(
-                Path(__file__).parent.absolute() / "sweph"
-            )
-        )
+        # The swisseph path is set only once per process
+        get_ephemeris_manager().initialize()
 
         self.name = name
         self.year = year
@@ -160,6 +201,11 @@ class AstrologicalSubject:
         self.json_dir = Path.home()
         self.geonames_username = geonames_username
         self.utc_datetime = utc_datetime
+        self.precision = precision
+        self.sidereal_mode = sidereal_mode
+        self.active_points = get_active_points(active_points)
+        self.ambiguous = ambiguous
+        self.nonexistent = nonexistent
 
         # This message is set to encourage the user to set a custom geonames username
         if geonames_username is None and online:
@@ -190,7 +236,7 @@ class AstrologicalSubject:
             self.nation = "GB"
             logging.warning("No nation specified, using GB as default")
 
-        if (not self.online) and (not lng or not lat or not tz_str):
+        if (not self.online) and (not lng or not lat or (not tz_str and get_default_timezone_finder() is None)):
             raise KerykeionException(
                 "You need to set the coordinates and timezone if you want to use the offline mode!"
             )
@@ -248,6 +294,10 @@ class AstrologicalSubject:
     def _get_utc(self) -> None:
         """Converts local time to utc time."""
 
+        # If only the timezone is not set, get it offline from the coordinates when the index is built.
+        if (not self.tz_str) and self.lng and self.lat and get_default_timezone_finder() is not None:
+            self.tz_str = get_timezone_from_coordinates(self.lat, self.lng)
+
         # If the coordinates are not set, get them from geonames.
         if (self.online) and (not self.tz_str or not self.lng or not self.lat):
             self._fetch_tz_from_geonames()
@@ -257,12 +307,9 @@ class AstrologicalSubject:
             self.utc = self.utc_datetime
             return
 
-        local_time = pytz.timezone(self.tz_str)
-
         naive_datetime = datetime(self.year, self.month, self.day, self.hour, self.minute, 0)
 
-        local_datetime = local_time.localize(naive_datetime, is_dst=None)
-        self.utc = local_datetime.astimezone(pytz.utc)
+        self.utc = local_to_utc(naive_datetime, self.tz_str, self.ambiguous, self.nonexistent)
 
     def _get_jd(self) -> None:
         """Calculates julian day from the utc time."""
@@ -305,19 +352,24 @@ class AstrologicalSubject:
         """
 
         if self.zodiac_type == "Sidereal":
-            self.houses_degree_ut = swe.houses_ex(
-                tjdut=self.julian_day, lat=self.lat, lon=self.lng, hsys=str.encode('P'), flags=swe.FLG_SIDEREAL
-            )[0]
+            with get_ephemeris_manager().configured(self._get_sidereal_mode_number()):
+                self.houses_degree_ut = swe.houses_ex(
+                    tjdut=self.julian_day, lat=self.lat, lon=self.lng, hsys=str.encode(self.houses_system), flags=swe.FLG_SIDEREAL
+                )[0]
         elif self.zodiac_type == "Tropic":
             self.houses_degree_ut = swe.houses(
-                tjdut=self.julian_day, lat=self.lat, lon=self.lng, hsys=str.encode('P')
+                tjdut=self.julian_day, lat=self.lat, lon=self.lng, hsys=str.encode(self.houses_system)
             )[0]
         else:
             raise KerykeionException("Zodiac type not recognized! Please use 'Tropic' or 'Sidereal'")
 
+        self._houses_positions()
+
+    def _houses_positions(self) -> None:
+        """Defines the houses position in signs from houses_degree_ut
+        and stores them in dictionaries"""
+
         point_type: Literal["Planet", "House"] = "House"
-        # creates the list of the house in 360°
-        self.houses_degree_ut = swe.houses(self.julian_day, self.lat, self.lng)[0]
         # stores the house in singular dictionaries.
         self.first_house = calculate_position(self.houses_degree_ut[0], "First_House", point_type=point_type)
         self.second_house = calculate_position(self.houses_degree_ut[1], "Second_House", point_type=point_type)
@@ -347,246 +399,100 @@ class AstrologicalSubject:
             self.twelfth_house,
         ]
 
+    def _get_sidereal_mode_number(self) -> int:
+        """The Swiss Ephemeris id of the sidereal mode."""
+        sidereal_mode_number = getattr(swe, f"SIDM_{self.sidereal_mode}", None)
+        if sidereal_mode_number is None:
+            raise KerykeionException(f"Sidereal mode not recognized: {self.sidereal_mode}!")
+
+        return sidereal_mode_number
+
     def _planets_degrees_lister(self):
         """Sidereal or tropic mode."""
         self._iflag = swe.FLG_SWIEPH + swe.FLG_SPEED
 
+        sidereal_mode = None
         if self.zodiac_type == "Sidereal":
             self._iflag += swe.FLG_SIDEREAL
-            mode = "SIDM_FAGAN_BRADLEY"
-            swe.set_sid_mode(getattr(swe, mode))
-
-        # Calculates the position of the planets and stores it in a list.
-        sun_deg = swe.calc(self.julian_day, 0, self._iflag)[0][0]
-        moon_deg = swe.calc(self.julian_day, 1, self._iflag)[0][0]
-        mercury_deg = swe.calc(self.julian_day, 2, self._iflag)[0][0]
-        venus_deg = swe.calc(self.julian_day, 3, self._iflag)[0][0]
-        mars_deg = swe.calc(self.julian_day, 4, self._iflag)[0][0]
-        jupiter_deg = swe.calc(self.julian_day, 5, self._iflag)[0][0]
-        saturn_deg = swe.calc(self.julian_day, 6, self._iflag)[0][0]
-        uranus_deg = swe.calc(self.julian_day, 7, self._iflag)[0][0]
-        neptune_deg = swe.calc(self.julian_day, 8, self._iflag)[0][0]
-        pluto_deg = swe.calc(self.julian_day, 9, self._iflag)[0][0]
-        mean_node_deg = swe.calc(self.julian_day, 10, self._iflag)[0][0]
-        true_node_deg = swe.calc(self.julian_day, 11, self._iflag)[0][0]
-        chiron_deg = swe.calc(self.julian_day, 15, self._iflag)[0][0]
-
-        self.planets_degrees_ut = [
-            sun_deg,
-            moon_deg,
-            mercury_deg,
-            venus_deg,
-            mars_deg,
-            jupiter_deg,
-            saturn_deg,
-            uranus_deg,
-            neptune_deg,
-            pluto_deg,
-            mean_node_deg,
-            true_node_deg,
-            chiron_deg,
-        ]
+            sidereal_mode = self._get_sidereal_mode_number()
+
+        # Calculates the position and the speed of the planets and stores them in two lists.
+        if self.precision == "fast":
+            positions = self._ephemeris_table_positions()
+        else:
+            backend: EphemerisBackend = "moshier" if self.precision == "moshier" else "swieph"
+            ephemeris_manager = get_ephemeris_manager()
+            # All the planets with the same configuration, even if other threads are using the ephemeris.
+            with ephemeris_manager.configured(sidereal_mode):
+                positions = [
+                    ephemeris_manager.calc(self.julian_day, point.swe_id, self._iflag | point.swe_flags, backend, sidereal_mode)
+                    for point in self._get_active_celestial_points()
+                ]
+
+        self.planets_degrees_ut = [position[0] for position in positions]
+        self.planets_speeds = [position[3] for position in positions]
+
+    def _ephemeris_table_positions(self) -> list[tuple[float, ...]]:
+        """Positions of the planets interpolated from the ephemeris table,
+        in the same layout of swe.calc: longitude, latitude (not stored), distance (not stored), speed.
+        The points that are not in the table, or dates outside of it, use the Swiss Ephemeris."""
+        table = get_default_ephemeris_table()
+        ephemeris_manager = get_ephemeris_manager()
+        sidereal_mode = self._get_sidereal_mode_number() if self.zodiac_type == "Sidereal" else None
+        ayanamsa = get_ayanamsa(self.julian_day, sidereal_mode) if sidereal_mode is not None else 0.0
+
+        positions: list[tuple[float, ...]] = []
+        for point in self._get_active_celestial_points():
+            if table.covers(self.julian_day, point.swe_id) and not point.swe_flags:
+                longitude, speed = table.position(self.julian_day, point.swe_id)
+                positions.append(((longitude - ayanamsa) % 360, 0.0, 0.0, speed))
+            else:
+                logging.debug(f"{point.name} not in the ephemeris table, using the Swiss Ephemeris")
+                positions.append(
+                    ephemeris_manager.calc(self.julian_day, point.swe_id, self._iflag | point.swe_flags, sidereal_mode=sidereal_mode)
+                )
+
+        return positions
+
+    def _get_active_celestial_points(self) -> list[CelestialPoint]:
+        """The registry entries of the active points."""
+        return [get_celestial_point(name) for name in self.active_points]
 
     def _planets(self) -> None:
         """Defines body positon in signs and information and
         stores them in dictionaries"""
 
         point_type: Literal["Planet", "House"] = "Planet"
-        # stores the planets in singular dictionaries.
-        self.sun = calculate_position(self.planets_degrees_ut[0], "Sun", point_type=point_type)
-        self.moon = calculate_position(self.planets_degrees_ut[1], "Moon", point_type=point_type)
-        self.mercury = calculate_position(self.planets_degrees_ut[2], "Mercury", point_type=point_type)
-        self.venus = calculate_position(self.planets_degrees_ut[3], "Venus", point_type=point_type)
-        self.mars = calculate_position(self.planets_degrees_ut[4], "Mars", point_type=point_type)
-        self.jupiter = calculate_position(self.planets_degrees_ut[5], "Jupiter", point_type=point_type)
-        self.saturn = calculate_position(self.planets_degrees_ut[6], "Saturn", point_type=point_type)
-        self.uranus = calculate_position(self.planets_degrees_ut[7], "Uranus", point_type=point_type)
-        self.neptune = calculate_position(self.planets_degrees_ut[8], "Neptune", point_type=point_type)
-        self.pluto = calculate_position(self.planets_degrees_ut[9], "Pluto", point_type=point_type)
-        self.mean_node = calculate_position(self.planets_degrees_ut[10], "Mean_Node", point_type=point_type)
-        self.true_node = calculate_position(self.planets_degrees_ut[11], "True_Node", point_type=point_type)
-        self.chiron = calculate_position(self.planets_degrees_ut[12], "Chiron", point_type=point_type)
+        positions = dict(zip(self.active_points, self.planets_degrees_ut))
+
+        # stores the planets in singular dictionaries, None for the points not active.
+        for point in CELESTIAL_POINTS.values():
+            if point.name in positions:
+                setattr(self, point.name.lower(), calculate_position(positions[point.name], point.name, point_type=point_type))
+            else:
+                setattr(self, point.name.lower(), None)
 
     def _planets_in_houses(self) -> None:
-        """Calculates the house of the planet and updates
+        """Calculates the house of the planets and updates
         the planets dictionary."""
 
-        def for_every_planet(planet, planet_deg):
-            """Function to do the calculation.
-            Args: planet dictionary, planet degree"""
-
-            def point_between(p1, p2, p3):
-                """Finds if a point is between two other in a circle
-                args: first point, second point, point in the middle"""
-                p1_p2 = math.fmod(p2 - p1 + 360, 360)
-                p1_p3 = math.fmod(p3 - p1 + 360, 360)
-                if (p1_p2 <= 180) != (p1_p3 > p1_p2):
-                    return True
-                else:
-                    return False
-
-            if point_between(self.houses_degree_ut[0], self.houses_degree_ut[1], planet_deg) == True:
-                planet["house"] = "First_House"
-            elif point_between(self.houses_degree_ut[1], self.houses_degree_ut[2], planet_deg) == True:
-                planet["house"] = "Second_House"
-            elif point_between(self.houses_degree_ut[2], self.houses_degree_ut[3], planet_deg) == True:
-                planet["house"] = "Third_House"
-            elif point_between(self.houses_degree_ut[3], self.houses_degree_ut[4], planet_deg) == True:
-                planet["house"] = "Fourth_House"
-            elif point_between(self.houses_degree_ut[4], self.houses_degree_ut[5], planet_deg) == True:
-                planet["house"] = "Fifth_House"
-            elif point_between(self.houses_degree_ut[5], self.houses_degree_ut[6], planet_deg) == True:
-                planet["house"] = "Sixth_House"
-            elif point_between(self.houses_degree_ut[6], self.houses_degree_ut[7], planet_deg) == True:
-                planet["house"] = "Seventh_House"
-            elif point_between(self.houses_degree_ut[7], self.houses_degree_ut[8], planet_deg) == True:
-                planet["house"] = "Eighth_House"
-            elif point_between(self.houses_degree_ut[8], self.houses_degree_ut[9], planet_deg) == True:
-                planet["house"] = "Ninth_House"
-            elif point_between(self.houses_degree_ut[9], self.houses_degree_ut[10], planet_deg) == True:
-                planet["house"] = "Tenth_House"
-            elif point_between(self.houses_degree_ut[10], self.houses_degree_ut[11], planet_deg) == True:
-                planet["house"] = "Eleventh_House"
-            elif point_between(self.houses_degree_ut[11], self.houses_degree_ut[0], planet_deg) == True:
-                planet["house"] = "Twelfth_House"
-            else:
-                planet["house"] = "error!"
-
-            return planet
-
-        self.sun = for_every_planet(self.sun, self.planets_degrees_ut[0])
-        self.moon = for_every_planet(self.moon, self.planets_degrees_ut[1])
-        self.mercury = for_every_planet(self.mercury, self.planets_degrees_ut[2])
-        self.venus = for_every_planet(self.venus, self.planets_degrees_ut[3])
-        self.mars = for_every_planet(self.mars, self.planets_degrees_ut[4])
-        self.jupiter = for_every_planet(self.jupiter, self.planets_degrees_ut[5])
-        self.saturn = for_every_planet(self.saturn, self.planets_degrees_ut[6])
-        self.uranus = for_every_planet(self.uranus, self.planets_degrees_ut[7])
-        self.neptune = for_every_planet(self.neptune, self.planets_degrees_ut[8])
-        self.pluto = for_every_planet(self.pluto, self.planets_degrees_ut[9])
-        self.mean_node = for_every_planet(self.mean_node, self.planets_degrees_ut[10])
-        self.true_node = for_every_planet(self.true_node, self.planets_degrees_ut[11])
-        self.chiron = for_every_planet(self.chiron, self.planets_degrees_ut[12])
-
-        self.planets_list = [
-            self.sun,
-            self.moon,
-            self.mercury,
-            self.venus,
-            self.mars,
-            self.jupiter,
-            self.saturn,
-            self.uranus,
-            self.neptune,
-            self.pluto,
-            self.mean_node,
-            self.true_node,
-            self.chiron
-        ]
+        self.planets_list = [getattr(self, name.lower()) for name in self.active_points]
 
-        # Check in retrograde or not:
-        planets_ret = []
-        for p in self.planets_list:
-            planet_number = get_number_from_name(p["name"])
-            if swe.calc(self.julian_day, planet_number, self._iflag)[0][3] < 0:
-                p["retrograde"] = True
-            else:
-                p["retrograde"] = False
-            planets_ret.append(p)
+        houses_indexes = calculate_houses_indexes(self.planets_degrees_ut, self.houses_degree_ut)
+
+        # Set the house and, with the speeds already computed, check in retrograde or not:
+        for p, house_index, speed in zip(self.planets_list, houses_indexes, self.planets_speeds):
+            p["house"] = HOUSES_NAMES[house_index]
+            p["retrograde"] = speed < 0
 
     def _lunar_phase_calc(self) -> None:
         """Function to calculate the lunar phase"""
 
-        # If ther's an error:
-        moon_phase, sun_phase = None, None
-
-        # anti-clockwise degrees between sun and moon
-        moon, sun = self.planets_degrees_ut[1], self.planets_degrees_ut[0]
-        degrees_between = moon - sun
-
-        if degrees_between < 0:
-            degrees_between += 360.0
-
-        step = 360.0 / 28.0
-
-        for x in range(28):
-            low = x * step
-            high = (x + 1) * step
-
-            if degrees_between >= low and degrees_between < high:
-                moon_phase = x + 1
-
-        sunstep = [
-            0,
-            30,
-            40,
-            50,
-            60,
-            70,
-            80,
-            90,
-            120,
-            130,
-            140,
-            150,
-            160,
-            170,
-            180,
-            210,
-            220,
-            230,
-            240,
-            250,
-            260,
-            270,
-            300,
-            310,
-            320,
-            330,
-            340,
-            350,
-        ]
-
-        for x in range(len(sunstep)):
-            low = sunstep[x]
-
-            if x == 27:
-                high = 360
-            else:
-                high = sunstep[x + 1]
-            if degrees_between >= low and degrees_between < high:
-                sun_phase = x + 1
-
-        def moon_emoji(phase):
-            if phase == 1:
-                result = "🌑"
-            elif phase < 7:
-                result = "🌒"
-            elif 7 <= phase <= 9:
-                result = "🌓"
-            elif phase < 14:
-                result = "🌔"
-            elif phase == 14:
-                result = "🌕"
-            elif phase < 20:
-                result = "🌖"
-            elif 20 <= phase <= 22:
-                result = "🌗"
-            elif phase <= 28:
-                result = "🌘"
-            else:
-                result = phase
-
-            return result
-
-        lunar_phase_dictionary = {
-            "degrees_between_s_m": degrees_between,
-            "moon_phase": moon_phase,
-            "sun_phase": sun_phase,
-            "moon_emoji": moon_emoji(moon_phase),
-        }
+        if self.sun is None or self.moon is None:
+            self.lunar_phase = None
+            return
 
-        self.lunar_phase = LunarPhaseModel(**lunar_phase_dictionary)
+        self.lunar_phase = calculate_lunar_phase(self.moon.abs_pos, self.sun.abs_pos)
 
     def _check_if_poles(self):
         """
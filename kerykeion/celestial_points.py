@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import swisseph as swe
+from dataclasses import dataclass
+from typing import Sequence, Union
+from kerykeion.kr_types import KerykeionException, KerykeionSettingsModel, Planet, CelestialPointCategory
+
+
+@dataclass(frozen=True)
+class CelestialPoint:
+    """
+    A point that AstrologicalSubject can compute with the Swiss Ephemeris.
+
+    Args:
+    - name (Planet): The name of the point, the attribute of AstrologicalSubject is the lowercase name.
+    - swe_id (int): The Swiss Ephemeris id of the point.
+    - category (CelestialPointCategory): The kind of point.
+    - swe_flags (int, optional): Flags added to the swe.calc flags of the subject for this point. Defaults to 0.
+    """
+
+    name: Planet
+    swe_id: int
+    category: CelestialPointCategory
+    swe_flags: int = 0
+
+
+# All the points that can be computed, by lowercase name, in the order of the lists of AstrologicalSubject.
+# The asteroids are in the seas_18.se1 file shipped with the package.
+CELESTIAL_POINTS: dict[str, CelestialPoint] = {
+    point.name.lower(): point
+    for point in (
+        CelestialPoint("Sun", swe.SUN, "Luminary"),
+        CelestialPoint("Moon", swe.MOON, "Luminary"),
+        CelestialPoint("Mercury", swe.MERCURY, "Planet"),
+        CelestialPoint("Venus", swe.VENUS, "Planet"),
+        CelestialPoint("Mars", swe.MARS, "Planet"),
+        CelestialPoint("Jupiter", swe.JUPITER, "Planet"),
+        CelestialPoint("Saturn", swe.SATURN, "Planet"),
+        CelestialPoint("Uranus", swe.URANUS, "Planet"),
+        CelestialPoint("Neptune", swe.NEPTUNE, "Planet"),
+        CelestialPoint("Pluto", swe.PLUTO, "Planet"),
+        CelestialPoint("Mean_Node", swe.MEAN_NODE, "Lunar_Node"),
+        CelestialPoint("True_Node", swe.TRUE_NODE, "Lunar_Node"),
+        CelestialPoint("Chiron", swe.CHIRON, "Asteroid"),
+        CelestialPoint("Mean_Lilith", swe.MEAN_APOG, "Lunar_Apogee"),
+        CelestialPoint("Ceres", swe.CERES, "Asteroid"),
+        CelestialPoint("Pallas", swe.PALLAS, "Asteroid"),
+        CelestialPoint("Juno", swe.JUNO, "Asteroid"),
+        CelestialPoint("Vesta", swe.VESTA, "Asteroid"),
+    )
+}
+
+# The points computed by AstrologicalSubject when the active points are not given.
+DEFAULT_ACTIVE_POINTS: tuple[Planet, ...] = (
+    "Sun",
+    "Moon",
+    "Mercury",
+    "Venus",
+    "Mars",
+    "Jupiter",
+    "Saturn",
+    "Uranus",
+    "Neptune",
+    "Pluto",
+    "Mean_Node",
+    "True_Node",
+    "Chiron",
+)
+
+
+def get_celestial_point(name: Union[str, int]) -> CelestialPoint:
+    """
+    Returns the celestial point with a name, case insensitive, or a Swiss Ephemeris id.
+    """
+    if isinstance(name, int):
+        for point in CELESTIAL_POINTS.values():
+            if point.swe_id == name:
+                return point
+    else:
+        named_point = CELESTIAL_POINTS.get(name.lower())
+        if named_point is not None:
+            return named_point
+
+    raise KerykeionException(f"Celestial point not recognized: {name}!")
+
+
+def get_active_points(active_points: Union[Sequence[str], None] = None) -> tuple[Planet, ...]:
+    """
+    Returns the names of the points to compute, without duplicates and
+    in the order of CELESTIAL_POINTS, the one of the lists of AstrologicalSubject.
+
+    Args:
+    - active_points (Sequence[str], optional): The names of the points. Defaults to DEFAULT_ACTIVE_POINTS.
+    """
+    if active_points is None:
+        return DEFAULT_ACTIVE_POINTS
+
+    requested = {get_celestial_point(name).name for name in active_points}
+    return tuple(point.name for point in CELESTIAL_POINTS.values() if point.name in requested)
+
+
+def get_settings_active_points(settings: Union[KerykeionSettingsModel, dict]) -> tuple[Planet, ...]:
+    """
+    Returns the celestial points active in the settings, to compute only the points used by a chart.
+    The houses and the points of the settings that are not celestial points are ignored.
+
+    Example:
+        >>> active_points = get_settings_active_points(get_settings())
+        >>> subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", active_points=active_points)
+    """
+    return get_active_points(
+        [point["name"] for point in settings["celestial_points"] if point["is_active"] and point["name"].lower() in CELESTIAL_POINTS]
+    )
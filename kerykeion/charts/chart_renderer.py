@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+from pathlib import Path
+from typing import Union
+from kerykeion.astrological_subject import AstrologicalSubject
+from kerykeion.charts.kerykeion_chart_svg import KerykeionChartSVG
+from kerykeion.kr_types import ChartType
+
+
+class ChartRenderer:
+    """
+    Draws the SVG charts of many subjects with the same settings.
+
+    The settings, the style, the fonts, the backgrounds and the template are set up once,
+    every call of render() only computes the parts of the chart that depend on the subjects.
+    The shared state is never changed while drawing, so render() can be called from many threads.
+
+    Args:
+    - new_settings_file (Path, optional): The settings file, see KerykeionChartSVG. Defaults to None.
+    - new_font (str, optional): The font. Defaults to "Belgan Aesthetic".
+    - new_font_name (str, optional): The font of the name. Defaults to "Belgan Aesthetic".
+    - new_bg_color (str, optional): Hexadecimal background color. Defaults to None.
+    - new_bg_image (str, optional): Background image URL. Defaults to None.
+    - new_bg_image_wheel (str, optional): Wheel background image URL. Defaults to None.
+    - show_aspect_patterns (bool, optional): Draw the aspect patterns of the natal charts. Defaults to False.
+
+    Example:
+        >>> renderer = ChartRenderer()
+        >>> svg = renderer.render(AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT"))
+    """
+
+    def __init__(
+        self,
+        new_settings_file: Union[Path, None] = None,
+        new_font: Union[str, None] = "Belgan Aesthetic",
+        new_font_name: Union[str, None] = "Belgan Aesthetic",
+        new_bg_color: Union[str, None] = None,
+        new_bg_image: Union[str, None] = None,
+        new_bg_image_wheel: Union[str, None] = None,
+        show_aspect_patterns: bool = False,
+    ) -> None:
+        self.show_aspect_patterns = show_aspect_patterns
+
+        self._chart = KerykeionChartSVG.__new__(KerykeionChartSVG)
+        self._chart._set_static_state(
+            None,
+            new_settings_file,
+            new_font,
+            new_font_name,
+            new_bg_color,
+            new_bg_image,
+            new_bg_image_wheel,
+        )
+
+    def chart(
+        self,
+        subject: AstrologicalSubject,
+        chart_type: ChartType = "Natal",
+        second: Union[AstrologicalSubject, None] = None,
+    ) -> KerykeionChartSVG:
+        """
+        Returns a KerykeionChartSVG of the subjects sharing the state of the renderer, without its template.
+        """
+        chart = KerykeionChartSVG.__new__(KerykeionChartSVG)
+        chart.__dict__.update(self._chart.__dict__)
+        chart._set_subjects(subject, chart_type, second, self.show_aspect_patterns)
+        chart.template = ""
+
+        return chart
+
+    def render(
+        self,
+        subject: AstrologicalSubject,
+        chart_type: ChartType = "Natal",
+        second: Union[AstrologicalSubject, None] = None,
+    ) -> str:
+        """
+        Returns the SVG of a chart, like KerykeionChartSVG(subject, chart_type, second).makeTemplate().
+        """
+        return self.chart(subject, chart_type, second).makeTemplate()
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    renderer = ChartRenderer()
+    first = AstrologicalSubject("John", 1940, 10, 9, 10, 30, "Liverpool")
+    second = AstrologicalSubject("Yoko", 1933, 2, 18, 10, 30, "Tokyo")
+
+    print(len(renderer.render(first)))
+    print(len(renderer.render(first, "Synastry", second)))
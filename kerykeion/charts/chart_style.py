@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Union
+from kerykeion.kr_types import KerykeionSettingsModel
+from kerykeion.settings.kerykeion_settings import get_settings, get_settings_file_path
+
+
+@dataclass(frozen=True)
+class ChartStyle:
+    """
+    The part of the chart template that depends only on the settings file.
+
+    Args:
+    - settings (KerykeionSettingsModel): The settings.
+    - template_colors (dict[str, str]): The color slots of the template: paper_color_0,
+        planets_color_N, zodiac_color_N and orb_color_N. Their names come from the settings,
+        so they are substituted next to the ChartTemplateDictionary instead of being part of it.
+    - ring_styles (dict[str, str]): The styles of the circles of the wheel that don't depend on the subject:
+        c1style_transit, c2style_transit, c2style_natal, c3style_natal, c3style_transit and c3style_image.
+    """
+
+    settings: KerykeionSettingsModel
+    template_colors: dict[str, str]
+    ring_styles: dict[str, str]
+
+
+# The styles by settings file path, with the modification time of the file they were built from.
+_chart_styles: dict[Path, tuple[int, ChartStyle]] = {}
+_chart_styles_lock = Lock()
+
+
+def _build_chart_style(settings: KerykeionSettingsModel) -> ChartStyle:
+    chart_colors = settings["chart_colors"]
+
+    template_colors = {"paper_color_0": chart_colors["paper_0"]}
+
+    # planets_color_X
+    for planet in settings["celestial_points"]:
+        template_colors[f"planets_color_{planet['id']}"] = planet["color"]
+
+    # zodiac_color_X
+    for i in range(12):
+        template_colors[f"zodiac_color_{i}"] = chart_colors[f"zodiac_icon_{i}"]
+
+    # orb_color_X
+    for aspect in settings["aspects"]:
+        template_colors[f"orb_color_{aspect['degree']}"] = aspect["color"]
+
+    ring_styles = {
+        "c1style_transit": f'fill: none; stroke: {chart_colors["zodiac_transit_ring_2"]}; stroke-width: 1px; stroke-opacity:.4;',
+        "c2style_transit": f"fill: {chart_colors['paper_1']}; fill-opacity:.4; stroke: {chart_colors['zodiac_transit_ring_1']}; stroke-opacity:.4; stroke-width: 1px",
+        "c2style_natal": f'fill: {chart_colors["paper_1"]}; fill-opacity:0; stroke: {chart_colors["zodiac_radix_ring_1"]}; stroke-opacity:.4; stroke-width: 1px',
+        "c3style_natal": f'fill: {chart_colors["paper_1"]}; fill-opacity:1; stroke: {chart_colors["zodiac_radix_ring_0"]}; stroke-width: 1px',
+        "c3style_transit": f"fill: {chart_colors['paper_1']}; fill-opacity:1; stroke: {chart_colors['zodiac_transit_ring_0']}; stroke-width: 1px",
+        "c3style_image": f'fill:url(#image); fill-opacity:1; stroke: {chart_colors["zodiac_radix_ring_0"]}; stroke-width: 1px',
+    }
+
+    return ChartStyle(settings, template_colors, ring_styles)
+
+
+def get_chart_style(new_settings_file: Union[Path, None] = None) -> ChartStyle:
+    """
+    Returns the style of a settings file, see get_settings for the fallbacks.
+    The style is built once and reused until the file is modified.
+    The returned style is shared: copy its dictionaries before changing them.
+
+    Args:
+        new_settings_file (Union[Path, None], optional): The path of the settings file. Defaults to None.
+
+    Returns:
+        ChartStyle: The style of the settings file.
+    """
+    settings_file = get_settings_file_path(new_settings_file).resolve()
+    modification_time = settings_file.stat().st_mtime_ns
+
+    with _chart_styles_lock:
+        cached = _chart_styles.get(settings_file)
+
+    if cached is not None and cached[0] == modification_time:
+        return cached[1]
+
+    logging.debug(f"Building the chart style of {settings_file}")
+    style = _build_chart_style(get_settings(settings_file))
+
+    with _chart_styles_lock:
+        _chart_styles[settings_file] = (modification_time, style)
+
+    return style
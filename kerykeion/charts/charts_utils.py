@@ -1,7 +1,7 @@
 import math
 import datetime
 from kerykeion.kr_types import KerykeionException
-from typing import Union
+from typing import Sequence, Union
 
 def decHourJoin(inH: int, inM: int, inS: int) -> float:
     """Join hour, minutes, seconds, timezone integer to hour float.
@@ -108,3 +108,77 @@ def sliceToY(slice: Union[int, float], r: Union[int, float], offset: Union[int,
     plus = (math.pi * offset) / 180
     radial = ((math.pi / 6) * slice) + plus
     return r * ((math.sin(radial) / -1) + 1)
+
+def circularLabelLayout(angles: Sequence[Union[int, float]], min_distance: Union[int, float]) -> list[float]:
+    """
+    Places labels on a circle, at least min_distance degrees apart, as close as possible to their angles.
+
+    The angles are sorted and swept once starting after the largest empty arc: the labels
+    closer than min_distance form a cluster, spread min_distance apart around the mean of
+    their angles, and a cluster that overlaps the previous one is merged with it.
+    Clusters are merged also across 0°/360°. It runs in O(n log n), for the sort.
+
+    Args:
+        - angles (Sequence[int | float]): The angles of the labels, in degrees.
+        - min_distance (int | float): The minimum distance between two labels, in degrees.
+            If the labels can't fit on the circle they are spread evenly.
+
+    Returns:
+        list[float]: The angles of the labels, in the order of the input, between 0 and 360.
+
+    Example:
+        >>> circularLabelLayout([10, 11, 200, 359], 5)
+        [8.0, 13.0, 200.0, 359.0]
+    """
+
+    n = len(angles)
+    if n == 0:
+        return []
+
+    min_distance = min(min_distance, 360 / n)
+    order = sorted(range(n), key=lambda i: angles[i] % 360)
+    sorted_angles = [angles[i] % 360 for i in order]
+
+    # Start after the largest empty arc, the last place where labels would collide.
+    gaps = [(sorted_angles[(k + 1) % n] - sorted_angles[k]) % 360 for k in range(n)]
+    start = (max(range(n), key=lambda k: gaps[k]) + 1) % n
+
+    def unwrapped(position: int) -> float:
+        # The angle at a position of the sweep, growing past 360 for the following turns.
+        k = start + position
+        return sorted_angles[k % n] + 360 * (k // n)
+
+    # Clusters as (first position, number of labels, mean angle).
+    clusters: list[tuple[int, int, float]] = []
+
+    def overlaps(previous: tuple[int, int, float], following: tuple[int, int, float]) -> bool:
+        previous_end = previous[2] + (previous[1] - 1) / 2 * min_distance
+        following_start = following[2] - (following[1] - 1) / 2 * min_distance
+        return following_start - previous_end < min_distance - 1e-9
+
+    def push(cluster: tuple[int, int, float]) -> None:
+        while clusters and overlaps(clusters[-1], cluster):
+            previous = clusters.pop()
+            count = previous[1] + cluster[1]
+            cluster = (previous[0], count, (previous[2] * previous[1] + cluster[2] * cluster[1]) / count)
+        clusters.append(cluster)
+
+    for position in range(n):
+        push((position, 1, unwrapped(position)))
+
+    # Across 0°/360°: the first cluster moves after the last one, one turn later.
+    while len(clusters) > 1:
+        first_cluster = clusters[0]
+        moved = (first_cluster[0] + n, first_cluster[1], first_cluster[2] + 360)
+        if not overlaps(clusters[-1], moved):
+            break
+
+        clusters.pop(0)
+        push(moved)
+
+    layout = [0.0] * n
+    for first, count, mean in clusters:
+        for k in range(count):
+            layout[order[(start + first + k) % n]] = (mean + (k - (count - 1) / 2) * min_distance) % 360
+
+    return layout
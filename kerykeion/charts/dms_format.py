@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+
+    Degrees, minutes and seconds strings of the charts.
+    The columns of the grids are formatted all at once with NumPy,
+    the single values are cached because the same ones come back chart after chart.
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Literal, Sequence, Union
+from kerykeion.kr_types import KerykeionException
+
+DegreesFormat = Literal["1", "2", "3"]
+
+# Degree, minute and second signs, as XML entities.
+DEGREE_SIGN = "&#176;"
+MINUTE_SIGN = "&#39;"
+SECOND_SIGN = "&#34;"
+
+
+def _two_digits(values: np.ndarray) -> np.ndarray:
+    """
+    Integers as strings with at least two characters, like f"{value:02d}".
+    """
+    return np.char.mod("%02d", values.astype(np.int64))
+
+
+def dec2deg_array(values: Union[Sequence[float], np.ndarray], type: DegreesFormat = "3") -> list[str]:
+    """
+    Converts decimal degrees to strings in the format a°b'c", all at once.
+    The degrees and the minutes are truncated, the seconds rounded.
+
+    Args:
+        - values (Sequence[float] | np.ndarray): The decimal degrees.
+        - type ("1" | "2" | "3", optional): "3" for degrees, minutes and seconds,
+            "2" for degrees and rounded minutes, "1" for degrees only. Defaults to "3".
+
+    Returns:
+        list[str]: The strings, in the order of the values.
+
+    Example:
+        >>> dec2deg_array([12.5, 250.2575])
+        ['12&#176;30&#39;00&#34;', '250&#176;15&#39;27&#34;']
+    """
+    if type not in ("1", "2", "3"):
+        raise KerykeionException(f"Wrong type: {type}, it must be 1, 2 or 3.")
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return []
+
+    degrees = np.trunc(values)
+    out = np.char.add(_two_digits(degrees), DEGREE_SIGN)
+    if type == "1":
+        return out.tolist()
+
+    minutes_decimal = (values - degrees) * 60.0
+    if type == "2":
+        return np.char.add(np.char.add(out, _two_digits(np.round(minutes_decimal))), MINUTE_SIGN).tolist()
+
+    minutes = np.trunc(minutes_decimal)
+    seconds = np.round((minutes_decimal - minutes) * 60.0)
+    out = np.char.add(np.char.add(out, _two_digits(minutes)), MINUTE_SIGN)
+    return np.char.add(np.char.add(out, _two_digits(seconds)), SECOND_SIGN).tolist()
+
+
+@lru_cache(maxsize=1024)
+def dec2deg(value: float, type: DegreesFormat = "3") -> str:
+    """
+    Converts one decimal degree to a string in the format a°b'c", see dec2deg_array.
+    """
+    return dec2deg_array([value], type)[0]
+
+
+@lru_cache(maxsize=256)
+def coordinate2str(coord: float, positive_sign: str, negative_sign: str) -> str:
+    """
+    Converts a latitude or a longitude to a string with the degrees, the first letter of
+    the sign and the minutes, both truncated. Eg. 52.1234567, "North", "South" -> 52n7
+
+    Args:
+        - coord (float): The latitude or the longitude.
+        - positive_sign (str): The sign of the positive values, eg. "North".
+        - negative_sign (str): The sign of the negative values, eg. "South".
+    """
+    sign = positive_sign
+    if coord < 0.0:
+        sign = negative_sign
+        coord = abs(coord)
+
+    degrees = int(coord)
+    minutes = int((float(coord) - degrees) * 60)
+
+    return f"{degrees}{(sign[0]).lower()}{minutes}"
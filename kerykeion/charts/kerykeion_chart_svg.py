@@ -3,17 +3,19 @@
     This is part of Kerykeion (C) 2023 Giacomo Battaglia
 """
 import math
-import pytz
 import logging
 from matplotlib import font_manager
 from datetime import datetime
-from kerykeion.settings.kerykeion_settings import get_settings
+from kerykeion.charts.chart_style import ChartStyle, get_chart_style
 from kerykeion.aspects.synastry_aspects import SynastryAspects
 from kerykeion.aspects.natal_aspects import NatalAspects
+from kerykeion.aspects.aspect_patterns import AspectPattern
 from kerykeion.astrological_subject import AstrologicalSubject
+from kerykeion.timezones import get_timezone
 from kerykeion.kr_types import KerykeionException, ChartType
-from kerykeion.kr_types import ChartTemplateDictionary
-from kerykeion.charts.charts_utils import decHourJoin, degreeDiff, offsetToTz, sliceToX, sliceToY
+from kerykeion.kr_types import ChartTemplateDictionary, ChartPositionStrings
+from kerykeion.charts.charts_utils import decHourJoin, degreeDiff, offsetToTz, sliceToX, sliceToY, circularLabelLayout
+from kerykeion.charts.dms_format import dec2deg, dec2deg_array, coordinate2str
 from pathlib import Path
 from string import Template
 from typing import Union
@@ -24,6 +26,28 @@ font_files = font_manager.findSystemFonts(fontpaths=str(font_dir))
 for font_file in font_files:
     font_manager.fontManager.addfont(font_file)
 
+ZODIAC = (
+    {"name": "aries", "element": "fire"},
+    {"name": "taurus", "element": "earth"},
+    {"name": "gemini", "element": "air"},
+    {"name": "cancer", "element": "water"},
+    {"name": "leo", "element": "fire"},
+    {"name": "virgo", "element": "earth"},
+    {"name": "libra", "element": "air"},
+    {"name": "scorpio", "element": "water"},
+    {"name": "sagittarius", "element": "fire"},
+    {"name": "capricorn", "element": "earth"},
+    {"name": "aquarius", "element": "air"},
+    {"name": "pisces", "element": "water"},
+)
+
+# Radius of the wheel.
+CHART_RADIUS = 240
+
+# Minimum distance between the planet glyphs on the wheel, in degrees.
+PLANETS_LABEL_DISTANCE = 6.5
+
+
 class KerykeionChartSVG:
     """
     Creates the instance that can generate the chart with the
@@ -39,6 +63,7 @@ class KerykeionChartSVG:
         - new_bg_color: hexadecimal color
         - new_bg_image: image URL
         - new_bg_image_wheel: image URL
+        - show_aspect_patterns: draw the aspect patterns of a natal chart (default: False)
         
     """
 
@@ -54,6 +79,12 @@ class KerykeionChartSVG:
     new_bg_image: Union[str, None]
     new_bg_image_wheel: Union[str, None]
     name_spacing:bool
+    aspect_patterns: list[AspectPattern]
+    style: ChartStyle
+    # Radiuses of the house and zodiac rings, set by the chart type in _createTemplateDictionary.
+    c1: int
+    c2: int
+    c3: int
     def __init__(
         self,
         first_obj: AstrologicalSubject,
@@ -67,23 +98,41 @@ class KerykeionChartSVG:
         new_bg_image: Union[str, None] = None,
         new_bg_image_wheel: Union[str, None] = None,
         name_spacing:bool = False,
+        show_aspect_patterns: bool = False,
     ):
+        self._set_static_state(
+            new_output_directory,
+            new_settings_file,
+            new_font,
+            new_font_name,
+            new_bg_color,
+            new_bg_image,
+            new_bg_image_wheel,
+        )
+        self._set_subjects(first_obj, chart_type, second_obj, show_aspect_patterns)
+
+        # Immediately generate template.
+        self.template = self.makeTemplate()
+
+    def _set_static_state(
+        self,
+        new_output_directory: Union[str, None],
+        new_settings_file: Union[Path, None],
+        new_font: Union[str, None],
+        new_font_name: Union[str, None],
+        new_bg_color: Union[str, None],
+        new_bg_image: Union[str, None],
+        new_bg_image_wheel: Union[str, None],
+    ) -> None:
+        """
+        Sets the state that doesn't depend on the subjects: settings, fonts, backgrounds and template.
+        It is shared by all the charts of a ChartRenderer and never changed while drawing.
+        """
         # Directories:
         DATA_DIR = Path(__file__).parent
         self.homedir = Path.home()
         self.new_settings_file = new_settings_file
 
-        #name_spacing
-        for char in first_obj.name:
-            if char in ['j', 'q', 'g', 'p']:
-                name_spacing = True
-                print(char)
-                break
-        else:
-            name_spacing = False
-
-        self.name_spacing = name_spacing
-                
         #Font:
         if new_font is not None:
             self.font = self.get_font(new_font)
@@ -122,8 +171,6 @@ class KerykeionChartSVG:
             self.bg_image_wheel_is_active = False
             self.bg_image_wheel_pattern = ""
             
-        #for c1 pattern
-        self.offset = 0
         # new output directory
         if new_output_directory:
             self.output_directory = Path(new_output_directory)
@@ -131,15 +178,13 @@ class KerykeionChartSVG:
             self.output_directory = self.homedir
 
         self.xml_svg = DATA_DIR / "templates/chart.xml"
+        with open(self.xml_svg, "r", encoding="utf-8", errors="ignore") as f:
+            self.xml_template = Template(f.read())
+
         self.natal_width = 650.4245745 # Width of A4 in points (72 points per inch)
         self.full_width = 650.4245745 # Full width for A4 format
         
-            
         self.parse_json_settings(self.new_settings_file)
-        self.chart_type = chart_type
-
-        # Kerykeion instance
-        self.user = first_obj
 
         self.available_planets_setting = []
         for body in self.planets_settings:
@@ -147,11 +192,54 @@ class KerykeionChartSVG:
                 continue
 
             self.available_planets_setting.append(body)
-            
+
+        # screen size
+        self.screen_width = 650.4245745
+        self.screen_height = 1200
+
+        # configuration
+        # ZOOM 1 = 100%
+        self.zoom = 1
+
+        self.zodiac = ZODIAC
+
+    def _set_subjects(
+        self,
+        first_obj: AstrologicalSubject,
+        chart_type: ChartType,
+        second_obj: Union[AstrologicalSubject, None],
+        show_aspect_patterns: bool,
+    ) -> None:
+        """
+        Sets the subjects of the chart and everything computed from them.
+        """
+        #name_spacing
+        for char in first_obj.name:
+            if char in ['j', 'q', 'g', 'p']:
+                name_spacing = True
+                break
+        else:
+            name_spacing = False
+
+        self.name_spacing = name_spacing
+
+        #for c1 pattern
+        self.offset = 0
+
+        self.chart_type = chart_type
+
+        # Kerykeion instance
+        self.user = first_obj
+
         # Available bodies
         available_celestial_points = []
         for body in self.available_planets_setting:
             available_celestial_points.append(body["name"].lower())
+
+        for subject in (first_obj, second_obj):
+            for planet in available_celestial_points:
+                if subject is not None and subject.get(planet) is None:
+                    raise KerykeionException(f"{planet} is active in the settings but it is not an active point of {subject.name}!")
         
         # Make a list for the absolute degrees of the points of the graphic.
         self.points_deg_ut = []
@@ -183,44 +271,15 @@ class KerykeionChartSVG:
             natal_aspects_instance = NatalAspects(self.user, new_settings_file=self.new_settings_file)
             self.aspects_list = natal_aspects_instance.relevant_aspects
 
+            # Aspect patterns, drawn only on request.
+            self.aspect_patterns = natal_aspects_instance.aspect_patterns if show_aspect_patterns else []
+
         # TODO: If not second should exit
         if self.chart_type == "Transit" or self.chart_type == "Synastry":
             if not second_obj:
                 raise KerykeionException("Second object is required for Transit or Synastry charts.")
 
-            # Kerykeion instance
-            self.t_user = second_obj
-
-            # Make a list for the absolute degrees of the points of the graphic.
-            self.t_points_deg_ut = []
-            for planet in available_celestial_points:            
-                self.t_points_deg_ut.append(self.t_user.get(planet).abs_pos)
-
-            # Make a list of the relative degrees of the points in the graphic.
-            self.t_points_deg = []
-            for planet in available_celestial_points:
-                self.t_points_deg.append(self.t_user.get(planet).position)
-
-            # Make list of the poits sign.
-            self.t_points_sign = []
-            for planet in available_celestial_points:
-                self.t_points_sign.append(self.t_user.get(planet).sign_num)
-
-            # Make a list of poits if they are retrograde or not.
-            self.t_points_retrograde = []
-            for planet in available_celestial_points:
-                self.t_points_retrograde.append(self.t_user.get(planet).retrograde)
-
-            self.t_houses_sign_graph = []
-            for h in self.t_user.houses_list:
-                self.t_houses_sign_graph.append(h["sign_num"])
-
-        # screen size
-        if self.chart_type == "Natal":
-            self.screen_width = 650.4245745
-        else:
-            self.screen_width = 650.4245745
-        self.screen_height = 1200
+            self._set_second_subject(second_obj)
 
         # check for home
         self.home_location = self.user.city
@@ -238,16 +297,6 @@ class KerykeionChartSVG:
         self.countrycode = self.home_countrycode
         self.timezonestr = self.home_timezonestr
 
-        # current datetime
-        now = datetime.now()
-
-        # aware datetime object
-        dt_input = datetime(now.year, now.month, now.day, now.hour, now.minute, now.second)
-        dt = pytz.timezone(self.timezonestr).localize(dt_input)
-
-        # naive utc datetime object
-        dt_utc = dt.replace(tzinfo=None) - dt.utcoffset()  # type: ignore
-
         # Default
         self.name = self.user.name
         self.charttype = self.chart_type
@@ -255,13 +304,17 @@ class KerykeionChartSVG:
         self.month = self.user.utc.month
         self.day = self.user.utc.day
         self.hour = self.user.utc.hour + self.user.utc.minute / 100
-        self.timezone = offsetToTz(dt.utcoffset())
+        self.timezone = offsetToTz(self.user.utc.astimezone(get_timezone(self.timezonestr)).utcoffset())
         self.altitude = 25
         self.geonameid = None
 
         # Transit
 
         if self.chart_type == "Transit":
+            # current datetime, aware and naive utc
+            dt = get_timezone(self.timezonestr).localize(datetime.now().replace(microsecond=0))
+            dt_utc = dt.replace(tzinfo=None) - dt.utcoffset()  # type: ignore
+
             self.t_geolon = self.geolon
             self.t_geolat = self.geolat
             self.t_altitude = self.altitude
@@ -274,27 +327,45 @@ class KerykeionChartSVG:
             self.t_altitude = 25
             self.t_geonameid = None
 
-        # configuration
-        # ZOOM 1 = 100%
-        self.zoom = 1
+    def _set_second_subject(self, second_obj: AstrologicalSubject) -> None:
+        """
+        Sets the second subject of a Transit or Synastry chart.
+        """
+        # Kerykeion instance
+        self.t_user = second_obj
 
-        self.zodiac = (
-            {"name": "aries", "element": "fire"},
-            {"name": "taurus", "element": "earth"},
-            {"name": "gemini", "element": "air"},
-            {"name": "cancer", "element": "water"},
-            {"name": "leo", "element": "fire"},
-            {"name": "virgo", "element": "earth"},
-            {"name": "libra", "element": "air"},
-            {"name": "scorpio", "element": "water"},
-            {"name": "sagittarius", "element": "fire"},
-            {"name": "capricorn", "element": "earth"},
-            {"name": "aquarius", "element": "air"},
-            {"name": "pisces", "element": "water"},
-        )
+        # Available bodies
+        available_celestial_points = []
+        for body in self.available_planets_setting:
+            available_celestial_points.append(body["name"].lower())
 
-        # Immediately generate template.
-        self.template = self.makeTemplate()
+        for planet in available_celestial_points:
+            if self.t_user.get(planet) is None:
+                raise KerykeionException(f"{planet} is active in the settings but it is not an active point of {self.t_user.name}!")
+
+        # Make a list for the absolute degrees of the points of the graphic.
+        self.t_points_deg_ut = []
+        for planet in available_celestial_points:            
+            self.t_points_deg_ut.append(self.t_user.get(planet).abs_pos)
+
+        # Make a list of the relative degrees of the points in the graphic.
+        self.t_points_deg = []
+        for planet in available_celestial_points:
+            self.t_points_deg.append(self.t_user.get(planet).position)
+
+        # Make list of the poits sign.
+        self.t_points_sign = []
+        for planet in available_celestial_points:
+            self.t_points_sign.append(self.t_user.get(planet).sign_num)
+
+        # Make a list of poits if they are retrograde or not.
+        self.t_points_retrograde = []
+        for planet in available_celestial_points:
+            self.t_points_retrograde.append(self.t_user.get(planet).retrograde)
+
+        self.t_houses_sign_graph = []
+        for h in self.t_user.houses_list:
+            self.t_houses_sign_graph.append(h["sign_num"])
 
     def get_font(self, new_font_name):
         """
@@ -318,9 +389,10 @@ class KerykeionChartSVG:
 
     def parse_json_settings(self, settings_file):
         """
-        Parse the settings file.
+        Parse the settings file, the style is built once per settings file, see chart_style.
         """
-        settings = get_settings(settings_file)
+        self.style = get_chart_style(settings_file)
+        settings = self.style.settings
 
         language = settings["general_settings"]["language"]
         self.language_settings = settings["language_settings"].get(language, "EN")
@@ -389,66 +461,31 @@ class KerykeionChartSVG:
      
     def _lat2str(self, coord):
         """Converts a floating point latitude to string with
-        degree, minutes and seconds and the appropriate sign
-        (north or south). Eg. 52.1234567 -> 52°7'25" N
+        degree, the sign (north or south) and minutes. Eg. 52.1234567 -> 52n7
 
         Args:
             coord (float): latitude in floating point format
         Returns:
-            str: latitude in string format with degree, minutes,
-             seconds and sign (N/S)
+            str: latitude in string format with degree, sign (n/s) and minutes
         """
-
-        sign = self.language_settings["north"]
-        if coord < 0.0:
-            sign = self.language_settings["south"]
-            coord = abs(coord)
-        deg = int(coord)
-        min = int((float(coord) - deg) * 60)
-        sec = int(round(float(((float(coord) - deg) * 60) - min) * 60.0))
-        return f"{deg}{(sign[0]).lower()}{min} "
+        return coordinate2str(coord, self.language_settings["north"], self.language_settings["south"]) + " "
 
     def _lon2str(self, coord):
         """Converts a floating point longitude to string with
-        degree, minutes and seconds and the appropriate sign
-        (east or west). Eg. 52.1234567 -> 52°7'25" E
+        degree, the sign (east or west) and minutes. Eg. 52.1234567 -> 52e7
 
         Args:
             coord (float): longitude in floating point format
         Returns:
-            str: longitude in string format with degree, minutes,
-                seconds and sign (E/W)
+            str: longitude in string format with degree, sign (e/w) and minutes
         """
-
-        sign = self.language_settings["east"]
-        if coord < 0.0:
-            sign = self.language_settings["west"]
-            coord = abs(coord)
-        deg = int(coord)
-        min = int((float(coord) - deg) * 60)
-        sec = int(round(float(((float(coord) - deg) * 60) - min) * 60.0))
-        return f"{deg}{(sign[0]).lower()}{min}"
+        return coordinate2str(coord, self.language_settings["east"], self.language_settings["west"])
 
     def _dec2deg(self, dec, type="3"):
         """Coverts decimal float to degrees in format
-        a°b'c".
+        a°b'c", see dec2deg_array to convert a whole column.
         """
-
-        dec = float(dec)
-        a = int(dec)
-        a_new = (dec - float(a)) * 60.0
-        b_rounded = int(round(a_new))
-        b = int(a_new)
-        c = int(round((a_new - float(b)) * 60.0))
-        if type == "3":
-            out = f"{a:02d}&#176;{b:02d}&#39;{c:02d}&#34;"
-        elif type == "2":
-            out = f"{a:02d}&#176;{b_rounded:02d}&#39;"
-        elif type == "1":
-            out = f"{a:02d}&#176;"
-        else:
-            raise KerykeionException(f"Wrong type: {type}, it must be 1, 2 or 3.")
-        return str(out)
+        return dec2deg(float(dec), type)
 
     def _drawAspect(self, r, ar, degA, degB, color):
         """
@@ -510,7 +547,34 @@ class KerykeionChartSVG:
         return output
     
     def _makeHouses(self, r):
-        path = ""
+        natal_houses = self._makeNatalHouses(r)
+
+        if self.chart_type == "Transit" or self.chart_type == "Synastry":
+            # The transit lines of each house are drawn under its natal line.
+            return "".join(transit + natal for transit, natal in zip(self._makeTransitHouses(r), natal_houses))
+
+        return "".join(natal_houses)
+
+    def _houseLineColor(self, i):
+        """
+        The color of the line of a house, the axes (asc, mc, dsc, ic) have the color of their point.
+        """
+        if i == 0:
+            return self.planets_settings[12]["color"]
+        elif i == 9:
+            return self.planets_settings[13]["color"]
+        elif i == 6:
+            return self.planets_settings[14]["color"]
+        elif i == 3:
+            return self.planets_settings[15]["color"]
+        else:
+            return self.chart_colors_settings["houses_radix_line"]
+
+    def _makeNatalHouses(self, r) -> list[str]:
+        """
+        Draws the lines and the numbers of the houses of the first subject, one string for each house.
+        """
+        houses = []
         xr = 12
 
         for i in range(xr):
@@ -518,7 +582,6 @@ class KerykeionChartSVG:
             if self.chart_type == "Transit" or self.chart_type == "Synastry":
                 dropin = 160
                 roff = 72
-                t_roff = 36
             else:
                 dropin = self.c1 
                 roff = self.c1 
@@ -536,48 +599,7 @@ class KerykeionChartSVG:
                 text_offset = offset + int(degreeDiff(self.user.houses_degree_ut[0], self.user.houses_degree_ut[(xr - 1)]) / 2)
 
             # mc, asc, dsc, ic
-            if i == 0:
-                linecolor = self.planets_settings[12]["color"]
-            elif i == 9:
-                linecolor = self.planets_settings[13]["color"]
-            elif i == 6:
-                linecolor = self.planets_settings[14]["color"]
-            elif i == 3:
-                linecolor = self.planets_settings[15]["color"]
-            else:
-                linecolor = self.chart_colors_settings["houses_radix_line"]
-
-            # Transit houses lines.
-            if self.chart_type == "Transit" or self.chart_type == "Synastry":
-                # Degrees for point zero.
-
-                zeropoint = 360 - self.user.houses_degree_ut[6]
-                t_offset = zeropoint + self.t_user.houses_degree_ut[i]
-                if t_offset > 360:
-                    t_offset = t_offset - 360
-                t_x1 = sliceToX(0, (r - t_roff), t_offset) + t_roff
-                t_y1 = sliceToY(0, (r - t_roff), t_offset) + t_roff
-                t_x2 = sliceToX(0, r, t_offset)
-                t_y2 = sliceToY(0, r, t_offset)
-                if i < 11:
-                    t_text_offset = t_offset + int(degreeDiff(self.t_user.houses_degree_ut[(i + 1)], self.t_user.houses_degree_ut[i]) / 2)
-                else:
-                    t_text_offset = t_offset + int(degreeDiff(self.t_user.houses_degree_ut[0], self.t_user.houses_degree_ut[11]) / 2)
-                # linecolor
-                if i == 0 or i == 9 or i == 6 or i == 3:
-                    t_linecolor = linecolor
-                else:
-                    t_linecolor = self.chart_colors_settings["houses_transit_line"]
-                xtext = sliceToX(0, (r - 8), t_text_offset) + 8
-                ytext = sliceToY(0, (r - 8), t_text_offset) + 8
-
-                if self.chart_type == "Transit":
-                    path = path + '<text style="fill: #00f; fill-opacity: 0; font-size: 14px"><tspan x="' + str(xtext - 3) + '" y="' + str(ytext + 3) + '">' + str(i + 1) + "</tspan></text>"
-                    path = f"{path}<line x1='{str(t_x1)}' y1='{str(t_y1)}' x2='{str(t_x2)}' y2='{str(t_y2)}' style='stroke: {t_linecolor}; stroke-width: 2px; stroke-opacity:1;'/>"
-
-                else:
-                    path = path + '<text style="fill: #0f0; fill-opacity: .4; font-size: 14px"><tspan x="' + str(xtext - 3) + '" y="' + str(ytext + 3) + '">' + str(i + 1) + "</tspan></text>"
-                    path = f"{path}<line x1='{str(t_x1)}' y1='{str(t_y1)}' x2='{str(t_x2)}' y2='{str(t_y2)}' style='stroke: {t_linecolor}; stroke-width: 2px; stroke-opacity:1;'/>"
+            linecolor = self._houseLineColor(i)
 
             # if transit
             if self.chart_type == "Transit" or self.chart_type == "Synastry":
@@ -598,12 +620,53 @@ class KerykeionChartSVG:
             if 90 <= angle_degrees < 270:
                 angle_degrees += 180
             
-
-            path = f'{path}<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" style="stroke: {linecolor}; stroke-width: 2px; stroke-dasharray:3,2; stroke-opacity:1;"/>'
+            path = f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" style="stroke: {linecolor}; stroke-width: 2px; stroke-dasharray:3,2; stroke-opacity:1;"/>'
             path = path + f'<circle cx="{xhouse}" cy="{yhouse}" r="6" fill="#fff" opacity="1"/>'
             path = path + f'<text  transform="rotate({angle_degrees} {xtext} {ytext})" style="fill:{self.chart_colors_settings["paper_1"]}; fill-opacity: 1; font-size: 8px" x="{xtext}" y="{ytext}" dominant-baseline="middle" text-anchor="middle">{i + 1}</text>'
+            houses.append(path)
+
+        return houses
+
+    def _makeTransitHouses(self, r) -> list[str]:
+        """
+        Draws the lines and the numbers of the houses of the second subject, one string for each house.
+        """
+        houses = []
+        t_roff = 36
+
+        for i in range(12):
+            # Degrees for point zero.
+            zeropoint = 360 - self.user.houses_degree_ut[6]
+            t_offset = zeropoint + self.t_user.houses_degree_ut[i]
+            if t_offset > 360:
+                t_offset = t_offset - 360
+            t_x1 = sliceToX(0, (r - t_roff), t_offset) + t_roff
+            t_y1 = sliceToY(0, (r - t_roff), t_offset) + t_roff
+            t_x2 = sliceToX(0, r, t_offset)
+            t_y2 = sliceToY(0, r, t_offset)
+            if i < 11:
+                t_text_offset = t_offset + int(degreeDiff(self.t_user.houses_degree_ut[(i + 1)], self.t_user.houses_degree_ut[i]) / 2)
+            else:
+                t_text_offset = t_offset + int(degreeDiff(self.t_user.houses_degree_ut[0], self.t_user.houses_degree_ut[11]) / 2)
+            # linecolor
+            if i == 0 or i == 9 or i == 6 or i == 3:
+                t_linecolor = self._houseLineColor(i)
+            else:
+                t_linecolor = self.chart_colors_settings["houses_transit_line"]
+            xtext = sliceToX(0, (r - 8), t_text_offset) + 8
+            ytext = sliceToY(0, (r - 8), t_text_offset) + 8
+
+            if self.chart_type == "Transit":
+                path = '<text style="fill: #00f; fill-opacity: 0; font-size: 14px"><tspan x="' + str(xtext - 3) + '" y="' + str(ytext + 3) + '">' + str(i + 1) + "</tspan></text>"
+                path = f"{path}<line x1='{str(t_x1)}' y1='{str(t_y1)}' x2='{str(t_x2)}' y2='{str(t_y2)}' style='stroke: {t_linecolor}; stroke-width: 2px; stroke-opacity:1;'/>"
+
+            else:
+                path = '<text style="fill: #0f0; fill-opacity: .4; font-size: 14px"><tspan x="' + str(xtext - 3) + '" y="' + str(ytext + 3) + '">' + str(i + 1) + "</tspan></text>"
+                path = f"{path}<line x1='{str(t_x1)}' y1='{str(t_y1)}' x2='{str(t_x2)}' y2='{str(t_y2)}' style='stroke: {t_linecolor}; stroke-width: 2px; stroke-opacity:1;'/>"
+
+            houses.append(path)
 
-        return path
+        return houses
 
     def _value_element_from_planet(self, i):
         """
@@ -633,51 +696,18 @@ class KerykeionChartSVG:
             self.water = self.water + self.available_planets_setting[i]["element_points"] + extra_points
 
     def _make_planets(self, r):
-        planets_degut = {}
-        def _value_element_from_planet(self, i):
-            pass
-
+        planets = []
         for i in range(len(self.available_planets_setting)):
             if self.available_planets_setting[i]["is_active"] == 1:
                 logging.debug(f"planet: {i}, degree: {self.points_deg_ut[i]}")
-                planets_degut[self.points_deg_ut[i]] = i
+                planets.append(i)
 
             self._value_element_from_planet(i)
 
-        keys = list(planets_degut.keys())
-        keys.sort()
-
-        planets = [(planets_degut[key], key) for key in keys]
-
-        def adjust_planet_angles(planets):
-            planets.sort(key=lambda planet: planet[1])
-            n = len(planets)
-            adjusted_angles = [planets[0][1]]
-            
-            detection_distance = 5
-            new_distance = 6.5
-            
-            for i in range(1, n):
-                previous_angle = adjusted_angles[-1]
-                current_angle = planets[i][1]
-
-                if current_angle - previous_angle < detection_distance:
-                    current_angle = previous_angle + new_distance
-
-                adjusted_angles.append(current_angle)
+        # The glyphs are at least PLANETS_LABEL_DISTANCE degrees apart, also the ones of points at the same degree.
+        adjusted_angles = circularLabelLayout([self.points_deg_ut[i] for i in planets], PLANETS_LABEL_DISTANCE)
+        adjusted_planets = sorted(zip(planets, adjusted_angles), key=lambda planet: planet[1])
 
-            for i in range(n):
-                for j in range(i + 1, n):
-                    if abs(adjusted_angles[j] - adjusted_angles[i]) < detection_distance:
-                        adjusted_angles[j] = (adjusted_angles[i] + new_distance) % 360
-
-            for i in range(n):
-                planets[i] = (planets[i][0], adjusted_angles[i])
-
-            return planets
-
-        adjusted_planets = adjust_planet_angles(planets)
-        
         output = ""
         scale = 0.6
         rplanet = 101
@@ -707,149 +737,26 @@ class KerykeionChartSVG:
 
     def _makePatterns(self):
         """
-        * Stellium: At least four planets linked together in a series of continuous conjunctions.
-        * Grand trine: Three trine aspects together.
-        * Grand cross: Two pairs of opposing planets squared to each other.
-        * T-Square: Two planets in opposition squared to a third.
-        * Yod: Two qunicunxes together joined by a sextile.
+        Draws the aspect patterns of the natal chart, see kerykeion.aspects.aspect_patterns,
+        one row for each pattern with its name and the symbols of its points, the apex first.
         """
-        conj = {}  # 0
-        opp = {}  # 10
-        sq = {}  # 5
-        tr = {}  # 6
-        qc = {}  # 9
-        sext = {}  # 3
-        for i in range(len(self.available_planets_setting)):
-            a = self.points_deg_ut[i]
-            qc[i] = {}
-            sext[i] = {}
-            opp[i] = {}
-            sq[i] = {}
-            tr[i] = {}
-            conj[i] = {}
-            # skip some points
-            n = self.available_planets_setting[i]["name"]
-            if n == "earth" or n == "True_Node" or n == "osc. apogee" or n == "intp. apogee" or n == "intp. perigee":
-                continue
-            if n == "Dsc" or n == "Ic":
-                continue
-            for j in range(len(self.available_planets_setting)):
-                # skip some points
-                n = self.available_planets_setting[j]["name"]
-                if n == "earth" or n == "True_Node" or n == "osc. apogee" or n == "intp. apogee" or n == "intp. perigee":
-                    continue
-                if n == "Dsc" or n == "Ic":
-                    continue
-                b = self.points_deg_ut[j]
-                delta = float(degreeDiff(a, b))
-                # check for opposition
-                xa = float(self.aspects_settings[10]["degree"]) - float(self.aspects_settings[10]["orb"])
-                xb = float(self.aspects_settings[10]["degree"]) + float(self.aspects_settings[10]["orb"])
-                if xa <= delta <= xb:
-                    opp[i][j] = True
-                # check for conjunction
-                xa = float(self.aspects_settings[0]["degree"]) - float(self.aspects_settings[0]["orb"])
-                xb = float(self.aspects_settings[0]["degree"]) + float(self.aspects_settings[0]["orb"])
-                if xa <= delta <= xb:
-                    conj[i][j] = True
-                # check for squares
-                xa = float(self.aspects_settings[5]["degree"]) - float(self.aspects_settings[5]["orb"])
-                xb = float(self.aspects_settings[5]["degree"]) + float(self.aspects_settings[5]["orb"])
-                if xa <= delta <= xb:
-                    sq[i][j] = True
-                # check for qunicunxes
-                xa = float(self.aspects_settings[9]["degree"]) - float(self.aspects_settings[9]["orb"])
-                xb = float(self.aspects_settings[9]["degree"]) + float(self.aspects_settings[9]["orb"])
-                if xa <= delta <= xb:
-                    qc[i][j] = True
-                # check for sextiles
-                xa = float(self.aspects_settings[3]["degree"]) - float(self.aspects_settings[3]["orb"])
-                xb = float(self.aspects_settings[3]["degree"]) + float(self.aspects_settings[3]["orb"])
-                if xa <= delta <= xb:
-                    sext[i][j] = True
-
-        yot = {}
-        # check for double qunicunxes
-        for k, v in qc.items():
-            if len(qc[k]) >= 2:
-                # check for sextile
-                for l, w in qc[k].items():
-                    for m, x in qc[k].items():
-                        if m in sext[l]:
-                            if l > m:
-                                yot["%s,%s,%s" % (k, m, l)] = [k, m, l]
-                            else:
-                                yot["%s,%s,%s" % (k, l, m)] = [k, l, m]
-        tsquare = {}
-        # check for opposition
-        for k, v in opp.items():
-            if len(opp[k]) >= 1:
-                # check for square
-                for l, w in opp[k].items():
-                    for a, b in sq.items():
-                        if k in sq[a] and l in sq[a]:
-                            logging.debug(f"Got tsquare {a} {k} {l}")
-                            if k > l:
-                                tsquare[f"{a},{l},{k}"] = f"{self.available_planets_setting[a]['label']} => {self.available_planets_setting[l]['label']}, {self.available_planets_setting[k]['label']}"
-
-                            else:
-                                tsquare[f"{a},{k},{l}"] = f"{self.available_planets_setting[a]['label']} => {self.available_planets_setting[k]['label']}, {self.available_planets_setting[l]['label']}"
-
-        stellium = {}
-        # check for 4 continuous conjunctions
-        for k, v in conj.items():
-            if len(conj[k]) >= 1:
-                # first conjunction
-                for l, m in conj[k].items():
-                    if len(conj[l]) >= 1:
-                        for n, o in conj[l].items():
-                            # skip 1st conj
-                            if n == k:
-                                continue
-                            if len(conj[n]) >= 1:
-                                # third conjunction
-                                for p, q in conj[n].items():
-                                    # skip first and second conj
-                                    if p == k or p == n:
-                                        continue
-                                    if len(conj[p]) >= 1:
-                                        # fourth conjunction
-                                        for r, s in conj[p].items():
-                                            # skip conj 1,2,3
-                                            if r == k or r == n or r == p:
-                                                continue
-
-                                            l = [k, n, p, r]
-                                            l.sort()
-                                            stellium["%s %s %s %s" % (l[0], l[1], l[2], l[3])] = "%s %s %s %s" % (
-                                                self.available_planets_setting[l[0]]["label"],
-                                                self.available_planets_setting[l[1]]["label"],
-                                                self.available_planets_setting[l[2]]["label"],
-                                                self.available_planets_setting[l[3]]["label"],
-                                            )
-        out = '<g transform="translate(-30,380)">'
-        if len(yot) >= 1:
-            y = 0
-            for k, v in yot.items():
-                out += f'<text y="{y}" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 12px;">{"Yot"}</text>'
+        if not self.aspect_patterns:
+            return ""
 
-                # first planet symbol
-                out += f'<g transform="translate(20,{y})">'
-                out += f'<use transform="scale(0.4)" x="0" y="-20" xlink:href="#{self.available_planets_setting[yot[k][0]]["name"]}" /></g>'
+        out = '<g transform="translate(-30,380)">'
+        y = 0
+        for pattern in self.aspect_patterns:
+            out += f'<text y="{y}" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 12px;">{pattern.name.replace("_", " ")}</text>'
 
-                # second planet symbol
-                out += f'<g transform="translate(30,{y})">'
-                out += f'<use transform="scale(0.4)" x="0" y="-20" xlink:href="#{self.available_planets_setting[yot[k][1]]["name"]}" /></g>'
+            points = sorted(pattern.points, key=lambda point: point != pattern.apex)
+            for i, point in enumerate(points):
+                out += f'<g transform="translate({70 + i * 10},{y})">'
+                out += f'<use transform="scale(0.4)" x="0" y="-20" xlink:href="#{point}" /></g>'
 
-                # third planet symbol
-                out += f'<g transform="translate(40,{y})">'
-                out += f'<use transform="scale(0.4)" x="0" y="-20" xlink:href="#{self.available_planets_setting[yot[k][2]]["name"]}" /></g>'
+            y = y + 14
 
-                y = y + 14
-        # finalize
         out += "</g>"
-        # return out
-        return ""
+        return out
 
     # Aspect and aspect grid functions for natal type charts.
     def _makeAspects(self, r, ar):
@@ -941,6 +848,8 @@ class KerykeionChartSVG:
         line = 0
         nl = 0
 
+        orbits = dec2deg_array([aspect["orbit"] for aspect in self.aspects_list])
+
         for i in range(len(self.aspects_list)):
             if i == 12:
                 nl = 100
@@ -980,7 +889,7 @@ class KerykeionChartSVG:
             
             out += "</g>"
             # difference in degrees
-            out += f'<text y="8" x="45" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self._dec2deg(self.aspects_list[i]["orbit"])}</text>'
+            out += f'<text y="8" x="45" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{orbits[i]}</text>'
             # line
             out += "</g>"
             line = line + 14
@@ -1003,7 +912,46 @@ class KerykeionChartSVG:
 
         return out
 
+    def _makePositionStrings(self) -> ChartPositionStrings:
+        """
+        The strings of the position: the coordinates of the first subject, or the second subject in a synastry.
+        """
+        if self.chart_type == "Synastry":
+            return {
+                "stringLat": f"{self.t_user.name}: ",
+                "stringLon": self.t_user.city,
+                "stringPosition": f"{self.t_user.day} {self.t_user.month} {self.t_user.year} {self.t_user.hour:02d}:{self.t_user.minute:02d}",
+            }
+
+        return {
+            "stringLat": f"{self._lat2str(self.geolat)}",
+            "stringLon": f"{self._lon2str(self.geolon)}",
+            "stringPosition": f"{self.language_settings['type']}: {self.charttype}",
+        }
+
+    def _makeTitle(self) -> str:
+        if self.chart_type == "Synastry":
+            return f"{self.name} {self.language_settings['and_word']} {self.t_user.name}"
+
+        elif self.chart_type == "Transit":
+            return f"{self.language_settings['transits']} {self.t_user.day}/{self.t_user.month}/{self.t_user.year}"
+
+        else:
+            return self.name
+
     def _makePlanetGrid(self):
+        out = self._makeNatalPlanetGrid()
+
+        if self.chart_type == "Transit" or self.chart_type == "Synastry":
+            out += self._makeTransitPlanetGrid()
+
+        out += "</g>"
+        return out
+
+    def _makeNatalPlanetGrid(self):
+        """
+        The points of the first subject in the planet grid, without the closing tag of the grid.
+        """
         li = 10
         offset = 0
 
@@ -1011,6 +959,8 @@ class KerykeionChartSVG:
         out += '<g transform="translate(80, -15)">' 
         out += "</g>"
 
+        degrees = dec2deg_array(self.points_deg)
+
         end_of_line = None
         for i in range(len(self.available_planets_setting)):
             offset_between_lines = 14
@@ -1027,7 +977,7 @@ class KerykeionChartSVG:
             out += f'<text text-anchor="start" x="-20" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self.language_settings["celestial_points"][self.available_planets_setting[i]["label"]]}</text>'
 
             # planet degree
-            out += f'<text text-anchor="start" x="35" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self._dec2deg(self.points_deg[i])}</text>'
+            out += f'<text text-anchor="start" x="35" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{degrees[i]}</text>'
 
             # planet retrograde
             if self.points_retrograde[i]:
@@ -1038,55 +988,75 @@ class KerykeionChartSVG:
 
             li = li + offset_between_lines
 
-        if self.chart_type == "Transit" or self.chart_type == "Synastry":
-            if self.chart_type == "Transit":
-                out += '<g transform="translate(320, -15)">'
-                out += f'<text text-anchor="start" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 14px;">{self.t_name}:</text>'
-            else:
-                out += '<g transform="translate(380, -15)">'
-                out += f'<text text-anchor="start" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 14px;">{self.language_settings["planets_and_house"]} {self.t_user.name}:</text>'
+        if end_of_line is None:
+            raise KerykeionException("End of line not found")
 
-            out += end_of_line
+        return out
 
-            t_li = 10
-            t_offset = 250
+    def _makeTransitPlanetGrid(self):
+        """
+        The points of the second subject in the planet grid.
+        """
+        out = ""
+        end_of_line = "</g>"
+        offset_between_lines = 14
 
-            for i in range(len(self.available_planets_setting)):
-                if i == 27:
-                    t_li = 10
-                    t_offset = -120
+        if self.chart_type == "Transit":
+            out += '<g transform="translate(320, -15)">'
+            out += f'<text text-anchor="start" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 14px;">{self.t_name}:</text>'
+        else:
+            out += '<g transform="translate(380, -15)">'
+            out += f'<text text-anchor="start" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 14px;">{self.language_settings["planets_and_house"]} {self.t_user.name}:</text>'
 
-                if self.available_planets_setting[i]["is_active"] == 1:
-                    # start of line
-                    out += f'<g transform="translate({t_offset},{t_li})">'
+        out += end_of_line
 
-                    # planet text
-                    out += f'<text text-anchor="start" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self.language_settings["celestial_points"][self.available_planets_setting[i]["label"]]}</text>'
-                    # planet symbol
-                    out += f'<g transform="translate(5,-8)"><use transform="scale(0.4)" xlink:href="#{self.available_planets_setting[i]["name"]}" /></g>'
-                    # planet degree
-                    out += f'<text text-anchor="start" x="19" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self._dec2deg(self.t_points_deg[i])}</text>'
-                    # zodiac
-                    out += f'<g transform="translate(60,-8)"><use transform="scale(0.3)" xlink:href="#{self.zodiac[self.t_points_sign[i]]["name"]}" /></g>'
+        t_li = 10
+        t_offset = 250
 
-                    # planet retrograde
-                    if self.t_points_retrograde[i]:
-                        out += '<g transform="translate(74,-6)"><use transform="scale(.5)" xlink:href="#retrograde" /></g>'
+        degrees = dec2deg_array(self.t_points_deg)
 
-                    # end of line
-                    out += end_of_line
+        for i in range(len(self.available_planets_setting)):
+            if i == 27:
+                t_li = 10
+                t_offset = -120
 
-                    t_li = t_li + offset_between_lines
+            if self.available_planets_setting[i]["is_active"] == 1:
+                # start of line
+                out += f'<g transform="translate({t_offset},{t_li})">'
 
-        if end_of_line is None:
-            raise KerykeionException("End of line not found")
+                # planet text
+                out += f'<text text-anchor="start" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self.language_settings["celestial_points"][self.available_planets_setting[i]["label"]]}</text>'
+                # planet symbol
+                out += f'<g transform="translate(5,-8)"><use transform="scale(0.4)" xlink:href="#{self.available_planets_setting[i]["name"]}" /></g>'
+                # planet degree
+                out += f'<text text-anchor="start" x="19" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{degrees[i]}</text>'
+                # zodiac
+                out += f'<g transform="translate(60,-8)"><use transform="scale(0.3)" xlink:href="#{self.zodiac[self.t_points_sign[i]]["name"]}" /></g>'
+
+                # planet retrograde
+                if self.t_points_retrograde[i]:
+                    out += '<g transform="translate(74,-6)"><use transform="scale(.5)" xlink:href="#retrograde" /></g>'
+
+                # end of line
+                out += end_of_line
+
+                t_li = t_li + offset_between_lines
 
-        out += end_of_line
         return out
 
     def _makeHousesGrid(self):
+        out = self._makeNatalHousesGrid()
+
+        if self.chart_type == "Synastry":
+            out += self._makeSecondHousesGrid()
+
+        return out
+
+    def _makeNatalHousesGrid(self):
         out = '<g transform="translate(600,-20)">'
 
+        positions = dec2deg_array([house["position"] for house in self.user.houses_list])
+
         li = 10
         for i in range(12):
             if i < 9:
@@ -1096,27 +1066,30 @@ class KerykeionChartSVG:
             out += f'<g transform="translate(0,{li})">'
             out += f'<text text-anchor="end" x="40" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self.language_settings["cusp"]} {cusp}:</text>'
             out += f'<g transform="translate(40,-8)"><use transform="scale(0.3)" xlink:href="#{self.zodiac[self.houses_sign_graph[i]]["name"]}" /></g>'
-            out += f'<text x="53" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;"> {self._dec2deg(self.user.houses_list[i]["position"])}</text>'
+            out += f'<text x="53" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;"> {positions[i]}</text>'
             out += "</g>"
             li = li + 14
 
         out += "</g>"
 
-        if self.chart_type == "Synastry":
-            out += '<g transform="translate(840, -20)">'
-            li = 10
-            for i in range(12):
-                if i < 9:
-                    cusp = "&#160;&#160;" + str(i + 1)
-                else:
-                    cusp = str(i + 1)
-                out += '<g transform="translate(0,' + str(li) + ')">'
-                out += f'<text text-anchor="end" x="40" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self.language_settings["cusp"]} {cusp}:</text>'
-                out += f'<g transform="translate(40,-8)"><use transform="scale(0.3)" xlink:href="#{self.zodiac[self.t_houses_sign_graph[i]]["name"]}" /></g>'
-                out += f'<text x="53" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;"> {self._dec2deg(self.t_user.houses_list[i]["position"])}</text>'
-                out += "</g>"
-                li = li + 14
+        return out
+
+    def _makeSecondHousesGrid(self):
+        out = '<g transform="translate(840, -20)">'
+        positions = dec2deg_array([house["position"] for house in self.t_user.houses_list])
+        li = 10
+        for i in range(12):
+            if i < 9:
+                cusp = "&#160;&#160;" + str(i + 1)
+            else:
+                cusp = str(i + 1)
+            out += '<g transform="translate(0,' + str(li) + ')">'
+            out += f'<text text-anchor="end" x="40" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;">{self.language_settings["cusp"]} {cusp}:</text>'
+            out += f'<g transform="translate(40,-8)"><use transform="scale(0.3)" xlink:href="#{self.zodiac[self.t_houses_sign_graph[i]]["name"]}" /></g>'
+            out += f'<text x="53" style="fill:{self.chart_colors_settings["paper_0"]}; font-size: 10px;"> {positions[i]}</text>'
             out += "</g>"
+            li = li + 14
+        out += "</g>"
 
         return out
 
@@ -1148,7 +1121,7 @@ class KerykeionChartSVG:
 
         # template dictionary
         td: ChartTemplateDictionary = dict() 
-        r = 240
+        r = CHART_RADIUS
 
         if self.chart_type == "ExternalNatal" or self.chart_type == "Natal":
             self.c1 = 56
@@ -1162,12 +1135,15 @@ class KerykeionChartSVG:
         # transit
         if self.chart_type == "Transit" or self.chart_type == "Synastry":
             td["font"] = self.font
+            td["font_name"] = self.font_name
             td["transitRing"] = self._transitRing(r)
             td["degreeRing"] = self._degreeTransitRing(r)
 
             # circles
             td["c1"] = f'cx="{r}" cy="{r}" r="{r - 36}"'
-            td["c1style"] = f'fill: none; stroke: {self.chart_colors_settings["zodiac_transit_ring_2"]}; stroke-width: 1px; stroke-opacity:.4;'
+            td["c1style"] = self.style.ring_styles["c1style_transit"]
+            td["c2"] = f'cx="{r}" cy="{r}" r="{r - 72}"'
+            td["c2style"] = self.style.ring_styles["c2style_transit"]
 
 
 
@@ -1175,10 +1151,10 @@ class KerykeionChartSVG:
             td["c3"] = 'cx="' + str(r) + '" cy="' + str(r) + '" r="' + str(r - 160) + '"'
             if self.bg_image_wheel_is_active == True:
                 td["bg_image_wheel"] = self.bg_image_wheel_pattern
-                td["c3style"] = f'fill:url(#image); fill-opacity:1; stroke: {self.chart_colors_settings["zodiac_radix_ring_0"]}; stroke-width: 1px'
+                td["c3style"] = self.style.ring_styles["c3style_image"]
             else:
                 td["bg_image_wheel"] = self.bg_image_wheel_pattern
-                td["c3style"] = f"fill: {self.chart_colors_settings['paper_1']}; fill-opacity:1; stroke: {self.chart_colors_settings['zodiac_transit_ring_0']}; stroke-width: 1px"
+                td["c3style"] = self.style.ring_styles["c3style_transit"]
             td["makeAspects"] = self._makeAspectsTransit(r, (r - 160))
             td["makeAspectGrid"] = self._makeAspectTransitGrid(r)
             td["makePatterns"] = ""
@@ -1205,14 +1181,14 @@ class KerykeionChartSVG:
             td["c1"] = f'cx="{r}" cy="{r}" r="{r - 46}"'
             td["c1style"] = f'fill: none; stroke: {self.chart_colors_settings["zodiac_radix_ring_2"]}; stroke-width: 3px; stroke-dasharray: {dasharray}; stroke-dashoffset: {(perimeter/360*self.offset)-5}'
             td["c2"] = f'cx="{r}" cy="{r}" r="{r - self.c2}"'
-            td["c2style"] = f'fill: {self.chart_colors_settings["paper_1"]}; fill-opacity:0; stroke: {self.chart_colors_settings["zodiac_radix_ring_1"]}; stroke-opacity:.4; stroke-width: 1px'
+            td["c2style"] = self.style.ring_styles["c2style_natal"]
             td["c3"] = f'cx="{r}" cy="{r}" r="{r - self.c3}"'
             if self.bg_image_wheel_is_active == True:
                 td["bg_image_wheel"] = self.bg_image_wheel_pattern
-                td["c3style"] = f'fill:url(#image); fill-opacity:1; stroke: {self.chart_colors_settings["zodiac_radix_ring_0"]}; stroke-width: 1px'
+                td["c3style"] = self.style.ring_styles["c3style_image"]
             else:
                 td["bg_image_wheel"] = self.bg_image_wheel_pattern
-                td["c3style"] = f'fill: {self.chart_colors_settings["paper_1"]}; fill-opacity:1; stroke: {self.chart_colors_settings["zodiac_radix_ring_0"]}; stroke-width: 1px'
+                td["c3style"] = self.style.ring_styles["c3style_natal"]
             td["makeAspects"] = self._makeAspects(r, (r - self.c3))
             td["makeAspectGrid"] = self._makeAspectGrid(r)
             td["makePatterns"] = self._makePatterns()
@@ -1225,14 +1201,7 @@ class KerykeionChartSVG:
         td["viewbox"] = viewbox
 
 
-        if self.chart_type == "Synastry":
-            td["stringTitle"] = f"{self.name} {self.language_settings['and_word']} {self.t_user.name}"
-
-        elif self.chart_type == "Transit":
-            td["stringTitle"] = f"{self.language_settings['transits']} {self.t_user.day}/{self.t_user.month}/{self.t_user.year}"
-
-        else:
-            td["stringTitle"] = self.name
+        td["stringTitle"] = self._makeTitle()
 
         if self.chart_type == "Synastry" or self.name == "Transit":
             td["stringName"] = ""
@@ -1263,6 +1232,9 @@ class KerykeionChartSVG:
         td["bottomLeft4"] = ""
 
         # lunar phase
+        if self.user.lunar_phase is None:
+            raise KerykeionException("The Sun and the Moon must be active points to draw the lunar phase of the chart!")
+
         deg = self.user.lunar_phase["degrees_between_s_m"]
 
         lffg = None
@@ -1329,18 +1301,12 @@ class KerykeionChartSVG:
 
         td["stringDateTime"] = f"{self.user.day} {self.user.month_name} {self.user.year} · {self.user.hour:02d}:{self.user.minute:02d}"
 
-        if self.chart_type == "Synastry":
-            td["stringLat"] = f"{self.t_user.name}: "
-            td["stringLon"] = self.t_user.city
-            td["stringPosition"] = f"{self.t_user.day} {self.t_user.month} {self.t_user.year} {self.t_user.hour:02d}:{self.t_user.minute:02d}"
-
-        else:
-            td["stringLat"] = f"{self._lat2str(self.geolat)}"
-            td["stringLon"] = f"{self._lon2str(self.geolon)}"
-            td["stringPosition"] = f"{self.language_settings['type']}: {self.charttype}"
+        position_strings = self._makePositionStrings()
+        td["stringLat"] = position_strings["stringLat"]
+        td["stringLon"] = position_strings["stringLon"]
+        td["stringPosition"] = position_strings["stringPosition"]
 
-        # paper_color_X
-        td["paper_color_0"] = self.chart_colors_settings["paper_0"]
+        # paper_color_1
         if self.bg_color is not None:
             td["paper_color_1"] = self.bg_color
         else:
@@ -1349,19 +1315,6 @@ class KerykeionChartSVG:
         #background
         td["bg_image"] = self.bg_image
         
-        # planets_color_X
-        for i in range(len(self.planets_settings)):
-            planet_id = self.planets_settings[i]["id"]
-            td[f"planets_color_{planet_id}"] = self.planets_settings[i]["color"]
-
-        # zodiac_color_X
-        for i in range(12):
-            td[f"zodiac_color_{i}"] = self.chart_colors_settings[f"zodiac_icon_{i}"]
-
-        # orb_color_X
-        for i in range(len(self.aspects_settings)):
-            td[f"orb_color_{self.aspects_settings[i]['degree']}"] = self.aspects_settings[i]['color']
-
         # config
         td["cfgZoom"] = str(self.zoom)
         td["cfgRotate"] = rotate
@@ -1381,16 +1334,11 @@ class KerykeionChartSVG:
         """Creates the template for the SVG file"""
         td = self._createTemplateDictionary()
 
-        # read template
-        with open(self.xml_svg, "r", encoding="utf-8", errors="ignore") as output_file:
-            f = open(self.xml_svg)
-            template = Template(f.read()).substitute(td)
-
-        # return filename
+        # paper_color_0, planets_color_X, zodiac_color_X and orb_color_X
+        template = self.xml_template.substitute(td, **self.style.template_colors)
 
         logging.debug(f"Template dictionary keys: {td.keys()}")
 
-        self._createTemplateDictionary()
         return template.replace('"', "'")
 
     def makeSVG(self) -> None:
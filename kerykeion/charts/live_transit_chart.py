@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+from typing import Union
+from kerykeion.astrological_subject import AstrologicalSubject
+from kerykeion.charts.chart_renderer import ChartRenderer
+from kerykeion.charts.partner_charts import PartnerCharts
+
+
+class LiveTransitChart(PartnerCharts):
+    """
+    A transit chart that is drawn again when the transit subject changes, eg. every minute for the current sky.
+
+    The natal part of the chart (zodiac, degree rings, natal houses and planets, natal grids)
+    is drawn once, see PartnerCharts. update() only draws the transit layers: the transit house lines,
+    the aspects between the two subjects, the aspects grid and the transit points of the planet grid.
+    The transit planets are listed in the grid but, like in KerykeionChartSVG, not drawn on the wheel.
+
+    An instance is not thread-safe: use one for each thread or a lock around update().
+
+    Args:
+    - subject (AstrologicalSubject): The natal subject.
+    - transit_subject (AstrologicalSubject): The first transit subject.
+    - renderer (ChartRenderer, optional): The renderer with the settings and the style. Defaults to ChartRenderer().
+
+    Example:
+        >>> live = LiveTransitChart(natal, AstrologicalSubject("Now", 2024, 3, 1, 8, 0, "Roma", "IT"))
+        >>> svg = live.update(AstrologicalSubject("Now", 2024, 3, 1, 8, 1, "Roma", "IT"))
+        >>> fragment = live.overlay()
+    """
+
+    transit_subject: AstrologicalSubject
+
+    def __init__(
+        self,
+        subject: AstrologicalSubject,
+        transit_subject: AstrologicalSubject,
+        renderer: Union[ChartRenderer, None] = None,
+    ) -> None:
+        super().__init__(subject, "Transit", renderer)
+        self._set_transit_subject(transit_subject)
+
+    def _set_transit_subject(self, transit_subject: AstrologicalSubject) -> None:
+        self.transit_subject = transit_subject
+        self._layers = self._partner_layers(self._partner_chart(transit_subject))
+
+    def update(self, transit_subject: AstrologicalSubject) -> str:
+        """
+        Changes the transit subject and returns the SVG of the whole chart.
+        """
+        self._set_transit_subject(transit_subject)
+
+        return self.svg()
+
+    def svg(self) -> str:
+        """
+        Returns the SVG of the whole chart, the same of KerykeionChartSVG(subject, "Transit", transit_subject).
+        """
+        return self._svg(self._layers)
+
+    def overlay(self) -> str:
+        """
+        Returns only the transit layers, an SVG fragment positioned like in the whole chart,
+        to be swapped over the natal base.
+        """
+        out = '<g transform="translate(66 , 25) scale(1.08)">'
+        out += "".join(self._layers["houses"])
+        out += self._layers["aspects"]
+        out += "</g>"
+        out += '<g transform="translate(34 , 37)">'
+        out += self._layers["aspect_grid"]
+        out += "</g>"
+        out += '<g transform="translate(10 , 59)"><g transform="translate(50,550)">'
+        out += self._layers["planet_grid"]
+        out += "</g></g>"
+
+        return out.replace('"', "'")
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    natal = AstrologicalSubject("John", 1940, 10, 9, 10, 30, "Liverpool")
+    live = LiveTransitChart(natal, AstrologicalSubject("Now", 2024, 3, 1, 8, 0, "Liverpool"))
+
+    for minute in range(3):
+        svg = live.update(AstrologicalSubject("Now", 2024, 3, 1, 8, minute, "Liverpool"))
+        print(len(svg), len(live.overlay()))
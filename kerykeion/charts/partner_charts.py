@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Literal, TypedDict, Union
+from kerykeion.astrological_subject import AstrologicalSubject
+from kerykeion.charts.chart_renderer import ChartRenderer
+from kerykeion.charts.kerykeion_chart_svg import KerykeionChartSVG, CHART_RADIUS
+from kerykeion.kr_types import ChartPositionStrings
+
+
+class PartnerLayers(TypedDict):
+    """
+    The layers of the partner of a chart, see PartnerCharts.
+    """
+
+    houses: list[str]
+    aspects: str
+    aspect_grid: str
+    planet_grid: str
+    houses_grid: str
+    strings: ChartPositionStrings
+    title: str
+
+
+class PartnerCharts:
+    """
+    The Synastry or Transit charts of one subject with many partners.
+
+    The layers of the first subject (zodiac, degree rings, houses, planets, elements and grids)
+    are drawn once, every chart only draws the layers of its partner: the partner house lines,
+    the aspects between the two subjects, the aspects grid, the partner columns of the grids and the titles.
+    The shared state is never changed while drawing, so the charts can be drawn in parallel threads.
+
+    Args:
+    - subject (AstrologicalSubject): The first subject.
+    - chart_type ("Synastry" | "Transit", optional): The type of the charts. Defaults to "Synastry".
+    - renderer (ChartRenderer, optional): The renderer with the settings and the style. Defaults to ChartRenderer().
+    - max_workers (int, optional): The threads of render_all(), see ThreadPoolExecutor. Defaults to None.
+
+    Example:
+        >>> charts = PartnerCharts(AstrologicalSubject("John", 1940, 10, 9, 10, 30, "Liverpool"))
+        >>> for svg in charts.render_all(candidates):
+        ...     print(len(svg))
+    """
+
+    def __init__(
+        self,
+        subject: AstrologicalSubject,
+        chart_type: Literal["Synastry", "Transit"] = "Synastry",
+        renderer: Union[ChartRenderer, None] = None,
+        max_workers: Union[int, None] = None,
+    ) -> None:
+        self.subject = subject
+        self.chart_type = chart_type
+        self.renderer = renderer if renderer is not None else ChartRenderer()
+        self.max_workers = max_workers
+
+        # The subject is its own partner in the base, all the partner layers are replaced in every chart.
+        self._chart = self.renderer.chart(subject, chart_type, subject)
+        self._template_dictionary = self._chart._createTemplateDictionary()
+        self._natal_houses = self._chart._makeNatalHouses(CHART_RADIUS)
+        self._natal_planet_grid = self._chart._makeNatalPlanetGrid()
+        self._natal_houses_grid = self._chart._makeNatalHousesGrid()
+
+    def _partner_chart(self, partner: AstrologicalSubject) -> KerykeionChartSVG:
+        """
+        Returns a copy of the chart of the first subject with a partner.
+        """
+        chart = KerykeionChartSVG.__new__(KerykeionChartSVG)
+        chart.__dict__.update(self._chart.__dict__)
+        chart._set_second_subject(partner)
+
+        return chart
+
+    def _partner_layers(self, chart: KerykeionChartSVG) -> PartnerLayers:
+        """
+        Draws the layers of the partner of a chart.
+        """
+        r = CHART_RADIUS
+
+        layers: PartnerLayers = {
+            "houses": chart._makeTransitHouses(r),
+            "aspects": chart._makeAspectsTransit(r, (r - 160)),
+            "aspect_grid": chart._makeAspectTransitGrid(r),
+            "planet_grid": chart._makeTransitPlanetGrid(),
+            "houses_grid": chart._makeSecondHousesGrid() if self.chart_type == "Synastry" else "",
+            "strings": chart._makePositionStrings(),
+            "title": chart._makeTitle(),
+        }
+
+        return layers
+
+    def _svg(self, layers: PartnerLayers) -> str:
+        """
+        Returns the SVG of the first subject base with the layers of a partner.
+        """
+        td = self._template_dictionary.copy()
+        td["stringLat"] = layers["strings"]["stringLat"]
+        td["stringLon"] = layers["strings"]["stringLon"]
+        td["stringPosition"] = layers["strings"]["stringPosition"]
+        td["stringTitle"] = layers["title"]
+        td["makeHouses"] = "".join(partner + natal for partner, natal in zip(layers["houses"], self._natal_houses))
+        td["makeAspects"] = layers["aspects"]
+        td["makeAspectGrid"] = layers["aspect_grid"]
+        td["makePlanetGrid"] = self._natal_planet_grid + layers["planet_grid"] + "</g>"
+        td["makeHousesGrid"] = self._natal_houses_grid + layers["houses_grid"]
+
+        return self._chart.xml_template.substitute(td, **self._chart.style.template_colors).replace('"', "'")
+
+    def render(self, partner: AstrologicalSubject) -> str:
+        """
+        Returns the SVG of the chart with a partner, the same of KerykeionChartSVG(subject, chart_type, partner).
+        """
+        return self._svg(self._partner_layers(self._partner_chart(partner)))
+
+    def render_all(self, partners: Iterable[AstrologicalSubject]) -> Iterator[str]:
+        """
+        Yields the SVGs of the charts with the partners, in the same order, drawn in parallel threads.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(self.render, partners)
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    john = AstrologicalSubject("John", 1940, 10, 9, 10, 30, "Liverpool")
+    partners = [
+        AstrologicalSubject("Yoko", 1933, 2, 18, 10, 30, "Tokyo"),
+        AstrologicalSubject("Paul", 1942, 6, 18, 15, 30, "Liverpool"),
+    ]
+
+    for svg in PartnerCharts(john).render_all(partners):
+        print(len(svg))
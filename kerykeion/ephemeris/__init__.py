@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+This is part of Kerykeion (C) 2023 Giacomo Battaglia
+
+The ephemeris module contains the low level, subject independent
+ tools to work directly with the Swiss Ephemeris over time ranges.
+"""
+
+
+from .ephemeris_manager import EphemerisManager, EphemerisLockStats, get_ephemeris_manager
+from .ephemeris_series import ephemeris_series, EphemerisChunk
+from .transit_aspects_search import TransitAspectSearch, TransitAspectEvent
+from .ingress_index import IngressStationIndex
+from .lunar_calendar import lunar_calendar, LunarCalendar
+from .ephemeris_table import EphemerisTable, build_ephemeris_table, measure_table_error
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import logging
+import os
+import swisseph as swe
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from threading import RLock, local
+from time import perf_counter
+from typing import Iterator, Union
+from kerykeion.kr_types import KerykeionException, EphemerisBackend
+
+# The ephemeris files shipped with the package
+EPHEMERIS_PATH = Path(__file__).parent.parent.absolute() / "sweph"
+
+# Environment variable to use another directory of ephemeris files, eg. with the full sepl/semo set.
+EPHEMERIS_PATH_ENV = "KERYKEION_EPHEMERIS_PATH"
+
+# Prefixes of the Swiss Ephemeris files: planets, moon and asteroids (Chiron).
+EPHEMERIS_FILES_PREFIXES = {
+    "planets": "sepl",
+    "moon": "semo",
+    "asteroids": "seas",
+}
+
+# The sidereal mode of AstrologicalSubject
+DEFAULT_SIDEREAL_MODE = swe.SIDM_FAGAN_BRADLEY
+
+_manager: Union["EphemerisManager", None] = None
+_manager_lock = RLock()
+
+
+@dataclass
+class EphemerisLockStats:
+    """
+    Contention counters of the ephemeris lock.
+
+    Args:
+    - acquisitions (int): How many times the lock was taken.
+    - contended (int): How many of them had to wait for another thread.
+    - total_wait (float): The total waiting time, in seconds.
+    - max_wait (float): The longest wait, in seconds.
+    """
+
+    acquisitions: int
+    contended: int
+    total_wait: float
+    max_wait: float
+
+
+class EphemerisManager:
+    """
+    Configures the Swiss Ephemeris once per process and keeps track of the
+    backend used to compute every body.
+
+    The Swiss Ephemeris silently falls back to the Moshier analytical ephemeris
+    when the files of a body are missing: calc() reads the backend actually used
+    from the returned flags and records it, see backends_used.
+
+    The ephemeris path and the sidereal mode are global state of the Swiss Ephemeris.
+    Depending on how it is compiled that state is shared by all the threads or, like in
+    the pyswisseph wheels, kept per thread, so a path set by the main thread is unknown
+    to the threads of a server. Everything that depends on that state runs inside configured(),
+    which holds the lock of the manager and replays the configuration on the current
+    thread when it differs: a tropical and a sidereal subject computed by two threads
+    can't mix their settings, whatever the build.
+
+    Use get_ephemeris_manager() to get the manager of the process.
+
+    Args:
+    - ephemeris_path (Union[str, Path], optional): The directory of the ephemeris files.
+        Defaults to the KERYKEION_EPHEMERIS_PATH environment variable or to the files shipped with the package.
+    """
+
+    def __init__(self, ephemeris_path: Union[str, Path, None] = None) -> None:
+        self.ephemeris_path = Path(ephemeris_path or os.environ.get(EPHEMERIS_PATH_ENV) or EPHEMERIS_PATH)
+        self.initialized = False
+        self.backends_used: dict[int, EphemerisBackend] = {}
+
+        self._lock = RLock()
+        # Incremented at every change of the path, to replay it on the threads that have an older one.
+        self._path_version = 0
+        self._thread_state = local()
+
+        self._acquisitions = 0
+        self._contended = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @contextmanager
+    def configured(self, sidereal_mode: Union[int, None] = None) -> Iterator["EphemerisManager"]:
+        """
+        Holds the ephemeris lock, with the ephemeris path and the sidereal mode applied to the current thread.
+
+        Args:
+        - sidereal_mode (int, optional): The Swiss Ephemeris sidereal mode, eg. swe.SIDM_LAHIRI.
+            Required for the sidereal calculations. Defaults to None.
+        """
+        if not self._lock.acquire(blocking=False):
+            start = perf_counter()
+            self._lock.acquire()
+            wait = perf_counter() - start
+
+            self._contended += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+        self._acquisitions += 1
+        try:
+            self._initialize()
+
+            state = self._thread_state
+            if getattr(state, "path_version", None) != self._path_version:
+                swe.set_ephe_path(str(self.ephemeris_path))
+                state.path_version = self._path_version
+                state.sidereal_mode = None
+
+            if sidereal_mode is not None and state.sidereal_mode != sidereal_mode:
+                swe.set_sid_mode(sidereal_mode)
+                state.sidereal_mode = sidereal_mode
+
+            yield self
+
+        finally:
+            self._lock.release()
+
+    def lock_stats(self) -> EphemerisLockStats:
+        """
+        Returns the contention counters of the ephemeris lock.
+        """
+        with self._lock:
+            return EphemerisLockStats(self._acquisitions, self._contended, self._total_wait, self._max_wait)
+
+    def initialize(self) -> None:
+        """
+        Sets the ephemeris path on the current thread, if it is not already set.
+        """
+        with self.configured():
+            pass
+
+    def _initialize(self) -> None:
+        """
+        Checks the ephemeris directory, only once per path.
+        """
+        if self.initialized:
+            return
+
+        if not self.ephemeris_path.is_dir():
+            raise KerykeionException(f"The ephemeris directory {self.ephemeris_path} does not exist!")
+
+        self.initialized = True
+
+        files = self.available_files()
+        logging.debug(f"Ephemeris initialized from {self.ephemeris_path}: {files}")
+        if not files["planets"] or not files["moon"]:
+            logging.info(
+                f"No sepl/semo files in {self.ephemeris_path}, the planets and the Moon are computed with the Moshier ephemeris"
+            )
+
+    def set_ephemeris_path(self, ephemeris_path: Union[str, Path]) -> None:
+        """
+        Changes the directory of the ephemeris files, eg. to load the standard sepl/semo files.
+        """
+        with self._lock:
+            self.ephemeris_path = Path(ephemeris_path)
+            self.initialized = False
+            self._path_version += 1
+            self.backends_used.clear()
+            self.initialize()
+
+    def available_files(self) -> dict[str, list[str]]:
+        """
+        Returns the names of the ephemeris files in the ephemeris directory, grouped by kind.
+        """
+        return {
+            kind: sorted(file.name for file in self.ephemeris_path.glob(f"{prefix}*.se1"))
+            for kind, prefix in EPHEMERIS_FILES_PREFIXES.items()
+        }
+
+    def calc(
+        self,
+        julian_day: float,
+        body_number: int,
+        iflag: int,
+        backend: EphemerisBackend = "swieph",
+        sidereal_mode: Union[int, None] = None,
+    ) -> tuple[float, ...]:
+        """
+        Computes the position of a body with swe.calc, with the selected backend.
+        It is safe to call it from many threads.
+
+        Args:
+        - julian_day (float): The julian day.
+        - body_number (int): The Swiss Ephemeris id of the body.
+        - iflag (int): The swe.calc flags, the backend flag is replaced by the one of the backend.
+        - backend (EphemerisBackend, optional): "swieph" uses the ephemeris files, "moshier" the faster
+            and less precise analytical ephemeris. Defaults to "swieph".
+        - sidereal_mode (int, optional): The sidereal mode, used with swe.FLG_SIDEREAL.
+            Defaults to Fagan/Bradley, the one of AstrologicalSubject.
+
+        Returns:
+            tuple[float, ...]: The six values returned by swe.calc.
+        """
+        if backend not in ("swieph", "moshier"):
+            raise KerykeionException(f"Ephemeris backend not recognized: {backend}! Please use 'swieph' or 'moshier'")
+
+        if iflag & swe.FLG_SIDEREAL:
+            sidereal_mode = DEFAULT_SIDEREAL_MODE if sidereal_mode is None else sidereal_mode
+        else:
+            sidereal_mode = None
+
+        iflag = iflag & ~(swe.FLG_SWIEPH | swe.FLG_MOSEPH | swe.FLG_JPLEPH)
+        with self.configured(sidereal_mode):
+            if backend == "moshier":
+                try:
+                    position, retflag = swe.calc(julian_day, body_number, iflag | swe.FLG_MOSEPH)
+                except swe.Error:
+                    # Moshier has only the planets and the Moon, the asteroids need the files.
+                    position, retflag = swe.calc(julian_day, body_number, iflag | swe.FLG_SWIEPH)
+            else:
+                position, retflag = swe.calc(julian_day, body_number, iflag | swe.FLG_SWIEPH)
+
+            self.backends_used[body_number] = "moshier" if retflag & swe.FLG_MOSEPH else "swieph"
+
+        return position
+
+    def backend_report(self) -> dict[str, EphemerisBackend]:
+        """
+        Returns the backend last used for every body, keyed by body name.
+        """
+        with self._lock:
+            return {swe.get_planet_name(body_number): backend for body_number, backend in self.backends_used.items()}
+
+
+def get_ephemeris_manager() -> EphemerisManager:
+    """
+    Returns the ephemeris manager of the process, created the first time it is needed.
+    """
+    global _manager
+
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = EphemerisManager()
+
+    return _manager
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import logging
+import numpy as np
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, Union, Sequence
+from kerykeion.kr_types import ZodiacType, EphemerisPrecision
+from kerykeion.ephemeris.ephemeris_table import get_default_ephemeris_table
+from kerykeion.ephemeris.ephemeris_utils import (
+    DEFAULT_BODIES,
+    datetime_to_julian_day,
+    julian_day_to_datetime,
+    step_to_days,
+    get_body_number,
+    get_body_position,
+    get_ephemeris_flags,
+    set_default_ephemeris_path,
+    get_ayanamsa,
+)
+
+# Number of timestamps computed at once, 10k timestamps for 13 bodies is ~2MB.
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+@dataclass
+class EphemerisChunk:
+    """
+    A contiguous block of an ephemeris series.
+
+    Args:
+    - julian_days (np.ndarray): The julian days of the timestamps of the chunk.
+    - longitudes (dict[str, np.ndarray]): The ecliptic longitudes of every body, keyed by body name.
+    - speeds (dict[str, np.ndarray]): The daily speed in longitude of every body, keyed by body name.
+    """
+
+    julian_days: np.ndarray
+    longitudes: dict[str, np.ndarray]
+    speeds: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.julian_days)
+
+    def utc_datetimes(self) -> list[datetime]:
+        """
+        Returns the timestamps of the chunk as UTC datetimes.
+        """
+        return [julian_day_to_datetime(jd) for jd in self.julian_days]
+
+
+def ephemeris_series(
+    start: datetime,
+    end: datetime,
+    step: Union[timedelta, int, float],
+    bodies: Union[Sequence[Union[str, int]], None] = None,
+    zodiac_type: ZodiacType = "Tropic",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    precision: EphemerisPrecision = "full",
+) -> Iterator[EphemerisChunk]:
+    """
+    Streams the longitudes and speeds of the bodies between two dates,
+    without building an AstrologicalSubject for every timestamp.
+
+    The series is computed in chunks of at most chunk_size timestamps,
+    so the memory used is bounded whatever the length of the range.
+    The julian days are computed as in AstrologicalSubject, so the values
+    are the same you would get from a subject at the same UTC time.
+
+    Args:
+    - start (datetime): First timestamp of the series, naive datetimes are considered UTC.
+    - end (datetime): Last timestamp of the series (included if it falls on a step).
+    - step (Union[timedelta, int, float]): The distance between two timestamps, as a timedelta or in days.
+    - bodies (Sequence[Union[str, int]], optional): Names or Swiss Ephemeris ids of the bodies.
+        Defaults to all the points of AstrologicalSubject.
+    - zodiac_type (ZodiacType, optional): "Tropic" or "Sidereal". Defaults to "Tropic".
+    - chunk_size (int, optional): Maximum number of timestamps per chunk. Defaults to 10000.
+    - precision (EphemerisPrecision, optional): "full" computes every position with the Swiss Ephemeris,
+        "fast" interpolates the precomputed ephemeris table, see EphemerisTable. Defaults to "full".
+
+    Yields:
+        EphemerisChunk: The consecutive chunks of the series.
+
+    Example:
+        >>> for chunk in ephemeris_series(datetime(2024, 1, 1), datetime(2025, 1, 1), timedelta(hours=1), ["Moon"]):
+        ...     moon_longitudes = chunk.longitudes["Moon"]
+    """
+    if bodies is None:
+        bodies = DEFAULT_BODIES
+
+    body_numbers = {str(body): get_body_number(body) for body in bodies}
+    step_days = step_to_days(step)
+    set_default_ephemeris_path()
+    iflag = get_ephemeris_flags(zodiac_type)
+    table = get_default_ephemeris_table() if precision == "fast" else None
+
+    start_jd = datetime_to_julian_day(start)
+    end_jd = datetime_to_julian_day(end)
+    # A small tolerance avoids losing the last timestamp to floating point errors.
+    total = int(np.floor((end_jd - start_jd) / step_days + 1e-9)) + 1 if end_jd >= start_jd else 0
+
+    logging.debug(f"Ephemeris series: {total} timestamps for {len(body_numbers)} bodies")
+
+    for chunk_start in range(0, total, chunk_size):
+        indexes = np.arange(chunk_start, min(chunk_start + chunk_size, total), dtype=np.float64)
+        julian_days = start_jd + indexes * step_days
+
+        longitudes = {}
+        speeds = {}
+
+        if table is not None:
+            ayanamsa = np.array([get_ayanamsa(float(jd)) for jd in julian_days]) if zodiac_type == "Sidereal" else 0.0
+            for name, number in body_numbers.items():
+                body_longitudes, speeds[name] = table.positions(julian_days, number)
+                longitudes[name] = (body_longitudes - ayanamsa) % 360.0
+
+            yield EphemerisChunk(julian_days=julian_days, longitudes=longitudes, speeds=speeds)
+            continue
+
+        for name, number in body_numbers.items():
+            body_longitudes = np.empty(len(julian_days))
+            body_speeds = np.empty(len(julian_days))
+
+            for i, julian_day in enumerate(julian_days):
+                body_longitudes[i], body_speeds[i] = get_body_position(float(julian_day), number, iflag)
+
+            longitudes[name] = body_longitudes
+            speeds[name] = body_speeds
+
+        yield EphemerisChunk(julian_days=julian_days, longitudes=longitudes, speeds=speeds)
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    for chunk in ephemeris_series(datetime(2024, 1, 1), datetime(2024, 1, 2), timedelta(hours=6), ["Sun", "Moon"]):
+        print(chunk.utc_datetimes())
+        print(chunk.longitudes)
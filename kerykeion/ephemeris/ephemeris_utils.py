@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import numpy as np
+import pytz
+import swisseph as swe
+from datetime import datetime, timedelta
+from typing import Callable, Union
+from kerykeion.kr_types import KerykeionException, ZodiacType
+from kerykeion.utilities import get_number_from_name
+from kerykeion.celestial_points import DEFAULT_ACTIVE_POINTS
+from kerykeion.ephemeris.ephemeris_manager import EPHEMERIS_PATH, DEFAULT_SIDEREAL_MODE, get_ephemeris_manager
+
+# Precision of the root finding, one second in days
+ROOT_TOLERANCE = 1 / 86400
+
+# Sampling steps, in days, short enough to have at most one station
+# and less than a sign of motion between two samples of the same body.
+SAMPLING_STEPS = {
+    0: 5.0,  # Sun
+    1: 0.5,  # Moon
+    2: 1.0,  # Mercury
+    3: 2.0,  # Venus
+    4: 2.0,  # Mars
+    5: 5.0,  # Jupiter
+    6: 5.0,  # Saturn
+    7: 5.0,  # Uranus
+    8: 5.0,  # Neptune
+    9: 5.0,  # Pluto
+    10: 10.0,  # Mean Node
+    11: 0.5,  # True Node
+    15: 5.0,  # Chiron
+}
+
+DEFAULT_SAMPLING_STEP = 1.0
+
+# The points computed by default by AstrologicalSubject
+DEFAULT_BODIES = DEFAULT_ACTIVE_POINTS
+
+
+def set_default_ephemeris_path() -> None:
+    """
+    Sets the swisseph path to the ephemeris files, once per process, see EphemerisManager.
+    """
+    get_ephemeris_manager().initialize()
+
+
+def datetime_to_julian_day(dt: datetime) -> float:
+    """
+    Converts a datetime to a julian day.
+    Naive datetimes are considered to be already in UTC.
+
+    Args:
+        dt (datetime): The datetime to convert.
+
+    Returns:
+        float: The julian day.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(pytz.utc)
+
+    hours = dt.hour + dt.minute / 60 + (dt.second + dt.microsecond / 1e6) / 3600
+    return float(swe.julday(dt.year, dt.month, dt.day, hours))
+
+
+def julian_day_to_datetime(julian_day: float) -> datetime:
+    """
+    Converts a julian day to an aware UTC datetime.
+
+    Args:
+        julian_day (float): The julian day to convert.
+
+    Returns:
+        datetime: The UTC datetime.
+    """
+    year, month, day, hours = swe.revjul(julian_day)
+    return datetime(year, month, day, tzinfo=pytz.utc) + timedelta(hours=hours)
+
+
+def step_to_days(step: Union[timedelta, int, float]) -> float:
+    """
+    Converts a time step, given as a timedelta or as a number of days, to days.
+    """
+    if isinstance(step, timedelta):
+        days = step.total_seconds() / 86400
+    else:
+        days = float(step)
+
+    if days <= 0:
+        raise KerykeionException(f"The time step must be positive, got: {step}")
+
+    return days
+
+
+def get_body_number(body: Union[str, int]) -> int:
+    """
+    Returns the Swiss Ephemeris id of a body, given its name or its id.
+    """
+    if isinstance(body, int):
+        return body
+
+    return get_number_from_name(body)
+
+
+def get_ephemeris_flags(zodiac_type: ZodiacType = "Tropic") -> int:
+    """
+    Returns the swe.calc flags for the zodiac type, the same used by AstrologicalSubject.
+    The sidereal positions use the Fagan/Bradley sidereal mode, see get_body_position.
+    """
+    iflag = swe.FLG_SWIEPH + swe.FLG_SPEED
+
+    if zodiac_type == "Sidereal":
+        iflag += swe.FLG_SIDEREAL
+
+    elif zodiac_type != "Tropic":
+        raise KerykeionException("Zodiac type not recognized! Please use 'Tropic' or 'Sidereal'")
+
+    return iflag
+
+
+def get_body_position(julian_day: float, body_number: int, iflag: int) -> tuple[float, float]:
+    """
+    Returns the longitude and the daily speed in longitude of a body.
+    It goes through the ephemeris manager, so it is safe to call it from many threads.
+    """
+    position = get_ephemeris_manager().calc(julian_day, body_number, iflag)
+    return position[0], position[3]
+
+
+def wrap_degrees(degrees: float) -> float:
+    """
+    Normalizes an angle to the [-180, 180) range.
+    """
+    return (degrees + 180.0) % 360.0 - 180.0
+
+
+def find_root(
+    function: Callable[[float], tuple[float, Union[float, None]]],
+    start: float,
+    end: float,
+    start_value: float,
+    end_value: float,
+    tolerance: float = ROOT_TOLERANCE,
+    max_iterations: int = 60,
+) -> float:
+    """
+    Finds the root of a function inside a bracket where it changes sign.
+
+    The function returns its value and, if available, its derivative.
+    Newton steps are used when the derivative is known, secant steps otherwise;
+    every step falling outside the bracket is replaced by a bisection,
+    so the method always converges.
+
+    Args:
+        function (Callable): The function, returning a (value, derivative) tuple.
+        start (float): The start of the bracket.
+        end (float): The end of the bracket.
+        start_value (float): The value of the function at the start.
+        end_value (float): The value of the function at the end.
+        tolerance (float, optional): The width of the bracket to reach. Defaults to one second in days.
+        max_iterations (int, optional): Maximum number of evaluations. Defaults to 60.
+
+    Returns:
+        float: The root of the function.
+    """
+    if start_value == 0:
+        return start
+    if end_value == 0:
+        return end
+    if (start_value > 0) == (end_value > 0):
+        raise KerykeionException(f"The function does not change sign between {start} and {end}")
+
+    # Secant guess for the first evaluation
+    guess = start - start_value * (end - start) / (end_value - start_value)
+
+    for _ in range(max_iterations):
+        if not start < guess < end:
+            guess = (start + end) / 2
+
+        value, derivative = function(guess)
+
+        if value == 0:
+            return guess
+
+        if (value > 0) == (start_value > 0):
+            start, start_value = guess, value
+        else:
+            end, end_value = guess, value
+
+        if end - start < tolerance:
+            break
+
+        if derivative:
+            guess = guess - value / derivative
+        else:
+            guess = start - start_value * (end - start) / (end_value - start_value)
+
+    return (start + end) / 2
+
+
+def sample_body(
+    body_number: int,
+    start_julian_day: float,
+    end_julian_day: float,
+    position: Callable[[float], tuple[float, float]],
+    step: Union[float, None] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Samples the longitude and the speed of a body between two julian days,
+    with the step in SAMPLING_STEPS, or a custom one, and adds the stations to the samples,
+    so that between two consecutive samples the body always moves in the same direction.
+
+    Args:
+        body_number (int): The Swiss Ephemeris id of the body.
+        start_julian_day (float): The first julian day.
+        end_julian_day (float): The last julian day, always included.
+        position (Callable): Function returning the (longitude, speed) of the body at a julian day.
+        step (float, optional): The step in days. Defaults to the one in SAMPLING_STEPS.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The julian days, the longitudes and the speeds.
+    """
+    if step is None:
+        step = SAMPLING_STEPS.get(body_number, DEFAULT_SAMPLING_STEP)
+    julian_days = list(np.arange(start_julian_day, end_julian_day, step))
+    julian_days.append(end_julian_day)
+
+    sampled_days: list[float] = []
+    sampled_longitudes: list[float] = []
+    sampled_speeds: list[float] = []
+    for julian_day in julian_days:
+        longitude, speed = position(julian_day)
+
+        if sampled_speeds and (sampled_speeds[-1] > 0) != (speed > 0):
+            station = find_root(
+                lambda jd: (position(jd)[1], None),
+                sampled_days[-1],
+                julian_day,
+                sampled_speeds[-1],
+                speed,
+            )
+            station_longitude, station_speed = position(station)
+            sampled_days.append(station)
+            sampled_longitudes.append(station_longitude)
+            sampled_speeds.append(station_speed)
+
+        sampled_days.append(julian_day)
+        sampled_longitudes.append(longitude)
+        sampled_speeds.append(speed)
+
+    return np.array(sampled_days), np.array(sampled_longitudes), np.array(sampled_speeds)
+
+
+def hermite_interpolate(
+    offsets: np.ndarray,
+    step: float,
+    start_longitudes: np.ndarray,
+    start_speeds: np.ndarray,
+    end_longitudes: np.ndarray,
+    end_speeds: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cubic Hermite interpolation of longitudes between two samples, using the speeds as derivatives.
+    The passage from 360 to 0 degrees between the samples is handled.
+
+    Args:
+        offsets (np.ndarray): The distance, in days, of the instants from the first sample.
+        step (float): The distance, in days, between the two samples.
+        start_longitudes (np.ndarray): The longitudes at the first sample.
+        start_speeds (np.ndarray): The daily speeds at the first sample.
+        end_longitudes (np.ndarray): The longitudes at the second sample.
+        end_speeds (np.ndarray): The daily speeds at the second sample.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The interpolated longitudes, in [0, 360), and speeds.
+    """
+    s = np.asarray(offsets, dtype=np.float64) / step
+    s2 = s * s
+    s3 = s2 * s
+
+    p0 = np.asarray(start_longitudes, dtype=np.float64)
+    p1 = p0 + (np.asarray(end_longitudes, dtype=np.float64) - p0 + 180.0) % 360.0 - 180.0
+    m0 = np.asarray(start_speeds, dtype=np.float64) * step
+    m1 = np.asarray(end_speeds, dtype=np.float64) * step
+
+    longitudes = (2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * m0 + (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * m1
+    speeds = ((6 * s2 - 6 * s) * p0 + (3 * s2 - 4 * s + 1) * m0 + (-6 * s2 + 6 * s) * p1 + (3 * s2 - 2 * s) * m1) / step
+
+    return longitudes % 360.0, speeds
+
+
+def get_ayanamsa(julian_day: float, sidereal_mode: int = DEFAULT_SIDEREAL_MODE) -> float:
+    """
+    Returns the ayanamsa, nutation included, to subtract from a tropical longitude
+    computed with swe.calc to get the same sidereal longitude of swe.FLG_SIDEREAL.
+
+    Args:
+        julian_day (float): The julian day, the same passed to swe.calc.
+        sidereal_mode (int, optional): The Swiss Ephemeris sidereal mode. Defaults to Fagan/Bradley.
+    """
+    with get_ephemeris_manager().configured(sidereal_mode):
+        return swe.get_ayanamsa_ex(julian_day, swe.FLG_SWIEPH)[1]
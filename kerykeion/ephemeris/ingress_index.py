@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import logging
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Union, Sequence
+from kerykeion.kr_types import KerykeionException, ZodiacType
+from kerykeion.ephemeris.ephemeris_utils import (
+    DEFAULT_BODIES,
+    datetime_to_julian_day,
+    julian_day_to_datetime,
+    get_body_number,
+    get_body_position,
+    get_ephemeris_flags,
+    set_default_ephemeris_path,
+    wrap_degrees,
+    find_root,
+    sample_body,
+)
+
+STATION_DIRECT = 0
+STATION_RETROGRADE = 1
+
+
+def _offset_from(position: tuple[float, float], boundary: float) -> tuple[float, float]:
+    """
+    Returns the signed distance of a (longitude, speed) position from a boundary and its derivative.
+    """
+    longitude, speed = position
+    return wrap_degrees(longitude - boundary), speed
+
+
+class IngressStationIndex:
+    """
+    Precomputed index of the sign ingresses and of the stations of the bodies over a span of years.
+
+    The events are found once, with root finding on the longitude (ingresses) and
+    on the speed (stations), and stored in sorted arrays: every lookup is a
+    binary search instead of a new scan of the ephemeris.
+    The index can be saved to and loaded from a compressed NumPy file.
+
+    Build it with IngressStationIndex.build() or load it with IngressStationIndex.load().
+
+    Args:
+    - start_julian_day (float): Start of the indexed span.
+    - end_julian_day (float): End of the indexed span.
+    - zodiac_type (ZodiacType): The zodiac used to compute the longitudes.
+    - ingresses (dict[str, tuple[np.ndarray, np.ndarray]]): Julian days and entered sign number of the ingresses, by body.
+    - stations (dict[str, tuple[np.ndarray, np.ndarray]]): Julian days and kind (1 retrograde, 0 direct) of the stations, by body.
+    """
+
+    def __init__(
+        self,
+        start_julian_day: float,
+        end_julian_day: float,
+        zodiac_type: ZodiacType,
+        ingresses: dict[str, tuple[np.ndarray, np.ndarray]],
+        stations: dict[str, tuple[np.ndarray, np.ndarray]],
+    ) -> None:
+        self.start_julian_day = start_julian_day
+        self.end_julian_day = end_julian_day
+        self.zodiac_type = zodiac_type
+        self.ingresses = ingresses
+        self.stations = stations
+
+    @classmethod
+    def build(
+        cls,
+        start_year: int = 1900,
+        end_year: int = 2100,
+        bodies: Union[Sequence[str], None] = None,
+        zodiac_type: ZodiacType = "Tropic",
+    ) -> "IngressStationIndex":
+        """
+        Computes the index from the 1st of January of start_year to the 1st of January of end_year.
+        Building the default 1900-2100 span for all the bodies takes some time, save it and load it after.
+
+        Args:
+        - start_year (int, optional): First year of the index. Defaults to 1900.
+        - end_year (int, optional): Last year of the index, excluded. Defaults to 2100.
+        - bodies (Sequence[str], optional): The names of the bodies. Defaults to all the planets and points.
+        - zodiac_type (ZodiacType, optional): "Tropic" or "Sidereal". Defaults to "Tropic".
+        """
+        if bodies is None:
+            bodies = DEFAULT_BODIES
+
+        set_default_ephemeris_path()
+        iflag = get_ephemeris_flags(zodiac_type)
+        start_julian_day = datetime_to_julian_day(datetime(start_year, 1, 1))
+        end_julian_day = datetime_to_julian_day(datetime(end_year, 1, 1))
+
+        ingresses = {}
+        stations = {}
+        for body in bodies:
+            logging.debug(f"Indexing ingresses and stations of {body}")
+            body_number = get_body_number(body)
+            position = lambda jd: get_body_position(jd, body_number, iflag)
+            julian_days, longitudes, speeds = sample_body(body_number, start_julian_day, end_julian_day, position)
+
+            ingress_days = []
+            ingress_signs = []
+            station_days = []
+            station_kinds = []
+            signs = (longitudes // 30).astype(int)
+
+            for i in range(1, len(julian_days)):
+                if signs[i] != signs[i - 1]:
+                    # Moving forward the boundary is the start of the new sign, backward the start of the old one.
+                    forward = wrap_degrees(longitudes[i] - longitudes[i - 1]) > 0
+                    boundary = (signs[i] if forward else signs[i - 1]) * 30.0
+                    ingress_days.append(
+                        find_root(
+                            lambda jd: _offset_from(position(jd), boundary),
+                            julian_days[i - 1],
+                            julian_days[i],
+                            wrap_degrees(longitudes[i - 1] - boundary),
+                            wrap_degrees(longitudes[i] - boundary),
+                        )
+                    )
+                    ingress_signs.append(signs[i])
+
+                # The stations are already samples: the one of the pair with the speed closest to zero.
+                if (speeds[i - 1] > 0) != (speeds[i] > 0):
+                    station_days.append(julian_days[i] if abs(speeds[i]) <= abs(speeds[i - 1]) else julian_days[i - 1])
+                    station_kinds.append(STATION_RETROGRADE if speeds[i - 1] > 0 else STATION_DIRECT)
+
+            ingresses[body] = (np.array(ingress_days, dtype=np.float64), np.array(ingress_signs, dtype=np.int8))
+            stations[body] = (np.array(station_days, dtype=np.float64), np.array(station_kinds, dtype=np.int8))
+
+        return cls(start_julian_day, end_julian_day, zodiac_type, ingresses, stations)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Saves the index to a compressed NumPy (.npz) file.
+        """
+        arrays = {
+            "span": np.array([self.start_julian_day, self.end_julian_day]),
+            "zodiac_type": np.array(self.zodiac_type),
+            "bodies": np.array(list(self.ingresses.keys())),
+        }
+        for body in self.ingresses:
+            arrays[f"{body}_ingress_days"], arrays[f"{body}_ingress_signs"] = self.ingresses[body]
+            arrays[f"{body}_station_days"], arrays[f"{body}_station_kinds"] = self.stations[body]
+
+        np.savez_compressed(path, **arrays)
+        logging.info(f"Ingress and station index saved in {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "IngressStationIndex":
+        """
+        Loads an index saved with save().
+        """
+        with np.load(path) as data:
+            start_julian_day, end_julian_day = (float(value) for value in data["span"])
+            ingresses = {}
+            stations = {}
+            for body in data["bodies"]:
+                body = str(body)
+                ingresses[body] = (data[f"{body}_ingress_days"], data[f"{body}_ingress_signs"])
+                stations[body] = (data[f"{body}_station_days"], data[f"{body}_station_kinds"])
+
+            return cls(start_julian_day, end_julian_day, str(data["zodiac_type"]), ingresses, stations)  # type: ignore
+
+    def _get_julian_day(self, when: datetime) -> float:
+        julian_day = datetime_to_julian_day(when)
+        if not self.start_julian_day <= julian_day <= self.end_julian_day:
+            raise KerykeionException(f"{when} is outside of the span of the index!")
+
+        return julian_day
+
+    def _get_events(self, events: dict[str, tuple[np.ndarray, np.ndarray]], body: str) -> tuple[np.ndarray, np.ndarray]:
+        if body not in events:
+            raise KerykeionException(f"{body} is not in the index!")
+
+        return events[body]
+
+    def next_ingress(self, body: str, when: datetime) -> Union[tuple[datetime, int], None]:
+        """
+        Returns the datetime and the entered sign number of the first ingress of the body after a datetime,
+        None if there is no ingress before the end of the index.
+        """
+        days, signs = self._get_events(self.ingresses, body)
+        i = int(np.searchsorted(days, self._get_julian_day(when), side="right"))
+        if i == len(days):
+            return None
+
+        return julian_day_to_datetime(days[i]), int(signs[i])
+
+    def previous_ingress(self, body: str, when: datetime) -> Union[tuple[datetime, int], None]:
+        """
+        Returns the datetime and the entered sign number of the last ingress of the body before a datetime,
+        None if there is no ingress after the start of the index.
+        """
+        days, signs = self._get_events(self.ingresses, body)
+        i = int(np.searchsorted(days, self._get_julian_day(when), side="right")) - 1
+        if i < 0:
+            return None
+
+        return julian_day_to_datetime(days[i]), int(signs[i])
+
+    def ingresses_between(self, body: str, start: datetime, end: datetime) -> list[tuple[datetime, int]]:
+        """
+        Returns the datetimes and the entered sign numbers of all the ingresses of the body between two datetimes.
+        """
+        days, signs = self._get_events(self.ingresses, body)
+        first = int(np.searchsorted(days, self._get_julian_day(start), side="left"))
+        last = int(np.searchsorted(days, self._get_julian_day(end), side="right"))
+
+        return [(julian_day_to_datetime(days[i]), int(signs[i])) for i in range(first, last)]
+
+    def stations_between(self, body: str, start: datetime, end: datetime) -> list[tuple[datetime, str]]:
+        """
+        Returns the datetimes and the kind ("retrograde" or "direct") of all the stations of the body between two datetimes.
+        """
+        days, kinds = self._get_events(self.stations, body)
+        first = int(np.searchsorted(days, self._get_julian_day(start), side="left"))
+        last = int(np.searchsorted(days, self._get_julian_day(end), side="right"))
+
+        return [
+            (julian_day_to_datetime(days[i]), "retrograde" if kinds[i] == STATION_RETROGRADE else "direct")
+            for i in range(first, last)
+        ]
+
+    def next_station(self, body: str, when: datetime) -> Union[tuple[datetime, str], None]:
+        """
+        Returns the datetime and the kind of the first station of the body after a datetime,
+        None if there is no station before the end of the index.
+        """
+        days, kinds = self._get_events(self.stations, body)
+        i = int(np.searchsorted(days, self._get_julian_day(when), side="right"))
+        if i == len(days):
+            return None
+
+        return julian_day_to_datetime(days[i]), "retrograde" if kinds[i] == STATION_RETROGRADE else "direct"
+
+    def retrograde_period(self, body: str, when: datetime) -> Union[tuple[Union[datetime, None], Union[datetime, None]], None]:
+        """
+        Returns the start and the end of the retrograde period of the body containing a datetime,
+        None if the body is direct. The start or the end are None when they fall outside of the index.
+        """
+        days, kinds = self._get_events(self.stations, body)
+        i = int(np.searchsorted(days, self._get_julian_day(when), side="right"))
+
+        if i > 0:
+            is_retrograde = kinds[i - 1] == STATION_RETROGRADE
+        elif len(days) > 0:
+            is_retrograde = kinds[0] == STATION_DIRECT
+        else:
+            # Never stationary in the span, like the Sun or the Moon, or always retrograde, like the Mean Node.
+            _, speed = get_body_position(datetime_to_julian_day(when), get_body_number(body), get_ephemeris_flags(self.zodiac_type))
+            return (None, None) if speed < 0 else None
+
+        if not is_retrograde:
+            return None
+
+        start = julian_day_to_datetime(days[i - 1]) if i > 0 else None
+        end = julian_day_to_datetime(days[i]) if i < len(days) else None
+
+        return start, end
+
+    def is_retrograde(self, body: str, when: datetime) -> bool:
+        """
+        Returns True if the body is retrograde at the datetime.
+        """
+        return self.retrograde_period(body, when) is not None
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    index = IngressStationIndex.build(2020, 2030, ["Sun", "Mercury"])
+    print(index.next_ingress("Sun", datetime(2024, 3, 1)))
+    print(index.retrograde_period("Mercury", datetime(2024, 4, 10)))
+    print(index.stations_between("Mercury", datetime(2024, 1, 1), datetime(2025, 1, 1)))
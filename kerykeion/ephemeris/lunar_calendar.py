@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import numpy as np
+import pytz
+import swisseph as swe
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Union
+from kerykeion.kr_types import KerykeionException
+from kerykeion.utilities import LUNAR_PHASE_STEP, SUN_PHASE_BY_TEN_DEGREES, MOON_EMOJI_BY_PHASE
+from kerykeion.ephemeris.ephemeris_utils import (
+    datetime_to_julian_day,
+    julian_day_to_datetime,
+    get_body_position,
+    get_ephemeris_flags,
+    set_default_ephemeris_path,
+    wrap_degrees,
+    find_root,
+)
+
+_SUN_PHASE_BY_TEN_DEGREES = np.array(SUN_PHASE_BY_TEN_DEGREES)
+_MOON_EMOJI_BY_PHASE = np.array(MOON_EMOJI_BY_PHASE)
+
+
+@dataclass
+class LunarCalendar:
+    """
+    The lunar phases of every day of a date range, and the exact new and full moons in it.
+    The arrays have one value per day, in the same order of dates.
+
+    Args:
+    - dates (list[date]): The days of the calendar.
+    - degrees_between_s_m (np.ndarray): The anti-clockwise degrees between sun and moon.
+    - moon_phase (np.ndarray): The moon phase, from 1 to 28.
+    - sun_phase (np.ndarray): The sun phase, from 1 to 28.
+    - moon_emoji (np.ndarray): The emoji of the moon phase.
+    - new_moons (list[datetime]): The exact new moons, in the timezone of the calendar.
+    - full_moons (list[datetime]): The exact full moons, in the timezone of the calendar.
+    """
+
+    dates: list[date]
+    degrees_between_s_m: np.ndarray
+    moon_phase: np.ndarray
+    sun_phase: np.ndarray
+    moon_emoji: np.ndarray
+    new_moons: list[datetime]
+    full_moons: list[datetime]
+
+    def days(self) -> list[dict]:
+        """
+        Returns the calendar as a list of dictionaries, one per day, with the same keys
+        of the lunar phase of AstrologicalSubject and the new or full moon falling on that day, if any.
+        """
+        new_moons = {moment.date(): moment for moment in self.new_moons}
+        full_moons = {moment.date(): moment for moment in self.full_moons}
+
+        return [
+            {
+                "date": day,
+                "degrees_between_s_m": float(self.degrees_between_s_m[i]),
+                "moon_phase": int(self.moon_phase[i]),
+                "sun_phase": int(self.sun_phase[i]),
+                "moon_emoji": str(self.moon_emoji[i]),
+                "new_moon": new_moons.get(day),
+                "full_moon": full_moons.get(day),
+            }
+            for i, day in enumerate(self.dates)
+        ]
+
+
+def lunar_phases(degrees_between_s_m: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized version of the lunar phase of AstrologicalSubject.
+
+    Args:
+        degrees_between_s_m (np.ndarray): The anti-clockwise degrees between sun and moon.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The moon phases, the sun phases and the moon emojis.
+    """
+    degrees = np.asarray(degrees_between_s_m, dtype=np.float64)
+
+    phase_index = (degrees // LUNAR_PHASE_STEP).astype(int)
+    phase_index += degrees >= (phase_index + 1) * LUNAR_PHASE_STEP
+    moon_phase = np.minimum(phase_index, 27) + 1
+
+    sun_phase = _SUN_PHASE_BY_TEN_DEGREES[np.minimum((degrees // 10).astype(int), 35)]
+
+    return moon_phase, sun_phase, _MOON_EMOJI_BY_PHASE[moon_phase]
+
+
+def lunar_calendar(start: date, end: date, tz_str: str = "UTC", hour: int = 0) -> LunarCalendar:
+    """
+    Computes the lunar calendar from start to end, both included.
+
+    The phase of every day is the one at the given local hour; the phases are
+    computed in one vectorized pass over the daily sun and moon positions,
+    which are also used to bracket the new and full moons, refined with root finding.
+
+    Args:
+    - start (date): The first day of the calendar.
+    - end (date): The last day of the calendar.
+    - tz_str (str, optional): The timezone of the calendar. Defaults to "UTC".
+    - hour (int, optional): The local hour of the daily phase. Defaults to 0.
+
+    Returns:
+        LunarCalendar: The lunar calendar.
+    """
+    if end < start:
+        raise KerykeionException("The end of the calendar must not be before the start!")
+
+    timezone = pytz.timezone(tz_str)
+    set_default_ephemeris_path()
+    iflag = get_ephemeris_flags("Tropic")
+
+    # One sample more, the next day, to find the new and full moons of the last day.
+    dates = [start + timedelta(days=i) for i in range((end - start).days + 2)]
+    julian_days = np.array(
+        [datetime_to_julian_day(timezone.localize(datetime(day.year, day.month, day.day, hour), is_dst=False)) for day in dates]
+    )
+
+    sun = np.array([get_body_position(jd, swe.SUN, iflag) for jd in julian_days])
+    moon = np.array([get_body_position(jd, swe.MOON, iflag) for jd in julian_days])
+
+    degrees_between = (moon[:, 0] - sun[:, 0]) % 360.0
+    moon_phase, sun_phase, moon_emoji = lunar_phases(degrees_between)
+
+    def elongation(julian_day: float, target: float) -> tuple[float, float]:
+        sun_longitude, sun_speed = get_body_position(julian_day, swe.SUN, iflag)
+        moon_longitude, moon_speed = get_body_position(julian_day, swe.MOON, iflag)
+        return wrap_degrees(moon_longitude - sun_longitude - target), moon_speed - sun_speed
+
+    # The calendar covers the local days from start at 00:00 to end at 24:00.
+    first_julian_day = datetime_to_julian_day(timezone.localize(datetime(start.year, start.month, start.day), is_dst=False))
+    last_day = end + timedelta(days=1)
+    last_julian_day = datetime_to_julian_day(timezone.localize(datetime(last_day.year, last_day.month, last_day.day), is_dst=False))
+
+    events: dict[float, list[datetime]] = {0.0: [], 180.0: []}
+    for target, moments in events.items():
+        offsets = (degrees_between - target + 180.0) % 360.0 - 180.0
+        # The elongation always grows, so a sign change from negative to positive is a crossing of the target.
+        indexes = np.nonzero((offsets[:-1] < 0) & (offsets[1:] >= 0))[0]
+
+        # The day before the first sample is checked too, when the local hour is not midnight.
+        if hour > 0:
+            first_offset, _ = elongation(first_julian_day, target)
+            if first_offset < 0 <= offsets[0]:
+                root = find_root(lambda jd: elongation(jd, target), first_julian_day, julian_days[0], first_offset, offsets[0])
+                moments.append(julian_day_to_datetime(root).astimezone(timezone))
+
+        for i in indexes:
+            root = find_root(lambda jd: elongation(jd, target), julian_days[i], julian_days[i + 1], offsets[i], offsets[i + 1])
+            if first_julian_day <= root < last_julian_day:
+                moments.append(julian_day_to_datetime(root).astimezone(timezone))
+
+    return LunarCalendar(
+        dates=dates[:-1],
+        degrees_between_s_m=degrees_between[:-1],
+        moon_phase=moon_phase[:-1],
+        sun_phase=sun_phase[:-1],
+        moon_emoji=moon_emoji[:-1],
+        new_moons=events[0.0],
+        full_moons=events[180.0],
+    )
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    calendar = lunar_calendar(date(2024, 1, 1), date(2024, 1, 31), "Europe/Rome")
+    for day in calendar.days():
+        print(day)
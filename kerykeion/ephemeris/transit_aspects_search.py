@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import logging
+import numpy as np
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Union, Sequence
+from kerykeion.kr_types import KerykeionException, ZodiacType
+from kerykeion.settings.kerykeion_settings import get_settings
+from kerykeion.ephemeris.ephemeris_utils import (
+    DEFAULT_BODIES,
+    datetime_to_julian_day,
+    julian_day_to_datetime,
+    get_body_number,
+    get_body_position,
+    get_ephemeris_flags,
+    set_default_ephemeris_path,
+    wrap_degrees,
+    find_root,
+    sample_body,
+    SAMPLING_STEPS,
+    DEFAULT_SAMPLING_STEP,
+)
+
+# Margin on the highest speed found in the samples, the speed between two samples can be a bit higher.
+MAX_SPEED_MARGIN = 1.1
+
+if TYPE_CHECKING:
+    from kerykeion.astrological_subject import AstrologicalSubject
+
+
+@dataclass
+class TransitAspectEvent:
+    """
+    A period in which a moving body is in aspect, within the orb, to a fixed point.
+    With retrograde motion the aspect can be exact more than once in the same period.
+
+    Args:
+    - body (str): The moving body.
+    - natal_point (str): The name of the fixed point.
+    - natal_longitude (float): The longitude of the fixed point.
+    - aspect (str): The name of the aspect.
+    - aspect_degrees (float): The degrees of the aspect.
+    - orb (float): The orb used to find the entry and the exit.
+    - entry_julian_day (float, optional): When the body enters the orb, None if already in orb at the start of the search.
+    - exact_julian_days (list[float]): When the aspect is exact.
+    - exit_julian_day (float, optional): When the body leaves the orb, None if still in orb at the end of the search.
+    """
+
+    body: str
+    natal_point: str
+    natal_longitude: float
+    aspect: str
+    aspect_degrees: float
+    orb: float
+    entry_julian_day: Union[float, None] = None
+    exact_julian_days: list[float] = field(default_factory=list)
+    exit_julian_day: Union[float, None] = None
+
+    @property
+    def entry(self) -> Union[datetime, None]:
+        return julian_day_to_datetime(self.entry_julian_day) if self.entry_julian_day is not None else None
+
+    @property
+    def exact(self) -> list[datetime]:
+        return [julian_day_to_datetime(jd) for jd in self.exact_julian_days]
+
+    @property
+    def exit(self) -> Union[datetime, None]:
+        return julian_day_to_datetime(self.exit_julian_day) if self.exit_julian_day is not None else None
+
+    @property
+    def start_julian_day(self) -> float:
+        """
+        The first known instant of the event, used to sort the events.
+        """
+        for julian_day in (self.entry_julian_day, *self.exact_julian_days, self.exit_julian_day):
+            if julian_day is not None:
+                return julian_day
+
+        raise KerykeionException("Empty transit aspect event")
+
+
+class TransitAspectSearch:
+    """
+    Finds when moving bodies are in aspect to fixed points, like the points of a natal chart,
+    between two dates.
+
+    Every body is sampled once for the whole range, with a step depending on its speed,
+    and the stations are located and added to the samples, so that between two samples
+    the body moves always in the same direction. When the body can move more than the orb
+    in one step, eg. the Moon, it is sampled again with the step capped at orb / max speed. The samples are shared by all the
+    fixed points and aspects: for every one of them the sign changes of
+    (separation - aspect angle) and of (separation - aspect angle -/+ orb) are bracketed
+    on the samples, then refined with Newton steps using the speeds returned by swe.calc.
+
+    Args:
+    - start (datetime): Start of the search, naive datetimes are considered UTC.
+    - end (datetime): End of the search, naive datetimes are considered UTC.
+    - zodiac_type (ZodiacType, optional): "Tropic" or "Sidereal". Defaults to "Tropic".
+    """
+
+    def __init__(self, start: datetime, end: datetime, zodiac_type: ZodiacType = "Tropic") -> None:
+        self.start_julian_day = datetime_to_julian_day(start)
+        self.end_julian_day = datetime_to_julian_day(end)
+
+        if self.end_julian_day <= self.start_julian_day:
+            raise KerykeionException("The end of the search must be after the start!")
+
+        self.zodiac_type = zodiac_type
+        self.ephemeris_calls = 0
+
+        set_default_ephemeris_path()
+        self._iflag = get_ephemeris_flags(zodiac_type)
+        self._samples: dict[tuple[int, float], tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def _position(self, body_number: int, julian_day: float) -> tuple[float, float]:
+        self.ephemeris_calls += 1
+        return get_body_position(julian_day, body_number, self._iflag)
+
+    def _sample(self, body_number: int, step: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        key = (body_number, step)
+        if key not in self._samples:
+            self._samples[key] = sample_body(
+                body_number,
+                self.start_julian_day,
+                self.end_julian_day,
+                lambda jd: self._position(body_number, jd),
+                step,
+            )
+
+        return self._samples[key]
+
+    def _get_samples(self, body_number: int, orb: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the julian days, longitudes and speeds sampled for the body, stations included,
+        with a step short enough that the body moves less than the orb between two samples.
+        """
+        step = SAMPLING_STEPS.get(body_number, DEFAULT_SAMPLING_STEP)
+        samples = self._sample(body_number, step)
+
+        max_speed = float(np.abs(samples[2]).max()) * MAX_SPEED_MARGIN
+        if max_speed * step <= orb:
+            return samples
+
+        return self._sample(body_number, orb / max_speed)
+
+    def find_aspect(
+        self,
+        body: Union[str, int],
+        natal_longitude: float,
+        aspect_degrees: float,
+        orb: float = 1.0,
+        natal_point: str = "",
+        aspect_name: str = "",
+    ) -> list[TransitAspectEvent]:
+        """
+        Finds the periods in which a body is in aspect to a fixed longitude.
+
+        Args:
+        - body (Union[str, int]): Name or Swiss Ephemeris id of the moving body.
+        - natal_longitude (float): The absolute longitude of the fixed point.
+        - aspect_degrees (float): The angle of the aspect, eg. 90 for the square.
+        - orb (float, optional): The orb for the entry and the exit. Defaults to 1.0.
+        - natal_point (str, optional): Name of the fixed point, stored in the events.
+        - aspect_name (str, optional): Name of the aspect, stored in the events.
+
+        Returns:
+            list[TransitAspectEvent]: The events sorted by time.
+        """
+        body_number = get_body_number(body)
+        # Both the waxing and the waning sides of the aspect, only one for conjunction and opposition.
+        targets = {round((natal_longitude + aspect_degrees) % 360, 9), round((natal_longitude - aspect_degrees) % 360, 9)}
+
+        events = []
+        for target in targets:
+            for entry, exacts, exit in self._find_windows(body_number, target, orb):
+                events.append(
+                    TransitAspectEvent(
+                        body=str(body),
+                        natal_point=natal_point,
+                        natal_longitude=natal_longitude,
+                        aspect=aspect_name,
+                        aspect_degrees=aspect_degrees,
+                        orb=orb,
+                        entry_julian_day=entry,
+                        exact_julian_days=exacts,
+                        exit_julian_day=exit,
+                    )
+                )
+
+        events.sort(key=lambda event: event.start_julian_day)
+        return events
+
+    def _find_windows(self, body_number: int, target: float, orb: float) -> list[tuple]:
+        """
+        Returns the (entry, exacts, exit) tuples of the body around the target longitude.
+        """
+        julian_days, longitudes, speeds = self._get_samples(body_number, orb)
+        offsets = (longitudes - target + 180.0) % 360.0 - 180.0
+        # Excludes the jump from +180 to -180 on the opposite side of the target.
+        continuous = np.abs(np.diff(offsets)) < 180.0
+
+        crossings = []
+        for level in (-orb, 0.0, orb):
+            values = offsets - level
+            indexes = np.nonzero(((values[:-1] > 0) != (values[1:] > 0)) & continuous)[0]
+
+            for i in indexes:
+                julian_day = find_root(
+                    lambda jd: self._offset(body_number, jd, target, level),
+                    julian_days[i],
+                    julian_days[i + 1],
+                    values[i],
+                    values[i + 1],
+                )
+                # At the orb levels, an entry when |offset| decreases through the level, else an exit.
+                if level == 0.0:
+                    kind = "exact"
+                elif (values[i] > 0) == (level > 0):
+                    kind = "entry"
+                else:
+                    kind = "exit"
+
+                crossings.append((julian_day, kind))
+
+        crossings.sort()
+
+        windows = []
+        current: Union[list, None] = [None, [], None] if abs(offsets[0]) <= orb else None
+        for julian_day, kind in crossings:
+            if kind == "entry":
+                current = [julian_day, [], None]
+            elif current is None:
+                logging.debug(f"Crossing outside of the orb for body {body_number} at {julian_day}")
+            elif kind == "exact":
+                current[1].append(julian_day)
+            else:
+                current[2] = julian_day
+                windows.append(tuple(current))
+                current = None
+
+        if current is not None:
+            windows.append(tuple(current))
+
+        return windows
+
+    def _offset(self, body_number: int, julian_day: float, target: float, level: float) -> tuple[float, float]:
+        longitude, speed = self._position(body_number, julian_day)
+        return wrap_degrees(longitude - target) - level, speed
+
+    def find_transits_to_natal(
+        self,
+        natal_subject: "AstrologicalSubject",
+        bodies: Union[Sequence[Union[str, int]], None] = None,
+        orb: float = 1.0,
+        new_settings_file: Union[Path, None] = None,
+    ) -> list[TransitAspectEvent]:
+        """
+        Finds all the transits of the bodies to the active points of a natal chart,
+        for all the active aspects in the settings.
+
+        Args:
+        - natal_subject (AstrologicalSubject): The natal chart.
+        - bodies (Sequence[Union[str, int]], optional): The transiting bodies. Defaults to all the planets and points.
+        - orb (float, optional): The orb for the entry and the exit. Defaults to 1.0.
+        - new_settings_file (Path, optional): The settings file. Defaults to None.
+
+        Returns:
+            list[TransitAspectEvent]: The events sorted by time.
+        """
+        settings = get_settings(new_settings_file)
+
+        if bodies is None:
+            bodies = DEFAULT_BODIES
+
+        natal_points = []
+        for point in settings["celestial_points"]:
+            natal_point = natal_subject.get(point["name"].lower())
+            if point["is_active"] and natal_point is not None:
+                natal_points.append(natal_point)
+
+        events = []
+        for body in bodies:
+            for natal_point in natal_points:
+                for aspect in settings["aspects"]:
+                    if not aspect["is_active"]:
+                        continue
+
+                    events += self.find_aspect(
+                        body,
+                        natal_point["abs_pos"],
+                        aspect["degree"],
+                        orb,
+                        natal_point=natal_point["name"],
+                        aspect_name=aspect["name"],
+                    )
+
+        events.sort(key=lambda event: event.start_julian_day)
+        return events
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    search = TransitAspectSearch(datetime(2024, 1, 1), datetime(2026, 1, 1))
+    # Saturn square to a Sun in 10° Gemini
+    for event in search.find_aspect("Saturn", 70.0, 90, orb=1.0, natal_point="Sun", aspect_name="square"):
+        print(event.entry, event.exact, event.exit)
+
+    # Moon square to the same Sun: the Moon crosses the whole orb in a few hours,
+    # every window must have its entry, its exact time and its exit.
+    moon_search = TransitAspectSearch(datetime(2024, 1, 1), datetime(2024, 3, 1))
+    for event in moon_search.find_aspect("Moon", 70.0, 90, orb=1.0, natal_point="Sun", aspect_name="square"):
+        if event.entry_julian_day is None or not event.exact_julian_days or event.exit_julian_day is None:
+            raise KerykeionException(f"Incomplete Moon window: {event}")
+        print(event.entry, event.exact, event.exit)
+
+    print(f"Ephemeris calls: {search.ephemeris_calls + moon_search.ephemeris_calls}")
@@ -1,5 +1,5 @@
 from .kerykeion_exception import KerykeionException
 from .kr_literals import *
 from .kr_models import *
-from .chart_types import ChartTemplateDictionary
+from .chart_types import ChartTemplateDictionary, ChartPositionStrings
 from .settings_models import KerykeionSettingsModel
@@ -1,7 +1,15 @@
 from typing import TypedDict
 
 
+class ChartPositionStrings(TypedDict):
+    stringLat: str
+    stringLon: str
+    stringPosition: str
+
+
 class ChartTemplateDictionary(TypedDict):
+    # The color slots that depend only on the settings, paper_color_0, planets_color_N,
+    # zodiac_color_N and orb_color_N, are substituted from ChartStyle.template_colors.
     transitRing: str
     degreeRing: str
     c1: str
@@ -40,47 +48,7 @@ class ChartTemplateDictionary(TypedDict):
     ystringLat: str
     ystringLon: str
     stringPosition: str
-    paper_color_0: str
     paper_color_1: str
-    planets_color_0: str
-    planets_color_1: str
-    planets_color_2: str
-    planets_color_3: str
-    planets_color_4: str
-    planets_color_5: str
-    planets_color_6: str
-    planets_color_7: str
-    planets_color_8: str
-    planets_color_9: str
-    planets_color_10: str
-    planets_color_11: str
-    planets_color_12: str
-    planets_color_13: str
-    planets_color_14: str
-    planets_color_15: str
-    zodiac_color_0: str
-    zodiac_color_1: str
-    zodiac_color_2: str
-    zodiac_color_3: str
-    zodiac_color_4: str
-    zodiac_color_5: str
-    zodiac_color_6: str
-    zodiac_color_7: str
-    zodiac_color_8: str
-    zodiac_color_9: str
-    zodiac_color_10: str
-    zodiac_color_11: str
-    orb_color_0: str
-    orb_color_30: str
-    orb_color_45: str
-    orb_color_60: str
-    orb_color_72: str
-    orb_color_90: str
-    orb_color_120: str
-    orb_color_135: str
-    orb_color_144: str
-    orb_color_150: str
-    orb_color_180: str
     cfgZoom: str
     cfgRotate: str
     cfgTranslate: str
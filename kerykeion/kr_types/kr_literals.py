@@ -9,6 +9,39 @@ from typing import Literal
 # Zodiac Types:
 ZodiacType = Literal["Tropic", "Sidereal"]
 
+# Sidereal modes (ayanamsas), the names of the Swiss Ephemeris SIDM_ constants:
+SiderealMode = Literal[
+    "FAGAN_BRADLEY",
+    "LAHIRI",
+    "DELUCE",
+    "RAMAN",
+    "USHASHASHI",
+    "KRISHNAMURTI",
+    "DJWHAL_KHUL",
+    "YUKTESHWAR",
+    "JN_BHASIN",
+    "SASSANIAN",
+]
+
+# Ephemeris precision, "fast" reads the precomputed ephemeris table, "moshier" uses the analytical ephemeris:
+EphemerisPrecision = Literal["full", "fast", "moshier"]
+
+# Policies for the local times repeated or skipped by the daylight saving time changes:
+AmbiguousTimePolicy = Literal["raise", "earlier", "later"]
+NonexistentTimePolicy = Literal["raise", "shift_forward", "shift_backward"]
+
+# Swiss Ephemeris backends, the ephemeris files or the Moshier analytical ephemeris:
+EphemerisBackend = Literal["swieph", "moshier"]
+
+# Angles of the astrocartography lines: rising, setting, upper and lower culmination:
+AstrocartographyAngle = Literal["ASC", "DSC", "MC", "IC"]
+
+# What changes between two instants of a rectification sweep, the sign of an angle or a cusp or the house of a planet:
+RectificationChangeKind = Literal["sign", "house"]
+
+# Aspect patterns, see kerykeion.aspects.aspect_patterns:
+AspectPatternName = Literal["Grand_Trine", "T_Square", "Grand_Cross", "Yod", "Kite", "Stellium"]
+
 # Sings:
 Sign = Literal[
     "Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis"
@@ -43,8 +76,16 @@ Planet = Literal[
     "Mean_Node",
     "True_Node",
     "Chiron",
+    "Mean_Lilith",
+    "Ceres",
+    "Pallas",
+    "Juno",
+    "Vesta",
 ]
 
+# Kinds of celestial points, see kerykeion.celestial_points:
+CelestialPointCategory = Literal["Luminary", "Planet", "Lunar_Node", "Lunar_Apogee", "Asteroid"]
+
 Element = Literal["Air", "Fire", "Earth", "Water"]
 
 Quality = Literal[
@@ -67,7 +67,7 @@ class KerykeionPointModel(BaseModel):
     abs_pos: float
     emoji: str
     point_type: Literal["Planet", "House"]
-    house: Optional[Literal[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]] = None
+    house: Optional[Houses] = None
     retrograde: Optional[bool] = None
 
     def __str__(self):
@@ -121,22 +121,28 @@ class AstrologicalSubjectModel(BaseModel):
     lat: float
     tz_str: str
     zodiac_type: ZodiacType
+    sidereal_mode: Optional[SiderealMode] = None
     local_time: float
     utc_time: float
     julian_day: float
 
-    # Planets
-    sun: KerykeionPointModel
-    moon: KerykeionPointModel
-    mercury: KerykeionPointModel
-    venus: KerykeionPointModel
-    mars: KerykeionPointModel
-    jupiter: KerykeionPointModel
-    saturn: KerykeionPointModel
-    uranus: KerykeionPointModel
-    neptune: KerykeionPointModel
-    pluto: KerykeionPointModel
-    chiron: KerykeionPointModel
+    # Planets, None when not active
+    sun: Optional[KerykeionPointModel] = None
+    moon: Optional[KerykeionPointModel] = None
+    mercury: Optional[KerykeionPointModel] = None
+    venus: Optional[KerykeionPointModel] = None
+    mars: Optional[KerykeionPointModel] = None
+    jupiter: Optional[KerykeionPointModel] = None
+    saturn: Optional[KerykeionPointModel] = None
+    uranus: Optional[KerykeionPointModel] = None
+    neptune: Optional[KerykeionPointModel] = None
+    pluto: Optional[KerykeionPointModel] = None
+    chiron: Optional[KerykeionPointModel] = None
+    mean_lilith: Optional[KerykeionPointModel] = None
+    ceres: Optional[KerykeionPointModel] = None
+    pallas: Optional[KerykeionPointModel] = None
+    juno: Optional[KerykeionPointModel] = None
+    vesta: Optional[KerykeionPointModel] = None
 
     # Houses
     first_house: KerykeionPointModel
@@ -153,11 +159,14 @@ class AstrologicalSubjectModel(BaseModel):
     twelfth_house: KerykeionPointModel
 
     # Nodes
-    mean_node: KerykeionPointModel
-    true_node: KerykeionPointModel
+    mean_node: Optional[KerykeionPointModel] = None
+    true_node: Optional[KerykeionPointModel] = None
 
-    # Lunar Phase
-    lunar_phase: LunarPhaseModel
+    # Lunar Phase, None without the Sun or the Moon
+    lunar_phase: Optional[LunarPhaseModel] = None
+
+    # The computed celestial points
+    active_points: Optional[list[Planet]] = None
 
 
 if __name__ == "__main__":
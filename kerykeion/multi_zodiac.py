@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import swisseph as swe
+from typing import Sequence, Union, get_args
+from kerykeion.astrological_subject import AstrologicalSubject
+from kerykeion.ephemeris.ephemeris_utils import get_ayanamsa
+from kerykeion.kr_types import KerykeionException, SiderealMode
+
+
+class MultiZodiacSubject:
+    """
+    The same chart in the tropical zodiac and in many sidereal zodiacs.
+
+    The sidereal zodiacs differ from the tropical one only by the ayanamsa, a rotation of
+    all the longitudes: the planets and the houses are computed once, in the tropical subject,
+    and every sidereal variant subtracts its ayanamsa from them, without calling the ephemeris again.
+    The variants are the same as AstrologicalSubject with zodiac_type="Sidereal" and their sidereal_mode.
+
+    Args:
+    - subject (AstrologicalSubject): The tropical subject.
+    - sidereal_modes (Sequence[SiderealMode], optional): The sidereal zodiacs. Defaults to all of them.
+
+    Example:
+        >>> subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+        >>> zodiacs = MultiZodiacSubject(subject, ["LAHIRI", "FAGAN_BRADLEY"])
+        >>> zodiacs["LAHIRI"].sun
+    """
+
+    tropical: AstrologicalSubject
+    sidereal: dict[SiderealMode, AstrologicalSubject]
+    ayanamsas: dict[SiderealMode, float]
+
+    def __init__(self, subject: AstrologicalSubject, sidereal_modes: Union[Sequence[SiderealMode], None] = None) -> None:
+        if subject.zodiac_type != "Tropic":
+            raise KerykeionException("The subject of a MultiZodiacSubject must be in the tropical zodiac!")
+
+        if sidereal_modes is None:
+            sidereal_modes = get_args(SiderealMode)
+
+        self.tropical = subject
+        self.sidereal = {}
+        self.ayanamsas = {}
+
+        for sidereal_mode in sidereal_modes:
+            if sidereal_mode not in get_args(SiderealMode):
+                raise KerykeionException(f"Sidereal mode not recognized: {sidereal_mode}!")
+
+            self.ayanamsas[sidereal_mode] = get_ayanamsa(subject.julian_day, getattr(swe, f"SIDM_{sidereal_mode}"))
+            self.sidereal[sidereal_mode] = self._sidereal_subject(sidereal_mode, self.ayanamsas[sidereal_mode])
+
+    def __getitem__(self, sidereal_mode: SiderealMode) -> AstrologicalSubject:
+        return self.sidereal[sidereal_mode]
+
+    def __iter__(self):
+        return iter(self.sidereal)
+
+    def __len__(self) -> int:
+        return len(self.sidereal)
+
+    def __repr__(self) -> str:
+        return f"MultiZodiacSubject({self.tropical.name}, {', '.join(self.sidereal)})"
+
+    def _sidereal_subject(self, sidereal_mode: SiderealMode, ayanamsa: float) -> AstrologicalSubject:
+        """
+        Returns a copy of the tropical subject rotated by the ayanamsa.
+        The copy is built without __init__, so also a cached snapshot can be used as tropical subject.
+        """
+        subject = AstrologicalSubject.__new__(AstrologicalSubject)
+        subject.__dict__.update(self.tropical.__dict__)
+
+        subject.zodiac_type = "Sidereal"
+        subject.sidereal_mode = sidereal_mode
+        subject.planets_degrees_ut = [(degree - ayanamsa) % 360 for degree in self.tropical.planets_degrees_ut]
+        subject.houses_degree_ut = [(degree - ayanamsa) % 360 for degree in self.tropical.houses_degree_ut]
+
+        subject._planets()
+        subject._houses_positions()
+        subject._planets_in_houses()
+        subject._lunar_phase_calc()
+
+        return subject
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+    zodiacs = MultiZodiacSubject(subject, ["LAHIRI", "FAGAN_BRADLEY"])
+    for mode in zodiacs:
+        print(mode, zodiacs.ayanamsas[mode], zodiacs[mode].sun)
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import numpy as np
+import pytz
+import swisseph as swe
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Union, get_args
+from kerykeion.astrological_subject import AstrologicalSubject, HOUSES_NAMES
+from kerykeion.celestial_points import get_celestial_point
+from kerykeion.ephemeris.ephemeris_manager import get_ephemeris_manager
+from kerykeion.ephemeris.ephemeris_table import get_default_ephemeris_table
+from kerykeion.ephemeris.ephemeris_utils import get_ayanamsa, hermite_interpolate
+from kerykeion.kr_types import (
+    KerykeionException,
+    AmbiguousTimePolicy,
+    NonexistentTimePolicy,
+    Sign,
+    RectificationChangeKind,
+    EphemerisBackend,
+    EphemerisPrecision,
+)
+from kerykeion.timezones import local_to_utc_array
+from kerykeion.utilities import calculate_houses_indexes
+
+# Distance, in days, between the ephemeris samples interpolated for the minutes in between.
+# With 6 hours the interpolation error stays below 0.01" also for the Moon,
+# only the short period wobbles of the True Node reach ~1.5".
+INTERPOLATION_STEP = 0.25
+
+# Julian day of 1970-01-01 00:00 UTC
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+_MICROSECONDS_PER_DAY = 86400 * 10**6
+
+SIGNS: tuple[Sign, ...] = get_args(Sign)
+
+
+@dataclass
+class RectificationChange:
+    """
+    A change of the chart from one minute of the sweep to the next one.
+
+    Args:
+    - local_datetime (datetime): The first local time with the new value.
+    - point (str): The point that changed: "Ascendant", "Medium_Coeli", a house or a planet.
+    - kind (RectificationChangeKind): "sign" when the point changed sign, "house" when a planet changed house.
+    - previous (str): The sign or the house before.
+    - current (str): The sign or the house after.
+    """
+
+    local_datetime: datetime
+    point: str
+    kind: RectificationChangeKind
+    previous: str
+    current: str
+
+
+class RectificationSweep:
+    """
+    The chart of a subject at every minute of its birth day, for the birth time rectification.
+
+    The place and the timezone are the ones of the subject, already resolved, and the local times
+    are converted to UTC all at once. The planets are computed by the ephemeris only every 6 hours,
+    with the precision of the subject ("fast" reads them from the ephemeris table),
+    and interpolated for the minutes in between, the house cusps are computed for every minute from
+    the sidereal time, with swe.houses_armc. The result are arrays with one row per minute
+    and the list of the changes of signs of the angles and of the cusps and of the houses of the planets.
+
+    Args:
+    - subject (AstrologicalSubject): The subject, with the place and the day to sweep.
+    - step_minutes (int, optional): The distance between two instants of the sweep, in minutes. Defaults to 1.
+    - ambiguous (AmbiguousTimePolicy, optional): For the local times repeated when the clocks are
+        moved back, see local_to_utc. Defaults to "earlier".
+    - nonexistent (NonexistentTimePolicy, optional): For the local times skipped when the clocks are
+        moved forward, see local_to_utc. Defaults to "shift_forward".
+
+    Example:
+        >>> subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+        >>> sweep = RectificationSweep(subject)
+        >>> for change in sweep.changes:
+        ...     print(change.local_datetime, change.point, change.previous, change.current)
+    """
+
+    subject: AstrologicalSubject
+    local_datetimes: np.ndarray
+    utc_datetimes: np.ndarray
+    julian_days: np.ndarray
+    planets_degrees_ut: np.ndarray
+    planets_speeds: np.ndarray
+    houses_degree_ut: np.ndarray
+    ascendants: np.ndarray
+    medium_coeli: np.ndarray
+    planets_houses: np.ndarray
+    changes: list[RectificationChange]
+
+    def __init__(
+        self,
+        subject: AstrologicalSubject,
+        step_minutes: int = 1,
+        ambiguous: AmbiguousTimePolicy = "earlier",
+        nonexistent: NonexistentTimePolicy = "shift_forward",
+    ) -> None:
+        if step_minutes < 1:
+            raise KerykeionException(f"The step must be at least one minute, got: {step_minutes}")
+
+        self.subject = subject
+
+        day_start = np.datetime64(datetime(subject.year, subject.month, subject.day), "us")
+        self.local_datetimes = day_start + np.arange(0, 24 * 60, step_minutes) * np.timedelta64(1, "m")
+        self.utc_datetimes = local_to_utc_array(self.local_datetimes, subject.tz_str, ambiguous, nonexistent)
+        self.julian_days = _UNIX_EPOCH_JULIAN_DAY + self.utc_datetimes.astype(np.int64) / _MICROSECONDS_PER_DAY
+
+        self._planets()
+        self._houses()
+        self._planets_in_houses()
+        self.changes = self._changes()
+
+    def __len__(self) -> int:
+        return len(self.julian_days)
+
+    def __getitem__(self, index: int) -> AstrologicalSubject:
+        return self.get_subject(index)
+
+    def _ayanamsas(self) -> Union[np.ndarray, float]:
+        """
+        Returns the ayanamsa to subtract at every instant, linear in time over a day.
+        """
+        if self.subject.zodiac_type != "Sidereal":
+            return 0.0
+
+        sidereal_mode = self.subject._get_sidereal_mode_number()
+        first, last = self.julian_days[0], self.julian_days[-1]
+        return np.interp(self.julian_days, [first, last], [get_ayanamsa(first, sidereal_mode), get_ayanamsa(last, sidereal_mode)])
+
+    def _planets(self) -> None:
+        """
+        Computes the planets at the ephemeris samples and interpolates them at every instant.
+        """
+        precision = self.subject.precision
+        if precision not in get_args(EphemerisPrecision):
+            raise KerykeionException(f"Unknown precision: {precision}, it must be one of {get_args(EphemerisPrecision)}")
+
+        ephemeris_manager = get_ephemeris_manager()
+        iflag = swe.FLG_SWIEPH + swe.FLG_SPEED
+        backend: EphemerisBackend = "moshier" if precision == "moshier" else "swieph"
+        table = get_default_ephemeris_table() if precision == "fast" else None
+        points = [get_celestial_point(name) for name in self.subject.active_points]
+
+        first, last = self.julian_days[0], self.julian_days[-1]
+        samples_count = max(int(np.ceil((last - first) / INTERPOLATION_STEP)), 1) + 1
+        samples_days = first + np.arange(samples_count) * INTERPOLATION_STEP
+
+        # Longitude and speed of every point at every sample, from the ephemeris table
+        # with the "fast" precision, like AstrologicalSubject, when it covers the point and the day.
+        samples = np.empty((samples_count, len(points), 2))
+        with ephemeris_manager.configured():
+            for i, point in enumerate(points):
+                if (
+                    table is not None
+                    and not point.swe_flags
+                    and table.covers(samples_days[0], point.swe_id)
+                    and table.covers(samples_days[-1], point.swe_id)
+                ):
+                    samples[:, i, 0], samples[:, i, 1] = table.positions(samples_days, point.swe_id)
+                    continue
+
+                for j, julian_day in enumerate(samples_days.tolist()):
+                    position = ephemeris_manager.calc(julian_day, point.swe_id, iflag | point.swe_flags, backend)
+                    samples[j, i] = position[0], position[3]
+
+        indexes = np.minimum(((self.julian_days - first) // INTERPOLATION_STEP).astype(np.int64), samples_count - 2)
+        offsets = (self.julian_days - samples_days[indexes])[:, np.newaxis]
+        start, end = samples[indexes], samples[indexes + 1]
+
+        longitudes, self.planets_speeds = hermite_interpolate(
+            offsets, INTERPOLATION_STEP, start[..., 0], start[..., 1], end[..., 0], end[..., 1]
+        )
+        self.planets_degrees_ut = (longitudes - np.atleast_1d(self._ayanamsas())[:, np.newaxis]) % 360
+
+    def _houses(self) -> None:
+        """
+        Computes the house cusps, the ascendant and the medium coeli at every instant.
+        """
+        house_system = str.encode(self.subject.houses_system)
+        houses, ascendants, medium_coeli = [], [], []
+
+        with get_ephemeris_manager().configured():
+            for julian_day in self.julian_days.tolist():
+                # The same sidereal time and true obliquity used by swe.houses.
+                armc = (swe.sidtime(julian_day) * 15 + self.subject.lng) % 360
+                obliquity = swe.calc(julian_day + swe.deltat(julian_day), swe.ECL_NUT)[0][0]
+
+                cusps, ascmc = swe.houses_armc(armc, self.subject.lat, obliquity, house_system)
+                houses.append(cusps)
+                ascendants.append(ascmc[0])
+                medium_coeli.append(ascmc[1])
+
+        ayanamsas = self._ayanamsas()
+        self.houses_degree_ut = (np.array(houses).reshape(len(self), 12) - np.atleast_1d(ayanamsas)[:, np.newaxis]) % 360
+        self.ascendants = (np.array(ascendants) - ayanamsas) % 360
+        self.medium_coeli = (np.array(medium_coeli) - ayanamsas) % 360
+
+    def _planets_in_houses(self) -> None:
+        """
+        Finds the house index (0 for the first house) of every planet at every instant.
+        """
+        self.planets_houses = calculate_houses_indexes(self.planets_degrees_ut, self.houses_degree_ut)
+
+    def _changes(self) -> list[RectificationChange]:
+        """
+        Lists the changes between consecutive instants, sorted by time.
+        """
+        columns: list[tuple[str, RectificationChangeKind, np.ndarray, tuple[str, ...]]] = [
+            ("Ascendant", "sign", (self.ascendants // 30).astype(np.int64), SIGNS),
+            ("Medium_Coeli", "sign", (self.medium_coeli // 30).astype(np.int64), SIGNS),
+        ]
+        columns += [(house, "sign", (self.houses_degree_ut[:, i] // 30).astype(np.int64), SIGNS) for i, house in enumerate(HOUSES_NAMES)]
+        columns += [(planet, "house", self.planets_houses[:, i], HOUSES_NAMES) for i, planet in enumerate(self.subject.active_points)]
+
+        changes = []
+        for point, kind, values, names in columns:
+            for index in np.flatnonzero(values[1:] != values[:-1]) + 1:
+                changes.append(
+                    RectificationChange(
+                        local_datetime=self.local_datetimes[index].astype(datetime),
+                        point=point,
+                        kind=kind,
+                        previous=names[values[index - 1]],
+                        current=names[values[index]],
+                    )
+                )
+
+        changes.sort(key=lambda change: change.local_datetime)
+        return changes
+
+    def get_subject(self, index: int) -> AstrologicalSubject:
+        """
+        Returns the subject at an instant of the sweep, a copy of the subject with
+        the time, the planets and the houses of the instant.
+        """
+        local_datetime: datetime = self.local_datetimes[index].astype(datetime)
+        julian_day = float(self.julian_days[index])
+
+        subject = AstrologicalSubject.__new__(AstrologicalSubject)
+        subject.__dict__.update(self.subject.__dict__)
+
+        subject.hour, subject.minute = local_datetime.hour, local_datetime.minute
+        subject.local_time = subject.hour + subject.minute / 60
+        subject.utc = self.utc_datetimes[index].astype(datetime).replace(tzinfo=pytz.utc)
+        subject.utc_time = subject.utc.hour + subject.utc.minute / 60
+        subject.julian_day = julian_day
+        subject.planets_degrees_ut = self.planets_degrees_ut[index].tolist()
+        subject.planets_speeds = self.planets_speeds[index].tolist()
+        subject.houses_degree_ut = self.houses_degree_ut[index].tolist()
+
+        subject._planets()
+        subject._houses_positions()
+        subject._planets_in_houses()
+        subject._lunar_phase_calc()
+
+        return subject
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+    sweep = RectificationSweep(subject)
+    for change in sweep.changes:
+        print(change.local_datetime, change.point, change.previous, change.current)
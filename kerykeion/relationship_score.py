@@ -5,6 +5,7 @@
 
 from kerykeion import AstrologicalSubject
 from kerykeion.aspects.synastry_aspects import SynastryAspects
+from kerykeion.kr_types import KerykeionException
 import logging
 from pathlib import Path
 from typing import Union
@@ -79,9 +80,13 @@ class RelationshipScore:
         """
         5 points if is a destiny sign:
         """
-        if self.first_subject.sun["quality"] == self.second_subject.sun["quality"]:
+        first_sun, second_sun = self.first_subject.sun, self.second_subject.sun
+        if first_sun is None or second_sun is None:
+            raise KerykeionException("The Sun must be an active point of both subjects for the relationship score!")
+
+        if first_sun["quality"] == second_sun["quality"]:
             logging.debug(
-                f'5 points: Destiny sign, {self.first_subject.sun["sign"]} and {self.second_subject.sun["sign"]}'
+                f'5 points: Destiny sign, {first_sun["sign"]} and {second_sun["sign"]}'
             )
             self.is_destiny_sign = True
             return 5
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import numpy as np
+import swisseph as swe
+from typing import Sequence, Union
+from kerykeion.astrological_subject import AstrologicalSubject, HOUSES_NAMES
+from kerykeion.ephemeris.ephemeris_manager import get_ephemeris_manager
+from kerykeion.ephemeris.ephemeris_utils import get_ayanamsa
+from kerykeion.kr_types import KerykeionException, Houses, Planet
+from kerykeion.utilities import calculate_houses_indexes
+
+
+class RelocationBatch:
+    """
+    The chart of one instant relocated to many places.
+
+    Moving a chart changes only the houses: the positions of the planets are the ones of the subject,
+    computed once, and for every place only the house cusps are calculated, with swe.houses_armc
+    from the sidereal time and the obliquity of the instant, which are also computed once.
+    The houses of the planets of all the places are then found with a single array operation.
+
+    The places beyond the polar circles are moved to 66 degrees of latitude, like AstrologicalSubject does.
+
+    Args:
+    - subject (AstrologicalSubject): The subject with the instant to relocate.
+    - latitudes (Sequence[float]): The latitudes of the places.
+    - longitudes (Sequence[float]): The longitudes of the places, one per latitude.
+
+    Example:
+        >>> subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+        >>> relocation = RelocationBatch(subject, [51.5, 40.7], [-0.13, -74.0])
+        >>> relocation.planet_houses("Sun")
+        ['Ninth_House', 'Eleventh_House']
+    """
+
+    subject: AstrologicalSubject
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    houses_degree_ut: np.ndarray
+    planets_houses: np.ndarray
+
+    def __init__(
+        self,
+        subject: AstrologicalSubject,
+        latitudes: Union[Sequence[float], np.ndarray],
+        longitudes: Union[Sequence[float], np.ndarray],
+    ) -> None:
+        self.subject = subject
+        self.latitudes = np.clip(np.asarray(latitudes, dtype=np.float64), -66.0, 66.0)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        if self.latitudes.ndim != 1 or self.latitudes.shape != self.longitudes.shape:
+            raise KerykeionException("There must be one longitude for every latitude!")
+
+        self.houses_degree_ut = self._houses()
+        self.planets_houses = self._planets_in_houses()
+
+    def __len__(self) -> int:
+        return len(self.latitudes)
+
+    def __getitem__(self, index: int) -> AstrologicalSubject:
+        return self.get_subject(index)
+
+    def _houses(self) -> np.ndarray:
+        """
+        Returns the house cusps of every place, an array of shape (places, 12).
+        """
+        julian_day = self.subject.julian_day
+        house_system = str.encode(self.subject.houses_system)
+
+        with get_ephemeris_manager().configured():
+            # Greenwich apparent sidereal time and true obliquity, the same used by swe.houses.
+            sidereal_time = swe.sidtime(julian_day) * 15
+            obliquity = swe.calc(julian_day + swe.deltat(julian_day), swe.ECL_NUT)[0][0]
+
+            houses = np.array(
+                [
+                    swe.houses_armc((sidereal_time + lng) % 360, lat, obliquity, house_system)[0]
+                    for lat, lng in zip(self.latitudes.tolist(), self.longitudes.tolist())
+                ],
+                dtype=np.float64,
+            ).reshape(len(self.latitudes), 12)
+
+        if self.subject.zodiac_type == "Sidereal":
+            houses = (houses - get_ayanamsa(julian_day, self.subject._get_sidereal_mode_number())) % 360
+
+        return houses
+
+    def _planets_in_houses(self) -> np.ndarray:
+        """
+        Returns the house index (0 for the first house) of every planet in every place,
+        an array of shape (places, planets).
+        """
+        planets = np.broadcast_to(np.asarray(self.subject.planets_degrees_ut, dtype=np.float64), (len(self), len(self.subject.active_points)))
+        return calculate_houses_indexes(planets, self.houses_degree_ut)
+
+    def planet_houses(self, planet: Planet) -> list[Houses]:
+        """
+        Returns the house of a planet in every place.
+        """
+        if planet not in self.subject.active_points:
+            raise KerykeionException(f"{planet} is not an active point of {self.subject.name}!")
+
+        return [HOUSES_NAMES[house] for house in self.planets_houses[:, self.subject.active_points.index(planet)]]
+
+    def get_subject(self, index: int) -> AstrologicalSubject:
+        """
+        Returns the relocated subject of a place, a copy of the subject with the coordinates,
+        the houses and the houses of the planets of the place. The other data, like the city
+        and the timezone, are the ones of the original subject.
+        """
+        subject = AstrologicalSubject.__new__(AstrologicalSubject)
+        subject.__dict__.update(self.subject.__dict__)
+
+        subject.lat = float(self.latitudes[index])
+        subject.lng = float(self.longitudes[index])
+        subject.houses_degree_ut = self.houses_degree_ut[index].tolist()
+
+        subject._planets()
+        subject._houses_positions()
+        subject._planets_in_houses()
+        subject._lunar_phase_calc()
+
+        return subject
+
+
+if __name__ == "__main__":
+    from kerykeion.utilities import setup_logging
+    setup_logging(level="debug")
+
+    subject = AstrologicalSubject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+    relocation = RelocationBatch(subject, [51.5, 40.7, 35.7], [-0.13, -74.0, 139.7])
+    print(relocation.planet_houses("Sun"))
+    print(relocation[2].first_house)
@@ -1 +1 @@
-from .kerykeion_settings import KerykeionSettingsModel, get_settings
+from .kerykeion_settings import KerykeionSettingsModel, get_settings, get_settings_file_path
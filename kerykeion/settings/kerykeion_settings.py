@@ -11,18 +11,18 @@ from typing import Dict, Union
 from kerykeion.kr_types import KerykeionSettingsModel
 
 
-def get_settings(new_settings_file: Union[Path, None] = None) -> KerykeionSettingsModel:
+def get_settings_file_path(new_settings_file: Union[Path, None] = None) -> Path:
     """
-    This function is used to get the settings dict from the settings file.
+    This function is used to get the path of the settings file read by get_settings.
     If no settings file is passed as argument, or the file is not found, it will fallback to:
     - The system wide config file, located in ~/.config/kerykeion/kr.config.json
     - The default config file, located in the package folder
-    
+
     Args:
         new_settings_file (Union[Path, None], optional): The path of the settings file. Defaults to None.
-        
+
     Returns:
-        Dict: The settings dict
+        Path: The path of the settings file
     """
 
     # Config path we passed as argument
@@ -41,6 +41,25 @@ def get_settings(new_settings_file: Union[Path, None] = None) -> KerykeionSettin
     if not settings_file.exists():
         settings_file = Path(__file__).parent / "kr.config.json"
 
+    return settings_file
+
+
+def get_settings(new_settings_file: Union[Path, None] = None) -> KerykeionSettingsModel:
+    """
+    This function is used to get the settings dict from the settings file.
+    If no settings file is passed as argument, or the file is not found, it will fallback to:
+    - The system wide config file, located in ~/.config/kerykeion/kr.config.json
+    - The default config file, located in the package folder
+    
+    Args:
+        new_settings_file (Union[Path, None], optional): The path of the settings file. Defaults to None.
+        
+    Returns:
+        Dict: The settings dict
+    """
+
+    settings_file = get_settings_file_path(new_settings_file)
+
     logging.debug(f"Kerykeion config file path: {settings_file}")
     with open(settings_file, "r", encoding="utf8") as f:
         settings_dict = load(f)
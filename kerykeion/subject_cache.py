@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import calendar
+import inspect
+import logging
+import pytz
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pydantic import ConfigDict
+from threading import Lock
+from typing import Any, Union
+from kerykeion.astrological_subject import AstrologicalSubject, DEFAULT_GEONAMES_USERNAME
+from kerykeion.celestial_points import get_active_points
+from kerykeion.kr_types import KerykeionException, KerykeionPointModel, LunarPhaseModel
+from kerykeion.timezones import local_to_utc, get_default_timezone_finder, get_timezone_from_coordinates
+
+DEFAULT_CACHE_SIZE = 1024
+
+_SUBJECT_SIGNATURE = inspect.signature(AstrologicalSubject.__init__)
+
+
+class FrozenKerykeionPointModel(KerykeionPointModel):
+    """
+    Immutable KerykeionPointModel, used by the cached subjects.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    def __setitem__(self, key, value):
+        raise KerykeionException("The points of a cached subject can't be modified!")
+
+    def __delitem__(self, key):
+        raise KerykeionException("The points of a cached subject can't be modified!")
+
+
+class FrozenLunarPhaseModel(LunarPhaseModel):
+    """
+    Immutable LunarPhaseModel, used by the cached subjects.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    def __setitem__(self, key, value):
+        raise KerykeionException("The lunar phase of a cached subject can't be modified!")
+
+    def __delitem__(self, key):
+        raise KerykeionException("The lunar phase of a cached subject can't be modified!")
+
+
+def _freeze(value: Any, frozen: dict[int, Any]) -> Any:
+    """
+    Returns an immutable copy of an attribute of a subject. The same object is frozen
+    only once, so eg. subject.sun and subject.planets_list[0] stay the same point.
+    """
+    if id(value) in frozen:
+        return frozen[id(value)]
+
+    result: Any
+    if isinstance(value, (FrozenKerykeionPointModel, FrozenLunarPhaseModel)):
+        result = value
+    elif isinstance(value, KerykeionPointModel):
+        result = FrozenKerykeionPointModel.model_construct(_fields_set=value.model_fields_set, **value.__dict__)
+    elif isinstance(value, LunarPhaseModel):
+        result = FrozenLunarPhaseModel.model_construct(_fields_set=value.model_fields_set, **value.__dict__)
+    elif isinstance(value, (list, tuple)):
+        result = tuple(_freeze(item, frozen) for item in value)
+    elif isinstance(value, dict):
+        result = {key: _freeze(item, frozen) for key, item in value.items()}
+    else:
+        result = value
+
+    frozen[id(value)] = result
+    return result
+
+
+class AstrologicalSubjectSnapshot(AstrologicalSubject):
+    """
+    Immutable copy of an AstrologicalSubject, returned by SubjectCache.
+
+    The points are frozen models and the lists are tuples, so a subject
+    shared by the cache can't be changed by one of its users.
+
+    Args:
+    - subject (AstrologicalSubject): The subject to copy.
+    - identity (dict[str, Any], optional): Values of the identity attributes (name, city, local time...)
+        replacing the ones of the subject.
+    """
+
+    def __init__(self, subject: AstrologicalSubject, identity: Union[dict[str, Any], None] = None) -> None:
+        frozen: dict[int, Any] = {}
+        for key, value in subject.__dict__.items():
+            object.__setattr__(self, key, _freeze(value, frozen))
+
+        for key, value in (identity or {}).items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise KerykeionException("A cached subject can't be modified!")
+
+    def __delattr__(self, key):
+        raise KerykeionException("A cached subject can't be modified!")
+
+
+@dataclass
+class SubjectCacheStats:
+    """
+    Counters of a SubjectCache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+
+class SubjectCache:
+    """
+    Least recently used cache of AstrologicalSubject.
+
+    Two requests share the same chart when they have the same UTC instant, coordinates,
+    zodiac type, sidereal mode, house system, precision, active points and daylight saving time policies:
+    only the first one computes it, the others get an immutable AstrologicalSubjectSnapshot
+    with their own name, city and local time.
+    When the coordinates are not given, or the timezone is missing and its index is not built,
+    the city and the nation take their place in the key, so also the requests that need geonames are cached.
+
+    Args:
+    - max_size (int, optional): The maximum number of subjects kept. Defaults to 1024.
+
+    Example:
+        >>> cache = SubjectCache()
+        >>> subject = cache.get_subject("Jack", 1990, 6, 15, 15, 15, "Roma", "IT", lng=12.5, lat=41.9, tz_str="Europe/Rome")
+        >>> cache.stats()
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        if max_size < 1:
+            raise KerykeionException("The cache size must be at least 1!")
+
+        self.max_size = max_size
+        self._subjects: OrderedDict[tuple, AstrologicalSubjectSnapshot] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def get_key(arguments: dict[str, Any]) -> tuple:
+        """
+        Returns the cache key of the AstrologicalSubject arguments.
+        """
+        lng, lat, tz_str = arguments["lng"], arguments["lat"], arguments["tz_str"]
+
+        # Like in AstrologicalSubject, without the timezone and its index the coordinates come from geonames.
+        has_coordinates = bool(lng and lat and (tz_str or get_default_timezone_finder() is not None))
+        if not arguments["online"] and not has_coordinates:
+            raise KerykeionException("You need to set the coordinates and timezone if you want to use the offline mode!")
+
+        settings = (
+            arguments["zodiac_type"],
+            arguments["sidereal_mode"] if arguments["zodiac_type"] == "Sidereal" else None,
+            AstrologicalSubject.houses_system,
+            arguments["precision"],
+            get_active_points(arguments["active_points"]),
+            arguments["ambiguous"],
+            arguments["nonexistent"],
+        )
+
+        if not has_coordinates:
+            local_datetime = (arguments["year"], arguments["month"], arguments["day"], arguments["hour"], arguments["minute"])
+            return ("city", arguments["city"], arguments["nation"], arguments["utc_datetime"] or local_datetime, *settings)
+
+        if arguments["utc_datetime"]:
+            utc = arguments["utc_datetime"]
+            utc = utc.astimezone(pytz.utc) if utc.tzinfo is not None else utc.replace(tzinfo=pytz.utc)
+        else:
+            naive_datetime = datetime(arguments["year"], arguments["month"], arguments["day"], arguments["hour"], arguments["minute"])
+            utc = local_to_utc(
+                naive_datetime,
+                tz_str or get_timezone_from_coordinates(lat, lng),
+                arguments["ambiguous"],
+                arguments["nonexistent"],
+            )
+
+        return ("coordinates", utc, round(float(lat), 6), round(float(lng), 6), *settings)
+
+    def get_subject(self, *args, **kwargs) -> AstrologicalSubjectSnapshot:
+        """
+        Returns the subject, from the cache when possible.
+        Takes the same arguments of AstrologicalSubject.
+        """
+        bound = _SUBJECT_SIGNATURE.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop("self")
+
+        key = self.get_key(arguments)
+
+        with self._lock:
+            cached = self._subjects.get(key)
+            if cached is not None:
+                self._subjects.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if cached is None:
+            cached = AstrologicalSubjectSnapshot(AstrologicalSubject(**arguments))
+
+            with self._lock:
+                self._subjects[key] = cached
+                self._subjects.move_to_end(key)
+                while len(self._subjects) > self.max_size:
+                    self._subjects.popitem(last=False)
+                    self._evictions += 1
+
+            return cached
+
+        logging.debug(f"Subject {arguments['name']} found in the cache")
+        return AstrologicalSubjectSnapshot(cached, self._get_identity(arguments, cached, key))
+
+    @staticmethod
+    def _get_identity(arguments: dict[str, Any], cached: AstrologicalSubjectSnapshot, key: tuple) -> dict[str, Any]:
+        """
+        Returns the attributes that describe who the subject is, and not the sky,
+        as AstrologicalSubject would set them for these arguments.
+        """
+        identity = {name: arguments[name] for name in ("name", "year", "month", "day", "hour", "minute", "online", "utc_datetime")}
+        identity["month_name"] = calendar.month_name[arguments["month"]] if 1 <= arguments["month"] <= 12 else None
+        identity["local_time"] = arguments["hour"] + arguments["minute"] / 60
+        identity["city"] = arguments["city"] or "London"
+        identity["nation"] = arguments["nation"] or "GB"
+
+        if arguments["tz_str"]:
+            identity["tz_str"] = arguments["tz_str"]
+        elif key[0] == "coordinates":
+            identity["tz_str"] = get_timezone_from_coordinates(arguments["lat"], arguments["lng"])
+        else:
+            identity["tz_str"] = cached.tz_str
+
+        if arguments["geonames_username"] is None and arguments["online"]:
+            identity["geonames_username"] = DEFAULT_GEONAMES_USERNAME
+        else:
+            identity["geonames_username"] = arguments["geonames_username"]
+
+        return identity
+
+    def stats(self) -> SubjectCacheStats:
+        """
+        Returns the hits, the misses and the evictions of the cache.
+        """
+        with self._lock:
+            return SubjectCacheStats(self._hits, self._misses, self._evictions, len(self._subjects), self.max_size)
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets the counters.
+        """
+        with self._lock:
+            self._subjects.clear()
+            self._hits = self._misses = self._evictions = 0
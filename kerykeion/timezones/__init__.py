@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+This is part of Kerykeion (C) 2023 Giacomo Battaglia
+
+The timezones module contains the cached conversions
+ between local times and UTC, also for many datetimes at once,
+ and the offline lookup of the timezone from the coordinates,
+ whose index is built with the kerykeion-timezone-index command.
+"""
+
+
+from .timezone_conversion import get_timezone, local_to_utc, local_to_utc_array, local_to_utc_batch
+from .timezone_finder import TimezoneFinder, build_timezone_index, get_default_timezone_finder, get_timezone_from_coordinates
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+"""
+
+import numpy as np
+import pytz
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Sequence, Union
+from kerykeion.kr_types import KerykeionException, AmbiguousTimePolicy, NonexistentTimePolicy
+
+_MIN_MICROSECONDS = np.iinfo(np.int64).min
+_MAX_MICROSECONDS = np.iinfo(np.int64).max
+_EPOCH = datetime(1970, 1, 1)
+
+
+class ZoneTransitions:
+    """
+    The UTC offsets of a timezone as windows of local time.
+
+    The offset k is valid from the local time starts[k] (included) to ends[k] (excluded).
+    Two consecutive windows overlap when the clocks are moved back (ambiguous local times)
+    and leave a gap when the clocks are moved forward (nonexistent local times).
+    The windows are computed once from the transition tables of pytz.
+
+    Args:
+    - tz_str (str): The timezone name.
+    """
+
+    def __init__(self, tz_str: str) -> None:
+        timezone = get_timezone(tz_str)
+
+        # Internal, but stable, pytz tables of the DstTzInfo zones: the UTC instants of the transitions
+        # and the offset after each of them. They are not part of the typed pytz API,
+        # so they are read with getattr.
+        transition_times = getattr(timezone, "_utc_transition_times", None)
+        transition_info = getattr(timezone, "_transition_info", None)
+
+        if transition_times and transition_info:
+            offsets = [info[0] for info in transition_info]
+        else:
+            # Zones without transitions (UTC, fixed offsets) have a single window.
+            transition_times = [datetime.min]
+            offsets = [timezone.localize(_EPOCH).utcoffset()]
+
+        self.tz_str = tz_str
+        self.offsets: list[timedelta] = offsets
+        self.starts: list[datetime] = [datetime.min] + [time + offset for time, offset in zip(transition_times[1:], offsets[1:])]
+        self.ends: list[datetime] = [time + offset for time, offset in zip(transition_times[1:], offsets[:-1])] + [datetime.max]
+
+        self.offsets_us = np.array([offset // timedelta(microseconds=1) for offset in offsets], dtype=np.int64)
+        self.starts_us = np.array([_MIN_MICROSECONDS] + [_to_microseconds(start) for start in self.starts[1:]], dtype=np.int64)
+        self.ends_us = np.array([_to_microseconds(end) for end in self.ends[:-1]] + [_MAX_MICROSECONDS], dtype=np.int64)
+
+    def utc_offset(
+        self,
+        local_datetime: datetime,
+        ambiguous: AmbiguousTimePolicy = "raise",
+        nonexistent: NonexistentTimePolicy = "raise",
+    ) -> timedelta:
+        """
+        Returns the UTC offset of a naive local datetime.
+        """
+        i = bisect_right(self.starts, local_datetime) - 1
+
+        if local_datetime >= self.ends[i]:
+            if nonexistent == "shift_forward":
+                return self.offsets[i]
+            elif nonexistent == "shift_backward":
+                return self.offsets[i + 1]
+
+            _check_policy(nonexistent, ("raise", "shift_forward", "shift_backward"))
+            raise pytz.exceptions.NonExistentTimeError(local_datetime)
+
+        if i > 0 and local_datetime < self.ends[i - 1]:
+            if ambiguous == "earlier":
+                return self.offsets[i - 1]
+            elif ambiguous == "later":
+                return self.offsets[i]
+
+            _check_policy(ambiguous, ("raise", "earlier", "later"))
+            raise pytz.exceptions.AmbiguousTimeError(local_datetime)
+
+        return self.offsets[i]
+
+    def utc_offsets(
+        self,
+        local_microseconds: np.ndarray,
+        ambiguous: AmbiguousTimePolicy = "raise",
+        nonexistent: NonexistentTimePolicy = "raise",
+    ) -> np.ndarray:
+        """
+        Vectorized utc_offset, on local times in microseconds from 1970-01-01. Returns the offsets in microseconds.
+        """
+        i = np.searchsorted(self.starts_us, local_microseconds, side="right") - 1
+        offsets = self.offsets_us[i]
+
+        nonexistent_mask = local_microseconds >= self.ends_us[i]
+        if nonexistent_mask.any():
+            if nonexistent == "shift_backward":
+                offsets[nonexistent_mask] = self.offsets_us[i[nonexistent_mask] + 1]
+            elif nonexistent != "shift_forward":
+                _check_policy(nonexistent, ("raise", "shift_forward", "shift_backward"))
+                raise pytz.exceptions.NonExistentTimeError(_from_microseconds(local_microseconds[nonexistent_mask][0]))
+
+        ambiguous_mask = (i > 0) & (local_microseconds < self.ends_us[np.maximum(i - 1, 0)])
+        if ambiguous_mask.any():
+            if ambiguous == "earlier":
+                offsets[ambiguous_mask] = self.offsets_us[i[ambiguous_mask] - 1]
+            elif ambiguous != "later":
+                _check_policy(ambiguous, ("raise", "earlier", "later"))
+                raise pytz.exceptions.AmbiguousTimeError(_from_microseconds(local_microseconds[ambiguous_mask][0]))
+
+        return offsets
+
+
+def _to_microseconds(naive_datetime: datetime) -> int:
+    return (naive_datetime - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_microseconds(microseconds: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(microseconds))
+
+
+def _check_policy(policy: str, allowed: tuple[str, ...]) -> None:
+    if policy not in allowed:
+        raise KerykeionException(f"Policy not recognized: {policy}! Please use one of {', '.join(allowed)}")
+
+
+@lru_cache(maxsize=None)
+def get_timezone(tz_str: str) -> pytz.BaseTzInfo:
+    """
+    Returns the pytz timezone, created only once per name.
+    """
+    return pytz.timezone(tz_str)
+
+
+@lru_cache(maxsize=None)
+def get_zone_transitions(tz_str: str) -> ZoneTransitions:
+    """
+    Returns the local time windows of the timezone, computed only once per name.
+    """
+    return ZoneTransitions(tz_str)
+
+
+def local_to_utc(
+    local_datetime: datetime,
+    tz_str: str,
+    ambiguous: AmbiguousTimePolicy = "raise",
+    nonexistent: NonexistentTimePolicy = "raise",
+) -> datetime:
+    """
+    Converts a naive local datetime to an aware UTC datetime.
+
+    Args:
+    - local_datetime (datetime): The naive local datetime.
+    - tz_str (str): The timezone name.
+    - ambiguous (AmbiguousTimePolicy, optional): For the local times repeated when the clocks are moved back:
+        "raise" raises pytz AmbiguousTimeError, like localize with is_dst=None, "earlier" uses the first
+        occurrence and "later" the second one. Defaults to "raise".
+    - nonexistent (NonexistentTimePolicy, optional): For the local times skipped when the clocks are moved forward:
+        "raise" raises pytz NonExistentTimeError, like localize with is_dst=None, "shift_forward" uses the offset
+        before the gap (02:30 becomes 03:30 when the clocks go from 02:00 to 03:00) and "shift_backward" the offset
+        after the gap (02:30 becomes 01:30). Defaults to "raise".
+
+    Returns:
+        datetime: The UTC datetime.
+    """
+    if local_datetime.tzinfo is not None:
+        raise KerykeionException("The local datetime must be naive!")
+
+    offset = get_zone_transitions(tz_str).utc_offset(local_datetime, ambiguous, nonexistent)
+    return (local_datetime - offset).replace(tzinfo=pytz.utc)
+
+
+def local_to_utc_array(
+    local_datetimes: Union[Sequence[datetime], np.ndarray],
+    tz_str: str,
+    ambiguous: AmbiguousTimePolicy = "raise",
+    nonexistent: NonexistentTimePolicy = "raise",
+) -> np.ndarray:
+    """
+    Converts many naive local datetimes of the same timezone to UTC at once,
+    with a binary search on the transition windows of the zone.
+
+    Args:
+    - local_datetimes (Union[Sequence[datetime], np.ndarray]): Naive datetimes or a datetime64 array.
+    - tz_str (str): The timezone name.
+    - ambiguous (AmbiguousTimePolicy, optional): See local_to_utc. Defaults to "raise".
+    - nonexistent (NonexistentTimePolicy, optional): See local_to_utc. Defaults to "raise".
+
+    Returns:
+        np.ndarray: The UTC times, as a datetime64[us] array.
+    """
+    local_microseconds = np.asarray(local_datetimes, dtype="datetime64[us]").astype(np.int64)
+    offsets = get_zone_transitions(tz_str).utc_offsets(local_microseconds, ambiguous, nonexistent)
+
+    return (local_microseconds - offsets).astype("datetime64[us]")
+
+
+def local_to_utc_batch(
+    local_datetimes: Union[Sequence[datetime], np.ndarray],
+    tz_strs: Union[Sequence[str], np.ndarray],
+    ambiguous: AmbiguousTimePolicy = "raise",
+    nonexistent: NonexistentTimePolicy = "raise",
+) -> np.ndarray:
+    """
+    Converts many naive local datetimes, each one with its own timezone, to UTC:
+    the datetimes are grouped by timezone and every group is converted with local_to_utc_array.
+
+    Args:
+    - local_datetimes (Union[Sequence[datetime], np.ndarray]): Naive datetimes or a datetime64 array.
+    - tz_strs (Union[Sequence[str], np.ndarray]): The timezone names, one per datetime.
+    - ambiguous (AmbiguousTimePolicy, optional): See local_to_utc. Defaults to "raise".
+    - nonexistent (NonexistentTimePolicy, optional): See local_to_utc. Defaults to "raise".
+
+    Returns:
+        np.ndarray: The UTC times, as a datetime64[us] array in the same order of the input.
+    """
+    local_times = np.asarray(local_datetimes, dtype="datetime64[us]")
+    zones = np.asarray(tz_strs)
+
+    if local_times.shape != zones.shape:
+        raise KerykeionException("There must be one timezone for every datetime!")
+
+    utc_times = np.empty_like(local_times)
+    zone_names, zone_indexes = np.unique(zones, return_inverse=True)
+    for i, tz_str in enumerate(zone_names):
+        mask = zone_indexes == i
+        utc_times[mask] = local_to_utc_array(local_times[mask], str(tz_str), ambiguous, nonexistent)
+
+    return utc_times
+
+
+if __name__ == "__main__":
+    print(local_to_utc(datetime(2023, 3, 26, 2, 30), "Europe/Rome", nonexistent="shift_forward"))
+    print(local_to_utc(datetime(2023, 10, 29, 2, 30), "Europe/Rome", ambiguous="earlier"))
+    print(local_to_utc_array([datetime(2023, 1, 1, 12), datetime(2023, 7, 1, 12)], "America/New_York"))
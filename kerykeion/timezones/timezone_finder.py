@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+    This is part of Kerykeion (C) 2023 Giacomo Battaglia
+
+    Offline lookup of the timezone from the coordinates. The index is not shipped with the package,
+    build it once from a release of timezone-boundary-builder
+    (https://github.com/evansiroky/timezone-boundary-builder/releases), eg. timezones-with-oceans.geojson.zip:
+
+        kerykeion-timezone-index timezones-with-oceans.geojson.zip
+
+    or python -m kerykeion.timezones.timezone_finder, or build_timezone_index() from the code.
+    The index is saved in DEFAULT_INDEX_PATH and used by AstrologicalSubject when the timezone is not set.
+"""
+
+import argparse
+import json
+import logging
+import numpy as np
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Sequence, Union
+from kerykeion.kr_types import KerykeionException
+
+# Where the index is built and searched by default.
+DEFAULT_INDEX_PATH = Path(__file__).parent.absolute() / "timezone_index.npz"
+
+# Size, in degrees, of the cells of the grid.
+DEFAULT_CELL_SIZE = 1.0
+
+
+class TimezoneFinder:
+    """
+    Offline lookup of the IANA timezone of a point, from the timezone boundary polygons.
+
+    The polygons are stored in flat arrays, with the rings separated by NaN, and every
+    cell of a regular latitude/longitude grid keeps the list of the polygons whose bounding
+    box touches it: a lookup is a point in polygon test only on the few candidates of the cell.
+    The index is built once with build_timezone_index(), from the GeoJSON of the
+    timezone-boundary-builder project (https://github.com/evansiroky/timezone-boundary-builder).
+
+    Args:
+    - path (Union[str, Path], optional): The index file. Defaults to DEFAULT_INDEX_PATH.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_INDEX_PATH) -> None:
+        self.path = Path(path)
+
+        if not self.path.exists():
+            raise KerykeionException(f"Timezone index {self.path} not found, build it with kerykeion-timezone-index!")
+
+        with np.load(self.path) as data:
+            self.zone_names = [str(name) for name in data["zone_names"]]
+            self.polygon_zones = data["polygon_zones"]
+            self.polygon_offsets = data["polygon_offsets"]
+            self.longitudes = data["longitudes"]
+            self.latitudes = data["latitudes"]
+            self.cell_offsets = data["cell_offsets"]
+            self.cell_polygons = data["cell_polygons"]
+            self.cell_size = float(data["cell_size"])
+
+        self.columns = int(round(360 / self.cell_size))
+        self.rows = int(round(180 / self.cell_size))
+
+    def _cell(self, lat: float, lng: float) -> int:
+        column = min(int((lng + 180) // self.cell_size), self.columns - 1)
+        row = min(int((lat + 90) // self.cell_size), self.rows - 1)
+        return row * self.columns + column
+
+    def _contains(self, polygon: int, lat: float, lng: float) -> bool:
+        """
+        Even-odd ray casting on all the rings of the polygon, so the holes are excluded.
+        The NaN separators between the rings never count as crossings.
+        """
+        start, end = self.polygon_offsets[polygon], self.polygon_offsets[polygon + 1]
+        xi, yi = self.longitudes[start : end - 1], self.latitudes[start : end - 1]
+        xj, yj = self.longitudes[start + 1 : end], self.latitudes[start + 1 : end]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossings = ((yi > lat) != (yj > lat)) & (lng < (xj - xi) * (lat - yi) / (yj - yi) + xi)
+
+        return bool(np.count_nonzero(crossings) % 2)
+
+    def timezone_at(self, lat: float, lng: float) -> Union[str, None]:
+        """
+        Returns the timezone name of the point, None if no polygon contains it.
+        """
+        if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+            raise KerykeionException(f"Invalid coordinates: {lat}, {lng}")
+
+        cell = self._cell(lat, lng)
+        for polygon in self.cell_polygons[self.cell_offsets[cell] : self.cell_offsets[cell + 1]]:
+            if self._contains(polygon, lat, lng):
+                return self.zone_names[self.polygon_zones[polygon]]
+
+        return None
+
+
+def _load_features(geojson_path: Union[str, Path]) -> list[dict]:
+    """
+    Reads the features of a GeoJSON file, or of the only GeoJSON file of a zip archive.
+    """
+    if zipfile.is_zipfile(geojson_path):
+        with zipfile.ZipFile(geojson_path) as archive:
+            names = [name for name in archive.namelist() if name.endswith((".json", ".geojson"))]
+            if len(names) != 1:
+                raise KerykeionException(f"Expected one GeoJSON file in {geojson_path}, found {len(names)}!")
+
+            with archive.open(names[0]) as file:
+                return json.load(file)["features"]
+
+    with open(geojson_path, "r", encoding="utf-8") as file:
+        return json.load(file)["features"]
+
+
+def build_timezone_index(
+    geojson_path: Union[str, Path],
+    path: Union[str, Path] = DEFAULT_INDEX_PATH,
+    cell_size: float = DEFAULT_CELL_SIZE,
+) -> Path:
+    """
+    Builds the timezone index from a GeoJSON FeatureCollection of timezone boundaries,
+    with the timezone name in the "tzid" property, like the releases of timezone-boundary-builder.
+
+    Args:
+    - geojson_path (Union[str, Path]): The GeoJSON file, or a zip archive with it.
+    - path (Union[str, Path], optional): The index file. Defaults to DEFAULT_INDEX_PATH.
+    - cell_size (float, optional): The size of the cells of the grid, in degrees. Defaults to 1.
+
+    Returns:
+        Path: The path of the index.
+    """
+    global _default_finder
+
+    features = _load_features(geojson_path)
+
+    columns = int(round(360 / cell_size))
+    rows = int(round(180 / cell_size))
+
+    zone_names: list[str] = []
+    polygon_zones: list[int] = []
+    polygon_offsets = [0]
+    longitudes: list[float] = []
+    latitudes: list[float] = []
+    cells: list[list[int]] = [[] for _ in range(columns * rows)]
+
+    for feature in features:
+        geometry = feature["geometry"]
+        polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+
+        zone_names.append(feature["properties"]["tzid"])
+        for rings in polygons:
+            polygon = len(polygon_zones)
+            polygon_zones.append(len(zone_names) - 1)
+
+            for ring in rings:
+                ring_array = np.asarray(ring, dtype=np.float64)
+                longitudes.extend(ring_array[:, 0].tolist() + [np.nan])
+                latitudes.extend(ring_array[:, 1].tolist() + [np.nan])
+
+            polygon_offsets.append(len(longitudes))
+
+            outer = np.asarray(rings[0], dtype=np.float64)
+            first_column = max(int((outer[:, 0].min() + 180) // cell_size), 0)
+            last_column = min(int((outer[:, 0].max() + 180) // cell_size), columns - 1)
+            first_row = max(int((outer[:, 1].min() + 90) // cell_size), 0)
+            last_row = min(int((outer[:, 1].max() + 90) // cell_size), rows - 1)
+
+            for row in range(first_row, last_row + 1):
+                for column in range(first_column, last_column + 1):
+                    cells[row * columns + column].append(polygon)
+
+    cell_offsets = np.cumsum([0] + [len(cell) for cell in cells])
+    cell_polygons = np.array([polygon for cell in cells for polygon in cell], dtype=np.int32)
+
+    np.savez_compressed(
+        path,
+        zone_names=np.array(zone_names),
+        polygon_zones=np.array(polygon_zones, dtype=np.int32),
+        polygon_offsets=np.array(polygon_offsets, dtype=np.int64),
+        longitudes=np.array(longitudes, dtype=np.float32),
+        latitudes=np.array(latitudes, dtype=np.float32),
+        cell_offsets=cell_offsets.astype(np.int64),
+        cell_polygons=cell_polygons,
+        cell_size=np.array(cell_size),
+    )
+
+    logging.info(f"Timezone index with {len(zone_names)} zones and {len(polygon_zones)} polygons saved in {path}")
+
+    # The default finder and its lookups are reloaded from the new index.
+    if Path(path).absolute() == DEFAULT_INDEX_PATH:
+        with _default_finder_lock:
+            _default_finder = None
+        get_timezone_from_coordinates.cache_clear()
+
+    return Path(path)
+
+
+# The finder of DEFAULT_INDEX_PATH, loaded on the first call after the index is built.
+_default_finder: Union[TimezoneFinder, None] = None
+_default_finder_lock = Lock()
+
+
+def get_default_timezone_finder() -> Union[TimezoneFinder, None]:
+    """
+    Returns the finder of the index in DEFAULT_INDEX_PATH, None if it is not built.
+    The index is loaded only once per process, but it is looked for again until it exists.
+    """
+    global _default_finder
+
+    if _default_finder is None and DEFAULT_INDEX_PATH.exists():
+        with _default_finder_lock:
+            if _default_finder is None:
+                _default_finder = TimezoneFinder(DEFAULT_INDEX_PATH)
+
+    return _default_finder
+
+
+@lru_cache(maxsize=4096)
+def get_timezone_from_coordinates(lat: float, lng: float) -> str:
+    """
+    Returns the IANA timezone of a point, without any network request.
+
+    The timezone is looked up in the timezone index, see TimezoneFinder. Build it from the
+    release with the oceans of timezone-boundary-builder to cover also the points at sea.
+
+    Args:
+    - lat (float): The latitude.
+    - lng (float): The longitude.
+
+    Raises:
+        KerykeionException: If the timezone index is not built, see build_timezone_index(),
+            or if the point is in none of its polygons.
+
+    Returns:
+        str: The timezone name.
+    """
+    finder = get_default_timezone_finder()
+    if finder is None:
+        raise KerykeionException(
+            f"Timezone index {DEFAULT_INDEX_PATH} not found, build it with kerykeion-timezone-index "
+            "or set the timezone!"
+        )
+
+    tz_str = finder.timezone_at(lat, lng)
+    if tz_str is None:
+        raise KerykeionException(f"No timezone found for {lat}, {lng} in {DEFAULT_INDEX_PATH}, set the timezone!")
+
+    return tz_str
+
+
+def main(args: Union[Sequence[str], None] = None) -> None:
+    """
+    The kerykeion-timezone-index command, builds the timezone index from a GeoJSON file.
+    """
+    parser = argparse.ArgumentParser(
+        prog="kerykeion-timezone-index",
+        description="Builds the index of the offline timezone lookup from a release of timezone-boundary-builder "
+        "(https://github.com/evansiroky/timezone-boundary-builder/releases).",
+    )
+    parser.add_argument("geojson", type=Path, help="The GeoJSON file, or the zip archive of the release.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_INDEX_PATH, help=f"The index file. Defaults to {DEFAULT_INDEX_PATH}.")
+    parser.add_argument("--cell-size", type=float, default=DEFAULT_CELL_SIZE, help="The size of the cells of the grid, in degrees. Defaults to 1.")
+    arguments = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    build_timezone_index(arguments.geojson, arguments.output, arguments.cell_size)
+
+
+if __name__ == "__main__":
+    main()
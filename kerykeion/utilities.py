@@ -1,40 +1,33 @@
-from kerykeion.kr_types import KerykeionPointModel, KerykeionException, KerykeionSettingsModel, AstrologicalSubjectModel
+from kerykeion.kr_types import KerykeionPointModel, KerykeionException, KerykeionSettingsModel, AstrologicalSubjectModel, LunarPhaseModel
 from typing import Union, Literal
+from bisect import bisect_right
 import logging
+import numpy as np
+from kerykeion.celestial_points import CELESTIAL_POINTS
+
+# Lunar phases lookup tables
+LUNAR_PHASE_STEP = 360.0 / 28.0
+
+# Start, in degrees between sun and moon, of every sun phase
+SUN_PHASES_START = (
+    0, 30, 40, 50, 60, 70, 80, 90, 120, 130, 140, 150, 160, 170,
+    180, 210, 220, 230, 240, 250, 260, 270, 300, 310, 320, 330, 340, 350,
+)
+
+# All the sun phases start on a multiple of ten, so the phase depends only on the ten degrees slice
+SUN_PHASE_BY_TEN_DEGREES = tuple(bisect_right(SUN_PHASES_START, slice * 10) for slice in range(36))
+
+# Moon emoji by moon phase (1 to 28), the index 0 is not used
+MOON_EMOJI_BY_PHASE = ("",) + ("🌑",) + ("🌒",) * 5 + ("🌓",) * 3 + ("🌔",) * 4 + ("🌕",) + ("🌖",) * 5 + ("🌗",) * 3 + ("🌘",) * 6
 
 
 def get_number_from_name(name: str) -> int:
     """Utility function, gets planet id from the name."""
-    name = name.lower()
-
-    if name == "sun":
-        return 0
-    elif name == "moon":
-        return 1
-    elif name == "mercury":
-        return 2
-    elif name == "venus":
-        return 3
-    elif name == "mars":
-        return 4
-    elif name == "jupiter":
-        return 5
-    elif name == "saturn":
-        return 6
-    elif name == "uranus":
-        return 7
-    elif name == "neptune":
-        return 8
-    elif name == "pluto":
-        return 9
-    elif name == "mean_node":
-        return 10
-    elif name == "true_node":
-        return 11
-    elif name == "chiron":
-        return 15
-    else:
-        return int(name)
+    point = CELESTIAL_POINTS.get(name.lower())
+    if point is not None:
+        return point.swe_id
+
+    return int(name)
 
 
 def calculate_position(
@@ -203,6 +196,79 @@ def calculate_position(
 
     return KerykeionPointModel(**dictionary)
 
+def calculate_houses_indexes(points_degrees, houses_degrees) -> np.ndarray:
+    """
+    Finds the house of points, for one chart or for many charts at once.
+
+    The cusps and the points are rotated to make the first cusp 0 degrees, so the cusps become an
+    increasing sequence and the house of a point is a binary search (np.searchsorted) among them.
+    A point exactly on a cusp belongs to the previous house, except on the first cusp,
+    which belongs to the first house.
+
+    Args:
+        - points_degrees: The absolute positions of the points, shape (points,) or (charts, points).
+        - houses_degrees: The absolute positions of the 12 cusps, shape (12,) or (charts, 12).
+
+    Returns:
+        np.ndarray: The house indexes, 0 for the first house, with the shape of points_degrees.
+
+    Raises:
+        KerykeionException: If the cusps are not in zodiacal order, when there is no house for a point.
+    """
+    points_degrees = np.asarray(points_degrees, dtype=np.float64)
+    houses_degrees = np.asarray(houses_degrees, dtype=np.float64)
+
+    if houses_degrees.shape[-1] != 12 or houses_degrees.shape[:-1] != points_degrees.shape[:-1]:
+        raise KerykeionException(f"There must be 12 cusps for every chart, got: {houses_degrees.shape}")
+
+    first_cusps = houses_degrees[..., :1]
+    cusps_arcs = (houses_degrees - first_cusps) % 360
+    points_arcs = (points_degrees - first_cusps) % 360
+
+    if np.any(np.diff(cusps_arcs, axis=-1) <= 0):
+        raise KerykeionException(f"The house cusps are not in zodiacal order: {houses_degrees.tolist()}")
+
+    # Every chart is moved to its own 360 degrees range, so one search works on all the charts.
+    charts = int(np.prod(houses_degrees.shape[:-1], dtype=np.int64))
+    ranges = (np.arange(charts) * 360.0).reshape(houses_degrees.shape[:-1] + (1,))
+    indexes = np.searchsorted((cusps_arcs + ranges).ravel(), (points_arcs + ranges).ravel(), side="left")
+    indexes = indexes.reshape(points_degrees.shape) - (ranges / 360.0).astype(np.int64) * 12
+
+    return np.clip(indexes, 1, 12) - 1
+
+
+def calculate_lunar_phase(moon_abs_pos: float, sun_abs_pos: float) -> LunarPhaseModel:
+    """
+    Calculates the lunar phase from the absolute positions of the moon and the sun.
+
+    Args:
+        - moon_abs_pos (float): The absolute position of the moon.
+        - sun_abs_pos (float): The absolute position of the sun.
+
+    Returns:
+        LunarPhaseModel: The lunar phase, with the degrees between sun and moon, the moon phase (1 to 28),
+            the sun phase (1 to 28) and the moon emoji.
+    """
+
+    # anti-clockwise degrees between sun and moon
+    degrees_between = (moon_abs_pos - sun_abs_pos) % 360.0
+
+    phase_index = int(degrees_between // LUNAR_PHASE_STEP)
+    # The floor division can be one off exactly on the boundaries, which are multiples of the step
+    if degrees_between >= (phase_index + 1) * LUNAR_PHASE_STEP:
+        phase_index += 1
+
+    moon_phase = min(phase_index, 27) + 1
+    sun_phase = SUN_PHASE_BY_TEN_DEGREES[min(int(degrees_between // 10), 35)]
+
+    return LunarPhaseModel(
+        degrees_between_s_m=degrees_between,
+        moon_phase=moon_phase,
+        sun_phase=sun_phase,
+        moon_emoji=MOON_EMOJI_BY_PHASE[moon_phase],
+    )
+
+
 def setup_logging(level: str) -> None:
     """Setup logging for testing.
     
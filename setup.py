@@ -41,6 +41,11 @@ setup(
         'poethepoet == 0.19.0',
         'flask==3.0.3'
     ],
+    entry_points={
+        'console_scripts': [
+            'kerykeion-timezone-index=kerykeion.timezones.timezone_finder:main'
+        ]
+    },
     dependency_links=[
         'file:kerykeion'
     ]